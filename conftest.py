@@ -0,0 +1,4 @@
+"""저장소 루트에서 pytest 를 돌려도 robot_hand 를 import 할 수 있게 합니다.
+
+pytest 는 루트의 conftest.py 가 있는 디렉터리를 sys.path 에 넣습니다.
+"""
@@ -1,10 +1,11 @@
 #!/usr/bin/env python3
 
 # 필요한 라이브러리들을 가져옵니다.
-from ev3dev2.motor import LargeMotor, SpeedPercent
-from ev3dev2.sensor.lego import UltrasonicSensor, GyroSensor, TouchSensor
-from ev3dev2.button import Button 
-from time import sleep, time
+from robot_hand.aio import AsyncHandController
+from robot_hand.controller import HandConfig, HandController
+from robot_hand.poses import POSE_RULES
+from robot_hand.triggers import (UltrasonicDwell, PalmTouch, GyroRateSwing, SideClick, PalmPress,
+                                 SideGestures, RELEASE, RESET)
 
 # --- 중요: 포트 설정 ---
 # 모든 센서 포트를 실제 로봇에 맞게 수정해주세요.
@@ -25,177 +26,180 @@ GRASP_SPEED = 15
 RELEASE_SPEED = 15
 THUMB_RELEASE_SP = 5
 
+# 잡기 자세 (robot_hand.poses): 'power' 세 모터 모두 끝까지, 'pinch' 첫째 손가락과 엄지로 집기,
+# 'cylinder' 굵은 물체를 덜 닫아 감싸기
+GRASP_POSE = 'power'
+# True 면 초음파로 잡을 때 물체가 멈춘 거리와 다가온 속도로 자세를 고릅니다. (POSE_RULES)
+AUTO_POSE = False
+
+# 적응형 잡기: 빠르게 닫다가 모터 속도가 떨어지면(물체에 닿으면) 느리게 조이고 버팁니다.
+ADAPTIVE_GRASP = True
+ADAPTIVE_SPEED = 40            # 닿기 전까지 닫는 속도
+HOLD_SPEED = 5                 # 닿은 뒤 조이는 속도
+SQUEEZE_DEGREES = 10           # 닿은 뒤 더 조이는 각도
+
+# 동기화 동작: 세 모터가 함께 출발해서 함께 도착하도록 속도와 가감속을 맞춥니다.
+SYNC_MOTION = True
+SYNC_SPEED = 40                # 가장 오래 걸리는 모터의 최고 속도 (%)
+RAMP_MS = 300                  # 0 에서 100% 속도까지 가속 시간 (ms)
+
 ULTRASONIC_DISTANCE_CM = 5
 ULTRASONIC_DURATION_S = 2
+ULTRASONIC_RELEASE_CM = 6      # 이 거리보다 멀어져야 감지 해제 (히스테리시스)
+ULTRASONIC_WINDOW = 5          # 중앙값을 구할 최근 샘플 수
+ULTRASONIC_MAX_DROPOUTS = 3    # 연속으로 무시할 측정 실패(255 cm) 횟수
 
 # 자이로 센서 놓기 동작을 위한 설정
-ROTATION_ANGLE_THRESHOLD = 90  # 회전 감지 각도
-ROTATION_TIME_INTERVAL = 1.0   # 각도 측정 시간 간격 (초)
-ROTATION_COUNT_TARGET = 2      # 목표 회전 횟수
+SWING_AMPLITUDE_DEG = 45       # 흔들 때 양쪽으로 넘어야 하는 각도
+SWING_COUNT_TARGET = 2         # 목표 흔들기 횟수
+
+# 센서별 샘플링 주기 (초)
+TOUCH_PERIOD_S = 0.005         # 터치 센서 (200 Hz)
+ULTRASONIC_PERIOD_S = 0.1      # 초음파 센서 자체 측정 주기에 맞춤
+BUTTON_PERIOD_S = 0.1          # 뒤로 가기 버튼
+MOTION_PERIOD_S = 0.02         # 모터 동작 상태 확인
+MOTION_TIMEOUT_S = 10          # 잡기/놓기 동작 최대 시간
+STATE_TICK_S = 0.01            # 상태 만료 확인 주기
+GYRO_PERIOD_S = 0.01           # 자이로 센서 (각도 + 각속도)
+
+# True 면 터치 센서 두 개를 별도 스레드에서 빠르게 읽어 누른 시각과 뗀 시각을 잡고,
+# 클릭과 길게 누르기를 그 시각으로 가릅니다. 루프보다 짧은 터치도 놓치지 않습니다.
+TOUCH_WATCHER = True
+TOUCH_WATCH_PERIOD_S = 0.002   # 감시 스레드 읽기 주기
+TOUCH_DEBOUNCE_S = 0.004       # 이 시간 동안 이어진 값만 눌림/뗌으로 봄
+CLICK_MIN_S = 0.1              # 손날 클릭으로 볼 누른 시간
+CLICK_MAX_S = 2.0
+LONG_PRESS_S = 3.0             # 손날 길게 누르기 (모터 위치 리셋)
+
+# 손날 버튼 제스처 -> 동작 (TOUCH_WATCHER 일 때, robot_hand.gestures)
+# 'click', 'double_click', 'triple_click', 'hold_초', 'click_hold_초' 를 쓸 수 있습니다.
+# 동작: RELEASE 놓기, RESET 모터 위치 리셋, 'partial_open' 쥔 채로 조금 펴기,
+#       'tighten' 더 조이기, 'lock' 자이로 놓기 잠금/풀기
+# 클릭으로 시작하는 제스처('double_click' 등)를 더 묶으면 클릭으로 놓기는
+# GESTURE_GAP_S 동안 다음 클릭을 기다린 뒤에 놓습니다.
+# 'hold_초' 를 CLICK_MAX_S 보다 짧게 묶으면 그 시간보다 오래 누른 것은 클릭이 아니게 됩니다.
+# (예: 'hold_1' 을 묶으면 1~2초 누르고 떼도 놓지 않고 그 동작을 함)
+SIDE_GESTURES = {
+    'click': RELEASE,
+    'hold_3': RESET,
+    # 'hold_1': 'tighten',       # 1~3초 누르고 떼기 (클릭은 1초 미만이 됨)
+    # 'double_click': 'partial_open',
+    # 'triple_click': 'lock',
+}
+# 손날 버튼 제스처 -> 다음 잡기에 쓸 자세 'power', 'pinch', 'cylinder' (SIDE_GESTURES 와 겹치지 않게)
+SIDE_GESTURE_POSES = {
+    # 'double_click': 'pinch',
+    # 'triple_click': 'cylinder',
+}
+GESTURE_GAP_S = 0.4            # 여러 번 클릭에서 다음 클릭을 기다리는 시간
+PARTIAL_OPEN_FRACTION = 0.3    # 조금 펴기: 잡은 각도에서 되돌릴 비율
+TIGHTEN_DEGREES = 15           # 더 조이기: 모터마다 더 도는 각도
+
+# True 면 모터 위치를 내린 명령과 마지막으로 읽은 위치로 예측하고, 예측 오차가
+# ODOMETRY_BOUND_DEG 를 넘을 때만 모터를 읽습니다. 잡기는 아는 위치에서 남은 만큼만 움직입니다.
+MOTOR_ODOMETRY = True
+ODOMETRY_BOUND_DEG = 5
+
+# True 면 ev3dev2 대신 sysfs 파일을 열어 둔 채로 읽는 robot_hand.sysfs 장치를 씁니다.
+USE_FAST_SYSFS = False
+
+# True 면 장치들을 백그라운드에서 동시에 찾고, 찾은 센서부터 바로 씁니다. (터치 센서와 모터를
+# 찾으면 다른 센서를 찾거나 자이로를 보정하는 동안에도 터치로 잡을 수 있습니다)
+LAZY_DEVICES = True
+BOOT_REPORT = True             # 모든 센서가 준비되면 장치별로 찾는 데 걸린 시간을 출력
+
+# True 면 asyncio 이벤트 루프에서 트리거마다 코루틴 하나씩 돌립니다. (robot_hand.aio)
+USE_ASYNCIO = False
+
+# True 면 센서마다 백그라운드 스레드에서 읽어 두고, 메인 루프는 최신 값만 가져옵니다.
+USE_SENSOR_HUB = False
+HUB_PERIOD_S = 0.005           # 허브 스레드 읽기 주기
+
+# 틱마다 센서 값과 손 상태를 바이너리로 기록할 파일 (None 이면 기록하지 않음)
+# CSV 로 보기: python3 -m robot_hand.telemetry hand.rhtl -o hand.csv
+TELEMETRY_PATH = None          # 예: '/home/robot/hand.rhtl'
+
+# 센서 원시 값을 세션 파일로 남김 (None 이면 남기지 않음). 다른 설정으로 다시 돌려 비교하기:
+# python3 -m robot_hand.replay hand.rhss --variant new_version:ultrasonic.duration_s=1.5
+CAPTURE_PATH = None            # 예: '/home/robot/hand.rhss'
+
+# 대기 시간 (이 시간 동안에도 센서는 계속 읽습니다)
+GRASP_SETTLE_S = 1             # 잡은 뒤 안정화 시간
+RELEASE_COOLDOWN_S = 0         # 자이로로 놓은 뒤 안정화 시간
+
+# False 면 자이로 드리프트를 실행 중에 추정해서 보정하므로 시작할 때와 놓은 뒤에
+# gyro_sensor.reset() + sleep(2) 로 기다리지 않습니다. True 면 기존 방식입니다.
+GYRO_HARDWARE_RESET = False
+GYRO_CALIBRATION_S = 2         # GYRO_HARDWARE_RESET 일 때 시작 대기 시간
 # -----------------
 
-# --- 하드웨어 준비 ---
-finger_motor1 = LargeMotor(FINGER_MOTOR_1_PORT)
-finger_motor2 = LargeMotor(FINGER_MOTOR_2_PORT)
-thumb_motor = LargeMotor(THUMB_MOTOR_PORT)
-ultrasonic_sensor = UltrasonicSensor(ULTRASONIC_SENSOR_PORT)
-palm_touch_sensor = TouchSensor(PALM_TOUCH_SENSOR_PORT)
-side_touch_sensor = TouchSensor(SIDE_TOUCH_SENSOR_PORT)
-gyro_sensor = GyroSensor(GYRO_SENSOR_PORT)
-buttons = Button() 
-# --------------------
-
-# --- 핵심 동작 함수들 ---
-def grasp_hand():
-    """손을 쥐고 성공 여부를 반환합니다."""
-    
-    try:
-        finger_motor1.on_for_degrees(SpeedPercent(GRASP_SPEED), GRASP_DEGREES, block=False)
-        finger_motor2.on_for_degrees(SpeedPercent(GRASP_SPEED), GRASP_DEGREES, block=False)
-        thumb_motor.on_for_degrees(SpeedPercent(THUMB_RELEASE_SP), 200, block=True)
-        return True
-    except Exception:
-        return False
-
-def release_hand():
-    """손을 놓고 성공 여부를 반환합니다."""
-    try:
-        finger_motor1.on_to_position(SpeedPercent(RELEASE_SPEED), 0, block=False)
-        finger_motor2.on_to_position(SpeedPercent(RELEASE_SPEED), 0, block=False)
-        thumb_motor.on_to_position(SpeedPercent(RELEASE_SPEED), 0, block=True)
-        return True
-    except Exception:
-        return False
-
-def reset_motor_positions():
-    """현재 모터 위치를 새로운 0도로 설정합니다."""
-
-    finger_motor1.reset()
-    finger_motor2.reset()
-    thumb_motor.reset()
-# -------------------------
+# --- 손 설정과 트리거 ---
+config = HandConfig(
+    finger_motor_1_port=FINGER_MOTOR_1_PORT,
+    finger_motor_2_port=FINGER_MOTOR_2_PORT,
+    thumb_motor_port=THUMB_MOTOR_PORT,
+    ultrasonic_sensor_port=ULTRASONIC_SENSOR_PORT,
+    palm_touch_sensor_port=PALM_TOUCH_SENSOR_PORT,
+    side_touch_sensor_port=SIDE_TOUCH_SENSOR_PORT,
+    gyro_sensor_port=GYRO_SENSOR_PORT,
+    grasp_degrees=GRASP_DEGREES,
+    grasp_speed=GRASP_SPEED,
+    thumb_degrees=200,
+    thumb_speed=THUMB_RELEASE_SP,
+    grasp_pose=GRASP_POSE,
+    adaptive_grasp=ADAPTIVE_GRASP,
+    adaptive_speed=ADAPTIVE_SPEED,
+    hold_speed=HOLD_SPEED,
+    squeeze_deg=SQUEEZE_DEGREES,
+    sync_motion=SYNC_MOTION,
+    sync_speed=SYNC_SPEED,
+    ramp_ms=RAMP_MS,
+    release_speed=RELEASE_SPEED,
+    motion_timeout_s=MOTION_TIMEOUT_S,
+    motor_odometry=MOTOR_ODOMETRY,
+    odometry_bound_deg=ODOMETRY_BOUND_DEG,
+    grasp_settle_s=GRASP_SETTLE_S,
+    release_cooldown_s=RELEASE_COOLDOWN_S,
+    gyro_hardware_reset=GYRO_HARDWARE_RESET,
+    gyro_calibration_s=GYRO_CALIBRATION_S,
+    touch_period_s=TOUCH_PERIOD_S,
+    ultrasonic_period_s=ULTRASONIC_PERIOD_S,
+    gyro_period_s=GYRO_PERIOD_S,
+    button_period_s=BUTTON_PERIOD_S,
+    motion_period_s=MOTION_PERIOD_S,
+    state_period_s=STATE_TICK_S,
+    backend='sysfs' if USE_FAST_SYSFS else 'ev3dev2',
+    lazy_devices=LAZY_DEVICES,
+    boot_report=BOOT_REPORT,
+    use_sensor_hub=USE_SENSOR_HUB,
+    hub_period_s=HUB_PERIOD_S,
+    touch_watcher=TOUCH_WATCHER,
+    touch_watch_period_s=TOUCH_WATCH_PERIOD_S,
+    touch_debounce_s=TOUCH_DEBOUNCE_S,
+    click_min_s=CLICK_MIN_S,
+    click_max_s=CLICK_MAX_S,
+    long_press_s=LONG_PRESS_S,
+    partial_open_fraction=PARTIAL_OPEN_FRACTION,
+    tighten_deg=TIGHTEN_DEGREES,
+    telemetry_path=TELEMETRY_PATH,
+    capture_path=CAPTURE_PATH,
+)
+
+# 잡기: 초음파 감지 지속, 손바닥 터치 / 놓기: 팔 흔들기, 손날 클릭 / 리셋: 손날 길게 누르기
+triggers = [
+    UltrasonicDwell(ULTRASONIC_DISTANCE_CM, ULTRASONIC_DURATION_S, ULTRASONIC_RELEASE_CM,
+                    ULTRASONIC_WINDOW, ULTRASONIC_MAX_DROPOUTS, POSE_RULES if AUTO_POSE else None),
+    PalmPress() if TOUCH_WATCHER else PalmTouch(),
+    GyroRateSwing(SWING_AMPLITUDE_DEG, SWING_COUNT_TARGET),
+    (SideGestures(SIDE_GESTURES, CLICK_MIN_S, CLICK_MAX_S, GESTURE_GAP_S, SIDE_GESTURE_POSES)
+     if TOUCH_WATCHER else
+     SideClick(CLICK_MIN_S, CLICK_MAX_S, LONG_PRESS_S)),
+]
+# -----------------
 
 # --- 메인 프로그램 실행 ---
-
-# 자이로 센서 초기화
-gyro_sensor.reset()
-sleep(2)
-
-# --- 상태 및 타이머 변수 초기화 ---
-hand_state = 'open'
-ultrasonic_start_time = None
-
-# 자이로 센서 관련 변수
-last_check_time = time()
-last_angle = gyro_sensor.angle
-rotation_direction = 0  # 0: 중심, 1: +, -1: -
-rotation_count = 0
-
-side_touch_state = 'released'
-side_touch_press_time = 0
-# --------------------------------
-
-try:
-    while not buttons.backspace:
-        # --- 1. 잡기 동작 로직 (손이 열려 있을 때) ---
-        if hand_state == 'open':
-            # 1-1. 초음파 센서로 잡기
-            distance = ultrasonic_sensor.distance_centimeters
-            if distance < ULTRASONIC_DISTANCE_CM:
-                if ultrasonic_start_time is None:
-                    ultrasonic_start_time = time()
-                if time() - ultrasonic_start_time > ULTRASONIC_DURATION_S:
-                    if grasp_hand():
-                        hand_state = 'closed'
-                        # 잡기 성공 후 자이로 관련 변수 초기화
-                        last_check_time = time()
-                        last_angle = gyro_sensor.angle
-                        rotation_direction = 0
-                        rotation_count = 0
-                    ultrasonic_start_time = None
-                    sleep(1)
-            else:
-                ultrasonic_start_time = None
-
-            # 1-2. 손바닥 터치 센서로 잡기 (이미 잡는 중이 아닐 때)
-            if hand_state == 'open' and palm_touch_sensor.is_pressed:
-                if grasp_hand():
-                    hand_state = 'closed'
-                    # 잡기 성공 후 자이로 관련 변수 초기화
-                    last_check_time = time()
-                    last_angle = gyro_sensor.angle
-                    rotation_direction = 0
-                    rotation_count = 0
-                sleep(1)
-
-        # --- 2. 놓기 동작 로직 (손이 닫혀 있을 때) ---
-        else: # hand_state == 'closed'
-            current_time = time()
-            # 2-1. 자이로 센서로 놓기 (1초 간격으로 체크)
-            if current_time - last_check_time >= ROTATION_TIME_INTERVAL:
-                current_angle = gyro_sensor.angle
-                angle_change = current_angle - last_angle
-
-                # 1단계: 첫 번째 회전 감지
-                if rotation_direction == 0:
-                    if angle_change > ROTATION_ANGLE_THRESHOLD:
-                        rotation_direction = 1  # 양의 방향으로 회전 감지
-                    elif angle_change < -ROTATION_ANGLE_THRESHOLD:
-                        rotation_direction = -1 # 음의 방향으로 회전 감지
-                
-                # 2단계: 반대 방향 회전 감지
-                elif rotation_direction == 1:
-                    if angle_change < -ROTATION_ANGLE_THRESHOLD:
-                        rotation_count += 1
-                        rotation_direction = 0 # 카운트 후 초기화
-                elif rotation_direction == -1:
-                    if angle_change > ROTATION_ANGLE_THRESHOLD:
-                        rotation_count += 1
-                        rotation_direction = 0 # 카운트 후 초기화
-                
-                # 다음 측정을 위해 현재 상태 저장
-                last_check_time = current_time
-                last_angle = current_angle
-
-            # 목표 회전 횟수 도달 시 손 놓기
-            if rotation_count >= ROTATION_COUNT_TARGET:
-                if release_hand():
-                    hand_state = 'open'
-                # 변수 초기화
-                rotation_count = 0
-                rotation_direction = 0
-                gyro_sensor.reset()
-                sleep(2) # 안정화 시간
-
-        # --- 3. 손날 터치 센서 로직 (놓기/리셋) ---
-        side_is_pressed = side_touch_sensor.is_pressed
-        if side_is_pressed:
-            if side_touch_state == 'released':
-                side_touch_state = 'pressing'
-                side_touch_press_time = time()
-            elif side_touch_state == 'pressing':
-                # 3초 이상 길게 누르면 리셋
-                if time() - side_touch_press_time >= 3:
-                    reset_motor_positions()
-                    side_touch_state = 'action_taken' # 동작 수행 완료
-        else: # 손을 뗐을 때
-            if side_touch_state == 'pressing':
-                press_duration = time() - side_touch_press_time
-                # 짧은 클릭(0.1~2초) 시 놓기
-                if 0.1 < press_duration < 2.0 and hand_state == 'closed':
-                    if release_hand():
-                        hand_state = 'open'
-                    # 놓기 성공 후 자이로 관련 변수 초기화
-                    rotation_count = 0
-                    rotation_direction = 0
-            side_touch_state = 'released'
-
-        sleep(0.05)
-
-except KeyboardInterrupt:
-    pass
-
-finally:
-    finger_motor1.off()
-    finger_motor2.off()
-    thumb_motor.off()
+# OPEN -> GRASPING -> GRASP_SETTLING -> CLOSED -> RELEASING -> (RELEASE_COOLDOWN) -> OPEN
+# 시뮬레이터와 벤치마크의 'new_version' 프리셋은 위의 config 와 triggers 를 그대로 가져다 씁니다.
+# (robot_hand.controller.new_version_preset)
+if __name__ == '__main__':
+    (AsyncHandController if USE_ASYNCIO else HandController)(config, triggers).run()
@@ -0,0 +1,5 @@
+"""로봇 핸드 제어 스크립트들이 함께 쓰는 모듈 모음입니다.
+
+EV3에서 import 시간을 줄이기 위해 여기서는 아무것도 미리 가져오지 않습니다.
+필요한 모듈을 직접 import 해서 사용하세요.
+"""
@@ -0,0 +1,465 @@
+"""asyncio 이벤트 루프에서 트리거마다 코루틴 하나씩 돌리는 제어기 실행기입니다.
+
+HandController 는 센서 스케줄러가 모든 센서를 읽고, 무엇이든 읽을 때마다 틱을 돌려
+지금 상태의 트리거를 모두 평가합니다. AsyncHandController 는 같은 설정, 트리거,
+전이 표(robot_hand.statetable)를 쓰지만 일을 코루틴으로 나눕니다.
+
+- 센서: 장치를 찾을 때까지 (자이로는 보정할 때까지) 기다리는 코루틴이 끝나면
+  루프 콜백이 주기마다 읽고, 그 센서를 보는 트리거만 깨웁니다. (inputs 로 보는
+  트리거는 값이 바뀔 때만)
+- 트리거: 트리거마다 코루틴이 자기 센서(sources, inputs)의 새 값이나 자기 마감 시각
+  (next_deadline)을 기다렸다가 update 를 부릅니다. 손 상태가 active_states 가 아니면
+  상태가 바뀔 때까지 잠들어 있습니다.
+- 손 상태 만료: 만료 시각까지 잠들었다가 다음 상태로 넘깁니다.
+- 모터 동작: 잡기/놓기를 시작하면 동작 코루틴이 끝날 때까지 motion_period_s 마다
+  확인합니다. grasp_task() / release_task() 는 동작이 끝나면 결과가 들어오는 Future 를
+  반환하므로 다른 코루틴에서 await 할 수 있습니다.
+
+깨우기는 Wakeup 하나(Future 하나와 call_later 하나)로 하므로 asyncio.wait_for 처럼
+작업을 새로 만들지 않고, 어느 코루틴도 time.sleep 으로 멈추지 않습니다.
+가상 시계를 넣으면 virtual_loop() 로 기다리는 시간을 바로 건너뛰므로
+시뮬레이터(robot_hand.sim.run_controller)에서도 그대로 돌릴 수 있습니다.
+
+    python3 -m robot_hand.aio --scenario object_approach     # 시뮬레이터로 두 실행기 비교
+"""
+
+import argparse
+import asyncio
+import selectors
+
+from robot_hand.clock import VirtualClock
+from robot_hand.controller import (EVENT_SOURCES, PRESETS, SENSORS, SOURCE_ROLES,
+                                   HandController, make_controller)
+from robot_hand.motion import RUNNING
+from robot_hand.scheduler import SensorEvent
+from robot_hand.touch import TOUCH
+
+# 마감 시각을 이만큼 넘겨 깨웁니다. (now - start > duration 처럼 > 로 비교하는 트리거)
+LATE_S = 0.0001
+
+
+# ==========================================
+# 이벤트 루프
+# ==========================================
+class _VirtualSelector(selectors.SelectSelector):
+    """기다릴 시간만큼 가상 시계를 넘기고 바로 돌아오는 selector 입니다."""
+
+    def __init__(self, clock):
+        selectors.SelectSelector.__init__(self)
+        self.clock = clock
+
+    def select(self, timeout=None):
+        if timeout is None:
+            # 예약된 일이 없으면 다른 스레드가 call_soon_threadsafe 로 깨울 때까지 기다립니다.
+            return selectors.SelectSelector.select(self, None)
+        if timeout > 0:
+            self.clock.sleep(timeout)
+        return []
+
+
+class _VirtualLoop(asyncio.SelectorEventLoop):
+
+    def __init__(self, clock):
+        asyncio.SelectorEventLoop.__init__(self, _VirtualSelector(clock))
+        self.clock = clock
+
+    def time(self):
+        return self.clock.time()
+
+
+def virtual_loop(clock):
+    """clock(VirtualClock) 시각으로 도는 이벤트 루프입니다. 기다리는 시간은 바로 건너뜁니다."""
+    return _VirtualLoop(clock)
+
+
+class _Sampler(object):
+    """센서 하나를 주기마다 읽는 루프 콜백입니다. 코루틴보다 샘플마다 드는 비용이 작습니다."""
+
+    __slots__ = ('controller', 'loop', 'name', 'read', 'period', 'value', 'due', 'handle',
+                 'samples')
+
+    def __init__(self, controller, name, read, period):
+        self.controller = controller
+        self.loop = controller.loop
+        self.name = name
+        self.read = read
+        self.period = period
+        self.value = None
+        self.due = None
+        self.handle = None
+        self.samples = 0
+
+    def start(self):
+        self.due = self.loop.time()
+        self._run()
+
+    def cancel(self):
+        if self.handle is not None:
+            self.handle.cancel()
+
+    def _run(self):
+        try:
+            value = self.read()
+            changed = value != self.value
+            self.value = value
+            self.samples += 1
+            self.controller._on_read(self.name, value, changed)
+        except Exception as e:
+            self.controller._fail(e)
+            return
+        # 밀렸으면 건너뛰고 지금 기준으로 다시 맞춥니다. (SensorScheduler 와 같음)
+        now = self.loop.time()
+        due = self.due + self.period
+        if due <= now:
+            due = now + self.period
+        self.due = due
+        self.handle = self.loop.call_at(due, self._run)
+
+
+class Wakeup(object):
+    """한 코루틴을 깨우는 신호입니다. 기다리기 전에 온 신호도 놓치지 않습니다."""
+
+    __slots__ = ('loop', 'pending', '_future')
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.pending = False
+        self._future = None
+
+    def set(self):
+        self.pending = True
+        future = self._future
+        if future is not None and not future.done():
+            future.set_result(None)
+
+    async def wait(self, timeout=None):
+        """신호가 오거나 timeout 초가 지날 때까지 기다립니다."""
+        if not self.pending:
+            future = self._future = self.loop.create_future()
+            timer = None
+            if timeout is not None:
+                timer = self.loop.call_later(timeout, _wake, future)
+            try:
+                await future
+            finally:
+                self._future = None
+                if timer is not None:
+                    timer.cancel()
+        self.pending = False
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+# ==========================================
+# 제어기
+# ==========================================
+class AsyncHandController(HandController):
+    """HandController 와 같은 판단을 asyncio 코루틴으로 내리는 제어기입니다."""
+
+    def __init__(self, config=None, triggers=None, devices=None, clock=None):
+        HandController.__init__(self, config, triggers, devices, clock)
+        self.loop = None
+        self._wakes = {}        # 트리거 -> Wakeup
+        self._watchers = {}         # 센서 이름 -> 샘플마다 깨울 트리거(sources)의 Wakeup 목록
+        self._change_watchers = {}  # 센서 이름 -> 값이 바뀔 때 깨울 트리거(inputs)의 Wakeup 목록
+        self._samplers = {}     # 센서 이름 -> 샘플마다 부를 trigger.sample 목록
+        self._samplers_running = []
+        self._opening = 0       # 아직 읽기 시작하지 않은 센서 수
+        self._state_wake = None
+        self._motion_wake = None
+        self._motion_futures = {}
+        self._stopped = None
+        self.motion.subscribe(self._resolve_motion)
+
+    # --- 센서 ---
+    async def _open_sensor(self, name, read, period):
+        """센서 장치를 찾을 때까지 (자이로는 보정할 때까지) 기다렸다가 읽기 시작합니다."""
+        cfg = self.config
+        role = SOURCE_ROLES.get(name, name)
+        if self.probe is not None and role is not None:
+            while not self.probe.ready(role):
+                self.probe.check()
+                await asyncio.sleep(cfg.probe_period_s)
+        if name == 'gyro' and self.gyro_bias is None:
+            self.devices.gyro.reset()
+            await asyncio.sleep(cfg.gyro_calibration_s)
+        sampler = _Sampler(self, name, read, period)
+        self._samplers_running.append(sampler)
+        sampler.start()
+        self._opening -= 1
+        if not self._opening:
+            self._on_ready(self.clock.time())
+
+    async def _watch_probe(self):
+        """모터처럼 쓸 때만 찾는 장치도 못 찾으면 실행을 멈춥니다."""
+        probe = self.probe
+        while not probe.done():
+            await asyncio.sleep(self.config.probe_period_s)
+        probe.check()
+
+    def _on_read(self, name, value, changed):
+        now = self.clock.time()
+        if name in EVENT_SOURCES:
+            if name == 'backspace' and value:
+                self.stop()
+            if name != TOUCH or not value:
+                return
+        values = self.values
+        if name == 'gyro':
+            values['gyro'], values['gyro_rate'] = value
+        elif name != TOUCH:
+            values[name] = value
+            if name == 'palm_touch' and not value and self.config.lock_after_manual_release:
+                self.ready_to_grasp = True
+        samplers = self._samplers.get(name)
+        if samplers:
+            event = SensorEvent(name, value, now, changed, False)
+            for sample in samplers:
+                sample(event)
+        for wake in self._watchers.get(name, ()):
+            wake.set()
+        if changed:
+            for wake in self._change_watchers.get(name, ()):
+                wake.set()
+        if self.telemetry is not None:
+            self._record(now)
+
+    def _fail(self, error):
+        """콜백에서 난 예외를 main() 으로 넘겨 실행을 멈춥니다."""
+        if self._stopped is not None and not self._stopped.done():
+            self._stopped.set_exception(error)
+
+    def _task_done(self, task):
+        if not task.cancelled() and task.exception() is not None:
+            self._fail(task.exception())
+
+    # --- 코루틴 ---
+    async def _run_trigger(self, trigger, wake):
+        state = self.state
+        clock = self.clock
+        values = self.values
+        while True:
+            if state.name not in trigger.active_states:
+                await wake.wait()
+                continue
+            now = clock.time()
+            action = trigger.update(now, values)
+            if action is not None:
+                self._dispatch(action, trigger, now)
+            deadline = trigger.next_deadline()
+            await wake.wait(None if deadline is None else max(0.0, deadline - now) + LATE_S)
+
+    async def _run_state(self, wake):
+        state = self.state
+        while True:
+            now = self.clock.time()
+            previous = state.name
+            name = state.tick(now)
+            if name != previous:
+                self._on_state_change(previous, name, now)
+                continue
+            remaining = state.remaining(now)
+            await wake.wait(remaining)
+
+    async def _run_motion(self, wake):
+        motion = self.motion
+        period = self.config.motion_period_s
+        while True:
+            active = motion.active
+            if active is None or active.done:
+                await wake.wait()
+                continue
+            await asyncio.sleep(period)
+            motion.poll()
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.config.telemetry_flush_s)
+            self._flush_logs()
+
+    # --- 상태와 동작 알림 ---
+    def _on_state_change(self, previous, name, now):
+        HandController._on_state_change(self, previous, name, now)
+        if self.loop is None:
+            return
+        self._state_wake.set()
+        for wake in self._wakes.values():
+            wake.set()
+
+    def _start_motion(self, name):
+        started = HandController._start_motion(self, name)
+        if started and self._motion_wake is not None:
+            self._motion_wake.set()
+        return started
+
+    def _resolve_motion(self, event):
+        future = self._motion_futures.pop(event.handle, None)
+        if future is not None and not future.done():
+            future.set_result(event.status)
+
+    def motion_done(self, handle=None):
+        """handle(기본: 지금 동작)이 끝나면 결과(DONE, STALLED, ...)가 들어오는 Future 입니다."""
+        handle = handle if handle is not None else self.motion.active
+        future = self.loop.create_future()
+        if handle is None:
+            future.set_result(None)
+        elif handle.status != RUNNING:
+            future.set_result(handle.status)
+        else:
+            self._motion_futures.setdefault(handle, future)
+            future = self._motion_futures[handle]
+        return future
+
+    def grasp_task(self):
+        """잡기를 시작하고, 동작이 끝나면 결과가 들어오는 Future 를 반환합니다. 시작하지 못하면 None."""
+        return self.motion_done() if self.grasp() else None
+
+    def release_task(self):
+        """놓기를 시작하고, 동작이 끝나면 결과가 들어오는 Future 를 반환합니다. 시작하지 못하면 None."""
+        return self.motion_done() if self.release() else None
+
+    # --- 실행 ---
+    def coroutines(self):
+        """센서, 트리거, 손 상태, 모터 동작 코루틴들을 만듭니다."""
+        loop = self.loop
+        reads = self.sensor_reads()
+        for trigger in self.triggers:
+            wake = self._wakes[trigger] = Wakeup(loop)
+            for name in trigger.sources:
+                self._watchers.setdefault(name, []).append(wake)
+            for name in set(trigger.inputs) - set(trigger.sources):
+                self._change_watchers.setdefault(name, []).append(wake)
+            for name in trigger.sources:
+                self._samplers.setdefault(name, []).append(trigger.sample)
+        self._state_wake = Wakeup(loop)
+        self._motion_wake = Wakeup(loop)
+
+        coroutines = [self._open_sensor(name, reads[name][0], reads[name][1])
+                      for name in SENSORS + EVENT_SOURCES if name in reads]
+        self._opening = len(coroutines)
+        if self.probe is not None:
+            coroutines.append(self._watch_probe())
+        coroutines.extend(self._run_trigger(trigger, self._wakes[trigger])
+                          for trigger in self.triggers)
+        coroutines.append(self._run_state(self._state_wake))
+        coroutines.append(self._run_motion(self._motion_wake))
+        if (self.telemetry is not None or self.capture is not None) and \
+                self.config.telemetry_flush_s > 0:
+            coroutines.append(self._flush_periodically())
+        return coroutines
+
+    async def main(self):
+        """stop() 이 불리거나 코루틴 하나가 예외로 끝날 때까지 실행합니다."""
+        loop = self.loop
+        self.boot.mark('first_tick')
+        self._stopped = loop.create_future()
+        # 센서 값이 들어오기 전에 트리거를 초기화합니다.
+        for trigger in self._by_state[self.state.name]:
+            trigger.reset(self.clock.time(), self.values)
+        tasks = []
+        for coroutine in self.coroutines():
+            tasks.append(loop.create_task(coroutine))
+            tasks[-1].add_done_callback(self._task_done)
+        try:
+            await self._stopped
+        finally:
+            for sampler in self._samplers_running:
+                sampler.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.wait(tasks)
+
+    def stop(self):
+        """실행을 멈춥니다. 다른 스레드에서 불러도 됩니다."""
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._stop_now)
+
+    def _stop_now(self):
+        if self._stopped is not None and not self._stopped.done():
+            self._stopped.set_result(None)
+
+    def run(self):
+        """뒤로 가기 버튼을 누르거나 stop() 이 불릴 때까지 실행합니다."""
+        if isinstance(self.clock, VirtualClock):
+            self.loop = loop = virtual_loop(self.clock)
+        else:
+            self.loop = loop = asyncio.new_event_loop()
+        main = loop.create_task(self.main())
+        try:
+            loop.run_until_complete(main)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            # 가상 시계가 끝났거나 Ctrl+C 로 빠져나왔으면 남은 코루틴을 정리합니다.
+            if not main.done():
+                main.cancel()
+                try:
+                    loop.run_until_complete(main)
+                except asyncio.CancelledError:
+                    pass
+            loop.close()
+            if self.hub is not None:
+                self.hub.stop()
+            if self.touch is not None:
+                self.touch.stop()
+            self.off()
+            self._flush_logs()
+
+
+def make_async_controller(preset, devices=None, clock=None):
+    """PRESETS 이름으로 AsyncHandController 를 만듭니다."""
+    config, triggers = PRESETS[preset]()
+    return AsyncHandController(config, triggers, devices, clock)
+
+
+def samples_read(controller):
+    """제어기가 지금까지 읽은 센서 샘플 수입니다."""
+    if isinstance(controller, AsyncHandController):
+        return sum(sampler.samples for sampler in controller._samplers_running)
+    return sum(source.samples for name, source in controller.scheduler.sources.items()
+               if name in SENSORS or name == 'backspace')
+
+
+def main(argv=None):
+    from robot_hand.scenarios import SCENARIOS
+    from robot_hand.sim import run_controller
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('presets', nargs='*', default=sorted(PRESETS))
+    parser.add_argument('--scenario', default=None, choices=sorted(SCENARIOS),
+                        help='시나리오 (기본: 전부)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-noise', action='store_true',
+                        help='센서 잡음 없이 (잡음은 센서를 읽는 순서에 따라 달라짐)')
+    args = parser.parse_args(argv)
+
+    names = [args.scenario] if args.scenario else sorted(SCENARIOS)
+    print('같은 시나리오에서 판단(동작, 트리거)이 같은지와 센서 샘플 하나에 든 실제 시간입니다.')
+    print('%-18s %-18s %-9s %8s %13s %8s' % (
+        'preset', 'scenario', 'decisions', 'max dt', 'sched us/samp', 'aio'))
+    for preset in args.presets:
+        for name in names:
+            runs = []
+            for make in (make_controller, make_async_controller):
+                controllers = []
+
+                def build(devices, clock, make=make):
+                    controllers.append(make(preset, devices, clock))
+                    return controllers[-1]
+                result = run_controller(build, SCENARIOS[name](), seed=args.seed,
+                                        noise=not args.no_noise)
+                runs.append((controllers[0].history,
+                             result.wall_time / max(1, samples_read(controllers[0]))))
+            (base, base_cost), (other, other_cost) = runs
+            same = [h[1:] for h in base] == [h[1:] for h in other]
+            dt = max([abs(a[0] - b[0]) for a, b in zip(base, other)] or [0.0])
+            print('%-18s %-18s %-9s %5.0f ms %13.1f %8.1f' % (
+                preset, name, 'same' if same else 'DIFFERENT', dt * 1000,
+                base_cost * 1e6, other_cost * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+"""무작위 시나리오 수천 개를 프로세스 풀에 나눠 돌리고 판단 결과를 모읍니다.
+
+시나리오 번호마다 시드를 정해서 작업자 안에서 시나리오를 만들므로 프로세스 사이에
+넘기는 것은 (설정 이름, 시작 번호, 개수) 와 작업 묶음(shard)별로 합친 지표뿐입니다.
+작업자끼리 나누는 상태가 없어서 처리량은 코어 수에 비례하고, 같은 --seed 면
+프로세스 수와 상관없이 같은 결과가 나옵니다.
+
+시나리오 종류 (물체가 다가오는 속도, 센서 잡음, 흔드는 방식, 버튼 누르는 시간을 무작위로 바꿈):
+
+- offer_swing:  물체를 내밀고 기다렸다가 팔을 목표 횟수만큼 흔듦 -> 잡기, 놓기
+- palm_click:   손바닥 터치로 잡고 손날 버튼을 짧게 누름 -> 잡기, 놓기
+- pass_by:      물체가 손 앞을 잠깐 스쳐 지나감 -> 아무것도 안 함
+- swing_once:   손바닥 터치로 잡고 팔을 한 번만 흔들거나 기울임 -> 잡기만
+- long_press:   손바닥 터치로 잡고 손날 버튼을 길게 누름 -> 잡기, 리셋
+
+설정은 robot_hand.replay 와 같은 'PRESET:키=값,...' 형식입니다.
+
+    python3 -m robot_hand.batch --scenarios 2000 --processes 4
+    python3 -m robot_hand.batch --scenarios 500 new_version demo3 new_version:grasp_settle_s=0.5
+"""
+
+import argparse
+import multiprocessing
+import random
+import time as real_time
+
+from robot_hand import stats
+from robot_hand.replay import variant_factory
+from robot_hand.scenarios import PALM, SIDE, Scenario
+from robot_hand.sim import run_controller
+from robot_hand.triggers import GRASP, RELEASE, RESET
+
+KINDS = ('offer_swing', 'palm_click', 'pass_by', 'swing_once', 'long_press')
+ACTIONS = (GRASP, RELEASE, RESET)
+
+
+# ==========================================
+# 무작위 시나리오
+# ==========================================
+def make_scenario(index, seed):
+    """번호 index 의 시나리오와 기대하는 판단 [(동작, 이 시각 이후, 지연 기준 시각)] 을 만듭니다.
+
+    시나리오마다 센서 잡음 설정 (초음파 잡음, 튀는 값 비율, 자이로 드리프트, 자이로 잡음) 도 반환합니다.
+    """
+    rng = random.Random(seed * 1000003 + index)
+    kind = KINDS[index % len(KINDS)]
+    noise = (rng.uniform(0.1, 1.0), rng.uniform(0.0, 0.08),
+             rng.uniform(-0.5, 0.5), rng.uniform(0.2, 1.5))
+    at = rng.uniform(1.0, 3.0)
+    expect = []
+    scenario = Scenario(kind, 30.0)
+    if kind == 'offer_swing':
+        scenario.approach(at=at, near_cm=rng.uniform(1.5, 4.0), speed_cm_s=rng.uniform(10, 40),
+                          hold=rng.uniform(4.0, 7.0))
+        arrived = scenario.mark('object_arrived')
+        expect.append((GRASP, at, arrived))
+        swing_at = arrived + rng.uniform(4.0, 6.0)
+        period = rng.uniform(1.0, 2.5)
+        scenario.swing(at=swing_at, count=2, amplitude=rng.uniform(60, 140), period=period)
+        expect.append((RELEASE, swing_at, scenario.mark('swing_done')))
+    elif kind == 'pass_by':
+        scenario.approach(at=at, near_cm=rng.uniform(1.5, 4.0), speed_cm_s=rng.uniform(20, 60),
+                          hold=rng.uniform(0.0, 1.0))
+    else:
+        press = rng.uniform(0.05, 1.0)
+        scenario.press(PALM, at, press)
+        expect.append((GRASP, at, at))
+        later = at + rng.uniform(4.0, 8.0)
+        if kind == 'palm_click':
+            click = rng.uniform(0.15, 1.8)
+            scenario.press(SIDE, later, click)
+            expect.append((RELEASE, later, later + click))
+        elif kind == 'long_press':
+            hold = rng.uniform(3.2, 5.0)
+            scenario.press(SIDE, later, hold)
+            expect.append((RESET, later, later + 3.0))  # SideClick 의 long_press_s 부터
+        elif rng.random() < 0.5:
+            scenario.swing(at=later, count=1, amplitude=rng.uniform(60, 140),
+                           period=rng.uniform(1.0, 2.5))
+        else:
+            scenario.tilt(later, rng.choice((-1, 1)) * rng.uniform(60, 120), rng.uniform(1.0, 3.0))
+    scenario.duration = max(mark for mark, _ in scenario.marks) + 6.0 if scenario.marks else 10.0
+    return scenario, expect, noise
+
+
+def match(decisions, expect):
+    """기대한 판단마다 (동작, 지연 또는 None) 과 기대하지 않은 판단 목록을 반환합니다."""
+    used = set()
+    results = []
+    for action, earliest, reference in expect:
+        found = None
+        for i, (t, decided, _) in enumerate(decisions):
+            if i not in used and decided == action and t >= earliest:
+                found = i
+                break
+        if found is None:
+            results.append((action, None))
+        else:
+            used.add(found)
+            results.append((action, decisions[found][0] - reference))
+    unexpected = [decisions[i] for i in range(len(decisions)) if i not in used]
+    return results, unexpected
+
+
+# ==========================================
+# 작업자
+# ==========================================
+def new_metrics():
+    return {
+        'scenarios': 0,
+        'sim_time': 0.0,
+        'wall_time': 0.0,
+        'latency': dict((action, []) for action in ACTIONS),
+        'missed': dict((action, 0) for action in ACTIONS),
+        'unexpected': dict((action, 0) for action in ACTIONS),
+        'failed': dict((kind, 0) for kind in KINDS),  # 기대와 다르게 끝난 시나리오 수
+    }
+
+
+def merge(total, part):
+    total['scenarios'] += part['scenarios']
+    total['sim_time'] += part['sim_time']
+    total['wall_time'] += part['wall_time']
+    for key in ('latency', 'missed', 'unexpected', 'failed'):
+        for name, value in part[key].items():
+            total[key][name] += value
+    return total
+
+
+def run_shard(job):
+    """(설정, 시드, 시작 번호, 개수) 작업 묶음을 돌리고 합친 지표를 반환합니다."""
+    spec, seed, start, count = job
+    make_variant = variant_factory(spec)
+    metrics = new_metrics()
+    for index in range(start, start + count):
+        scenario, expect, noise = make_scenario(index, seed)
+        controllers = []
+
+        def make(devices, clock):
+            devices.ultrasonic.noise_cm, devices.ultrasonic.spike_rate = noise[:2]
+            devices.gyro.drift_dps, devices.gyro.noise_deg = noise[2:]
+            controllers.append(make_variant(devices, clock))
+            return controllers[-1]
+        result = run_controller(make, scenario, seed=seed * 7919 + index)
+        results, unexpected = match(controllers[0].history, expect)
+        for action, latency in results:
+            if latency is None:
+                metrics['missed'][action] += 1
+            else:
+                metrics['latency'][action].append(latency)
+        for _, action, _ in unexpected:
+            metrics['unexpected'][action] += 1
+        if unexpected or any(latency is None for _, latency in results):
+            metrics['failed'][scenario.name] += 1
+        metrics['scenarios'] += 1
+        metrics['sim_time'] += result.sim_time
+        metrics['wall_time'] += result.wall_time
+    return metrics
+
+
+def run_batch(spec, scenarios, seed=1, processes=None, shard_size=20):
+    """spec 설정으로 시나리오 scenarios 개를 돌려 합친 지표를 반환합니다."""
+    jobs = [(spec, seed, start, min(shard_size, scenarios - start))
+            for start in range(0, scenarios, shard_size)]
+    total = new_metrics()
+    if processes == 1:
+        for job in jobs:
+            merge(total, run_shard(job))
+        return total
+    pool = multiprocessing.Pool(processes)
+    try:
+        for part in pool.imap_unordered(run_shard, jobs):
+            merge(total, part)
+    finally:
+        pool.close()
+        pool.join()
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('variants', nargs='*', default=['new_version'], help='설정')
+    parser.add_argument('--scenarios', type=int, default=500)
+    parser.add_argument('--processes', type=int, default=None, help='작업 프로세스 수 (기본: 코어 수)')
+    parser.add_argument('--shard-size', type=int, default=20, help='작업 묶음 하나의 시나리오 수')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    processes = args.processes or multiprocessing.cpu_count()
+    print('%d scenarios x %d variants, %d processes' % (
+        args.scenarios, len(args.variants), processes))
+    for spec in args.variants:
+        variant_factory(spec)  # 잘못 적은 설정은 작업자를 띄우기 전에 알려 줍니다.
+        start = real_time.perf_counter()
+        total = run_batch(spec, args.scenarios, args.seed, processes, args.shard_size)
+        elapsed = real_time.perf_counter() - start
+        print('== %s' % spec)
+        for action in ACTIONS:
+            _, points, worst = stats.summarize(total['latency'][action], (50, 95))
+            print('   %-8s p50 %s  p95 %s  max %s ms   missed %4d  unexpected %4d' % (
+                action, stats.format_ms(points[50]), stats.format_ms(points[95]),
+                stats.format_ms(worst), total['missed'][action], total['unexpected'][action]))
+        print('   failed scenarios: ' + ', '.join(
+            '%s %d' % (kind, total['failed'][kind]) for kind in KINDS))
+        print('   simulated %.0f s in %.1f s (%.0f scenarios/s, x%.0f real time)' % (
+            total['sim_time'], elapsed, total['scenarios'] / elapsed,
+            total['sim_time'] / elapsed))
+
+
+if __name__ == '__main__':
+    main()
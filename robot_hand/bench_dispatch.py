@@ -0,0 +1,109 @@
+"""손 전이 표를 처리하는 비용을 컴파일한 분기 표와 표를 그대로 훑는 방식으로 비교합니다.
+
+- 사건 처리: 모든 (상태, 사건) 칸을 돌아가며 처리할 줄을 찾는 데 걸린 시간.
+  조건은 모두 맞지 않는다고 보고 칸의 마지막 줄까지 찾게 하며, 동작은 아무것도 하지 않습니다.
+  interpreted 는 틱마다 표를 위에서부터 훑으며 상태/사건 문자열을 비교하고 조건/동작을
+  이름으로 찾는 방식, compiled 는 robot_hand.statetable.compile_table 의 분기 표입니다.
+- 틱: 설정별로 열린 손과 닫힌 손에서 HandController.tick 한 번에 걸린 시간
+  (센서 값은 그대로라 아무 동작도 하지 않는 평소 틱입니다)
+
+    python3 -m robot_hand.bench_dispatch
+    python3 -m robot_hand.bench_dispatch --repeat 200000 new_version demo3
+"""
+
+import argparse
+import time as real_time
+
+from robot_hand.controller import PRESETS, HandConfig, make_controller
+from robot_hand.scenarios import Scenario
+from robot_hand.sim import SimWorld
+from robot_hand.states import CLOSED, OPEN, STATES
+from robot_hand.statetable import EVENTS, HAND_TABLE, compile_table
+
+
+def null_handler(table):
+    """표의 조건은 모두 False, 동작은 아무것도 하지 않는 제어기 대역을 만듭니다."""
+    methods = {
+        'config': HandConfig(),
+        '_change_state': lambda self, name, duration=None, then=None: None,
+    }
+    for row in table:
+        if row.guard is not None:
+            methods['_if_' + row.guard] = lambda self, trigger: False
+        if row.action is not None:
+            methods['_do_' + row.action] = lambda self, trigger, now: None
+    return type('NullHandler', (object,), methods)()
+
+
+def interpret(table, handler, state, event, trigger, now):
+    """compile 하지 않고 표를 위에서부터 훑어 사건을 처리합니다. (비교 기준)"""
+    for row in table:
+        if row.event != event:
+            continue
+        if state != row.states if isinstance(row.states, str) else state not in row.states:
+            continue
+        if row.guard is not None and not getattr(handler, '_if_' + row.guard)(trigger):
+            continue
+        if row.action is not None and getattr(handler, '_do_' + row.action)(trigger, now) is False:
+            return False
+        if row.target is not None:
+            duration = None if row.duration is None else getattr(handler.config, row.duration)
+            handler._change_state(row.target, duration, row.then)
+        return True
+    return False
+
+
+def bench_events(table, repeat):
+    """(interpreted, compiled) 사건 한 번 처리에 걸린 시간(초)을 반환합니다."""
+    cells = [(state, event) for state in STATES for event in EVENTS]
+    handler = null_handler(table)
+    machine = compile_table(table, handler)
+    rounds = max(1, repeat // len(cells))
+
+    start = real_time.perf_counter()
+    for _ in range(rounds):
+        for state, event in cells:
+            interpret(table, handler, state, event, None, 0.0)
+    interpreted = real_time.perf_counter() - start
+
+    fire = machine.fire
+    start = real_time.perf_counter()
+    for _ in range(rounds):
+        for state, event in cells:
+            fire(state, event, None, 0.0)
+    compiled = real_time.perf_counter() - start
+    count = rounds * len(cells)
+    return interpreted / count, compiled / count
+
+
+def bench_tick(preset, state, repeat):
+    """preset 제어기가 state 상태에 있을 때 tick 한 번에 걸린 시간(초)을 반환합니다."""
+    world = SimWorld(Scenario('idle', 1.0), seed=0)
+    controller = make_controller(preset, world.hand_devices(), world.clock)
+    controller.state.enter(state)
+    tick = controller.tick
+    now = world.clock.now
+    start = real_time.perf_counter()
+    for i in range(repeat):
+        tick(now + i * 1e-6)
+    return (real_time.perf_counter() - start) / repeat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('presets', nargs='*', default=sorted(PRESETS), help='설정 이름')
+    parser.add_argument('--repeat', type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    interpreted, compiled = bench_events(HAND_TABLE, args.repeat)
+    print('%d rows, %d states x %d events' % (len(HAND_TABLE), len(STATES), len(EVENTS)))
+    print('event  interpreted %6.2f us  compiled %6.2f us  (x%.1f)' % (
+        interpreted * 1e6, compiled * 1e6, interpreted / compiled))
+    print('%-18s %9s %9s' % ('tick (us)', OPEN, CLOSED))
+    for preset in args.presets:
+        print('%-18s %9.2f %9.2f' % (preset, bench_tick(preset, OPEN, args.repeat) * 1e6,
+                                     bench_tick(preset, CLOSED, args.repeat) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""고정 각도 잡기와 적응형 잡기를 물체 크기별로 비교합니다.
+
+손바닥 터치로 잡고 손날 클릭으로 놓는 시나리오를 물체 크기(손가락이 닿는 위치)를
+바꿔 가며 시뮬레이션하고 다음을 보고합니다.
+
+- 잡기 완료: 잡기 명령 -> 잡기 동작 종료 이벤트 (모든 모터가 닿아 버티거나 끝까지 움직임)
+- 갈림: 모터가 멈춘(stall) 채로 계속 힘을 준 시간의 합 (잡은 뒤 놓을 때까지)
+
+    python3 -m robot_hand.bench_grasp --trials 20
+"""
+
+import argparse
+import random
+
+from robot_hand import stats
+from robot_hand.controller import HandConfig, HandController, default_triggers
+from robot_hand.scenarios import PALM, SIDE, Scenario
+from robot_hand.sim import run_controller
+
+MODES = {
+    'fixed': HandConfig(),
+    'adaptive': HandConfig(adaptive_grasp=True),
+}
+
+
+def run_trial(config, fraction, seed):
+    """(잡기 완료까지 걸린 시간, 갈림 시간) 을 반환합니다."""
+    scenario = (Scenario('grasp', 10.0)
+                .press(PALM, 1.0, 0.3)
+                .press(SIDE, 7.0, 0.3))
+    scenario.object_fraction = fraction
+    controllers = []
+    finished = []
+
+    def make(devices, clock):
+        controller = HandController(config, default_triggers(), devices, clock)
+        controller.motion.subscribe(lambda event: finished.append(event))
+        controllers.append(controller)
+        return controller
+
+    result = run_controller(make, scenario, seed)
+    grasps = [event for event in finished if event.handle.name == 'grasp']
+    secure = grasps[0].timestamp - grasps[0].handle.started if grasps else None
+    grinding = sum(motor.stalled_time for motor in controllers[0].devices.motors)
+    return secure, grinding, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--trials', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    # 물체 크기: 잡기 구간 중 손가락이 닿는 위치 (None 은 빈 손)
+    fractions = [rng.uniform(0.2, 0.9) for _ in range(args.trials)] + [None]
+    print('%d objects (+ empty hand)' % args.trials)
+    print('%-9s %7s %7s %7s %10s %10s  (ms)' % (
+        'mode', 'p50', 'p95', 'max', 'grind p50', 'grind max'))
+    for name in sorted(MODES):
+        secures = []
+        grinds = []
+        for i, fraction in enumerate(fractions):
+            secure, grinding, _ = run_trial(MODES[name], fraction, args.seed * 1000 + i)
+            if secure is not None:
+                secures.append(secure)
+            grinds.append(grinding)
+        _, points, worst = stats.summarize(secures, (50, 95))
+        _, grind_points, grind_worst = stats.summarize(grinds, (50,))
+        print('%-9s  %s  %s  %s     %s     %s' % (
+            name, stats.format_ms(points[50]), stats.format_ms(points[95]),
+            stats.format_ms(worst), stats.format_ms(grind_points[50]),
+            stats.format_ms(grind_worst)))
+
+
+if __name__ == '__main__':
+    main()
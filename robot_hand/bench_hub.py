@@ -0,0 +1,74 @@
+"""메인 루프가 센서를 직접 읽을 때와 센서 허브 값을 읽을 때의 틱 비용을 비교합니다.
+
+가짜 센서에 sysfs 읽기 지연을 넣어 실행합니다.
+
+    python3 -m robot_hand.bench_hub --latency 0.002 --ticks 200
+"""
+
+import argparse
+from time import perf_counter
+
+from robot_hand.fake_ev3 import FakeGyroSensor, FakeTouchSensor, FakeUltrasonicSensor
+from robot_hand.hub import SensorHub
+
+
+def make_sensors(latency):
+    return {
+        'ultrasonic': (FakeUltrasonicSensor('in1', latency=latency), 'distance_centimeters'),
+        'palm_touch': (FakeTouchSensor('in2', latency=latency), 'is_pressed'),
+        'side_touch': (FakeTouchSensor('in3', latency=latency), 'is_pressed'),
+        'gyro': (FakeGyroSensor('in4', latency=latency), 'angle'),
+    }
+
+
+def tick_direct(sensors, ticks):
+    """기존 방식: 틱마다 모든 센서를 순서대로 읽습니다."""
+    costs = []
+    for _ in range(ticks):
+        start = perf_counter()
+        for device, attr in sensors.values():
+            getattr(device, attr)
+        costs.append(perf_counter() - start)
+    return costs
+
+
+def tick_hub(sensors, ticks, period):
+    """허브 방식: 백그라운드 스레드가 읽고 틱에서는 최신 값만 가져옵니다."""
+    hub = SensorHub()
+    for name, (device, attr) in sensors.items():
+        hub.add(name, lambda device=device, attr=attr: getattr(device, attr), period)
+    hub.start()
+    hub.wait_ready()
+    readers = [hub.reader(name) for name in sensors]
+    costs = []
+    try:
+        for _ in range(ticks):
+            start = perf_counter()
+            for read in readers:
+                read()
+            costs.append(perf_counter() - start)
+    finally:
+        hub.stop()
+    return costs
+
+
+def summary(costs):
+    costs = sorted(costs)
+    n = len(costs)
+    return 'mean %8.1f us  p50 %8.1f us  max %8.1f us' % (
+        sum(costs) / n * 1e6, costs[n // 2] * 1e6, costs[-1] * 1e6)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--latency', type=float, default=0.002, help='센서 한 번 읽는 데 걸리는 시간 (초)')
+    parser.add_argument('--ticks', type=int, default=200)
+    parser.add_argument('--period', type=float, default=0.005, help='허브 스레드 읽기 주기 (초)')
+    args = parser.parse_args(argv)
+
+    print('direct: ' + summary(tick_direct(make_sensors(args.latency), args.ticks)))
+    print('hub:    ' + summary(tick_hub(make_sensors(args.latency), args.ticks, args.period)))
+
+
+if __name__ == '__main__':
+    main()
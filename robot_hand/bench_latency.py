@@ -0,0 +1,235 @@
+"""잡기/놓기 트리거에서 모터 명령까지의 지연 시간을 스크립트별로 측정합니다.
+
+각 스크립트를 시뮬레이터에서 무작위 시나리오로 여러 번 돌리고 다음을 보고합니다.
+
+- ultrasonic: 물체가 ULTRASONIC_DISTANCE_CM 안에 들어온 시각 -> 잡기 명령 (감지 지속 시간 포함)
+- palm:       손바닥 터치를 누른 시각 -> 잡기 명령
+- swing:      목표 횟수만큼 팔을 다 흔든 시각 -> 놓기 명령
+              (흔들기 도중에 놓으면 음수, 흔들기 시작 전 명령은 세지 않음)
+- side_click: 손날 버튼을 뗀 시각 -> 놓기 명령
+- 동작 시간: 잡기/놓기 명령 -> 세 모터가 모두 도착하거나 물체에 닿아 멈춘 시각
+- 루프 주기: 손날 터치 센서를 읽는 간격 (p50/p95/p99/최대)
+- 틱당 CPU: 실행 중 CPU 시간 / 손날 터치 센서 읽기 횟수 (시뮬레이터 비용 포함)
+
+    python3 -m robot_hand.bench_latency --trials 20
+    python3 -m robot_hand.bench_latency preset:new_version preset:demo3
+
+preset:NAME 은 robot_hand.controller.PRESETS 의 설정을 스크립트 없이 바로 돌립니다.
+"""
+
+import argparse
+import random
+import re
+import time as real_time
+
+from robot_hand import stats
+from robot_hand.scenarios import PALM, SIDE, Scenario
+from robot_hand.sim import load_source, run_controller, run_script
+
+VARIANTS = ('robort_hand_new_version.py', 'robort_hand_demo3.py', 'solution-1', 'solution-2')
+TRIGGERS = ('ultrasonic', 'palm', 'swing', 'side_click')
+
+GRASP_COMMAND = 'grasp'
+RELEASE_COMMAND = 'release'
+MOVE_COMMANDS = ('on_for_degrees', 'on_to_position')
+MOTOR_PORTS = ('outA', 'outB', 'outC')
+ARRIVALS = ('arrived', 'stalled')
+
+
+def motion_kind(entry):
+    """모터 명령 기록이 잡기인지 놓기인지 가릅니다. (0도로 가는 명령이 놓기)
+
+    잡기는 on_for_degrees 나, motor_odometry 를 켜면 목표 위치로 가는 on_to_position 입니다.
+    """
+    if entry.command not in MOVE_COMMANDS:
+        return None
+    return RELEASE_COMMAND if entry.command == 'on_to_position' and entry.value == 0 \
+        else GRASP_COMMAND
+
+
+def cycle_times(log, command, other):
+    """command 명령마다 세 모터가 모두 도착하거나 멈추기까지 걸린 시간을 구합니다.
+
+    명령 뒤에 같은 포트로 다시 내린 command 명령(예: 닿은 뒤 조이기)은 같은 동작으로
+    보고, other 명령이나 다음 command 동작이 오기 전까지의 마지막 도착을 씁니다.
+    """
+    times = []
+    # 세 모터에 같은 시각에 내린 명령 묶음 중 other 뒤에 처음 오는 것을 동작의 시작으로 봅니다.
+    sent = {}
+    for entry in log:
+        kind = motion_kind(entry)
+        if kind in (command, other) and entry.port in MOTOR_PORTS:
+            sent.setdefault((entry.time, kind), set()).add(entry.port)
+    starts = []
+    previous = None
+    for t, kind in sorted(key for key, ports in sent.items() if len(ports) == len(MOTOR_PORTS)):
+        if kind == command and previous != command:
+            starts.append(t)
+        previous = kind
+    for start in starts:
+        ends = []
+        for port in MOTOR_PORTS:
+            entries = sorted((entry for entry in log if entry.port == port and entry.time >= start),
+                             key=lambda entry: entry.time)
+            end = None
+            for entry in entries[1:]:
+                kind = motion_kind(entry)
+                if kind == other or (kind == command and entry.time in starts):
+                    break
+                if entry.command in ARRIVALS:
+                    end = entry.time
+            ends.append(end)
+        if None not in ends:
+            times.append(max(ends) - start)
+    return times
+
+
+def read_setting(path, names, default):
+    """스크립트 소스에서 names 중 처음 찾은 정수 설정값을 읽습니다."""
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    for name in names:
+        match = re.search(r'^%s\s*=\s*([\d.]+)' % name, source, re.M)
+        if match:
+            return float(match.group(1))
+    return default
+
+
+def make_trial(trigger, rng, swing_count, near_threshold_cm):
+    """trigger 를 측정할 무작위 시나리오와 (명령을 찾기 시작할 시각, 기준 시각)을 만듭니다."""
+    if trigger == 'ultrasonic':
+        scenario = Scenario('ultrasonic', 14.0).approach(
+            at=rng.uniform(2.5, 3.5), speed_cm_s=rng.uniform(10, 30), hold=6.0)
+        # 물체가 감지 거리 안으로 들어온 시각
+        start, arrive = scenario.segments[0][:2]
+        far, near = scenario.segments[0][2:]
+        t0 = start + (arrive - start) * (far - near_threshold_cm) / (far - near)
+        return scenario, (t0, t0), GRASP_COMMAND
+    if trigger == 'palm':
+        at = rng.uniform(2.5, 3.5)
+        return Scenario('palm', 7.0).press(PALM, at, 0.5), (at, at), GRASP_COMMAND
+    if trigger == 'swing':
+        period = rng.uniform(1.5, 2.5)
+        scenario = (Scenario('swing', 12.0 + period * swing_count)
+                    .press(PALM, 3.0, 0.5)
+                    .swing(at=rng.uniform(6.0, 7.0), count=swing_count,
+                           amplitude=rng.uniform(100, 140), period=period))
+        return scenario, (scenario.mark('swing_start'), scenario.mark('swing_done')), RELEASE_COMMAND
+    if trigger == 'side_click':
+        scenario = (Scenario('side_click', 11.0)
+                    .press(PALM, 3.0, 0.5)
+                    .press(SIDE, rng.uniform(6.0, 7.0), rng.uniform(0.2, 1.0)))
+        t0 = scenario.mark(SIDE + '_release')
+        return scenario, (t0, t0), RELEASE_COMMAND
+    raise ValueError(trigger)
+
+
+class VariantReport(object):
+    """스크립트 하나의 측정 결과를 모읍니다."""
+
+    def __init__(self, path):
+        self.path = path
+        self.latencies = dict((trigger, []) for trigger in TRIGGERS)
+        self.misses = dict((trigger, 0) for trigger in TRIGGERS)
+        self.intervals = []
+        self.cycles = {GRASP_COMMAND: [], RELEASE_COMMAND: []}
+        self.ticks = 0
+        self.cpu = 0.0
+        self.sim_time = 0.0
+        self.wall_time = 0.0
+        self.error = None
+
+    def add(self, trigger, result, window, command):
+        world = result.world
+        since, t0 = window
+        after = [entry.time for entry in world.log
+                 if motion_kind(entry) == command and entry.time >= since]
+        if after:
+            self.latencies[trigger].append(after[0] - t0)
+        else:
+            self.misses[trigger] += 1
+        self.cycles[GRASP_COMMAND].extend(cycle_times(world.log, GRASP_COMMAND, RELEASE_COMMAND))
+        self.cycles[RELEASE_COMMAND].extend(cycle_times(world.log, RELEASE_COMMAND, GRASP_COMMAND))
+        times = world.reads.get(SIDE, [])
+        self.intervals.extend(b - a for a, b in zip(times, times[1:]))
+        self.ticks += len(times)
+        self.sim_time += result.sim_time
+        self.wall_time += result.wall_time
+
+
+def read_preset(name):
+    """프리셋의 트리거에서 (흔들기 목표 횟수, 초음파 감지 거리)를 읽습니다."""
+    from robot_hand.controller import PRESETS
+    _, triggers = PRESETS[name]()
+    swing_count, threshold = 2, 5
+    for trigger in triggers:
+        swing_count = getattr(trigger, 'count_target', swing_count)
+        threshold = getattr(trigger, 'distance_cm', threshold)
+    return swing_count, threshold
+
+
+def run_variant(path, trials, seed):
+    report = VariantReport(path)
+    if path.startswith('preset:'):
+        preset = path[len('preset:'):]
+        swing_count, threshold = read_preset(preset)
+        run = lambda scenario, seed: run_controller(preset, scenario, seed)
+    else:
+        swing_count = int(read_setting(path, ('SWING_COUNT_TARGET', 'ROTATION_COUNT_TARGET'), 2))
+        threshold = read_setting(path, ('ULTRASONIC_DISTANCE_CM', 'US_DIST_THRESHOLD_CM'), 5)
+        try:
+            compile(load_source(path), path, 'exec')
+        except SyntaxError as e:
+            report.error = 'SyntaxError: %s (line %s)' % (e.msg, e.lineno)
+            return report
+        run = lambda scenario, seed: run_script(path, scenario, seed)
+
+    rng = random.Random(seed)
+    cpu_start = real_time.process_time()
+    for i in range(trials):
+        for trigger in TRIGGERS:
+            scenario, window, command = make_trial(trigger, rng, swing_count, threshold)
+            result = run(scenario, seed * 1000 + i)
+            report.add(trigger, result, window, command)
+    report.cpu = real_time.process_time() - cpu_start
+    return report
+
+
+def print_report(report):
+    print('== %s' % report.path)
+    if report.error:
+        print('   skipped: %s' % report.error)
+        return
+    print('   %-11s %4s %4s %7s %7s %7s  (ms)' % ('trigger', 'n', 'miss', 'p50', 'p95', 'p99'))
+    for trigger in TRIGGERS:
+        n, points, _ = stats.summarize(report.latencies[trigger])
+        print('   %-11s %4d %4d  %s  %s  %s' % (
+            trigger, n, report.misses[trigger],
+            stats.format_ms(points[50]), stats.format_ms(points[95]), stats.format_ms(points[99])))
+    for label, command in (('grasp', GRASP_COMMAND), ('release', RELEASE_COMMAND)):
+        n, points, worst = stats.summarize(report.cycles[command])
+        print('   %-7s cycle p50 %s  p95 %s  max %s ms  (n=%d)' % (
+            label, stats.format_ms(points[50]), stats.format_ms(points[95]),
+            stats.format_ms(worst), n))
+    n, points, worst = stats.summarize(report.intervals)
+    print('   tick interval p50 %s  p95 %s  p99 %s  max %s ms' % (
+        stats.format_ms(points[50]), stats.format_ms(points[95]),
+        stats.format_ms(points[99]), stats.format_ms(worst)))
+    if report.ticks:
+        print('   cpu/tick %.1f us, simulated %.0f s in %.2f s' % (
+            report.cpu / report.ticks * 1e6, report.sim_time, report.wall_time))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('variants', nargs='*', default=list(VARIANTS))
+    parser.add_argument('--trials', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    for path in args.variants:
+        print_report(run_variant(path, args.trials, args.seed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""모터 위치 예측(robot_hand.odometry)의 오차와 줄어든 위치 읽기를 시뮬레이터로 잽니다.
+
+설정마다 무작위 시나리오를 motor_odometry 를 켜고 돌리면서 period 마다
+finger_positions() 로 세 모터 위치를 묻고 다음을 보고합니다.
+
+- 읽기: 물은 횟수 중 모터를 실제로 읽은 비율 (나머지는 예측으로 답함)
+- 오차: 답한 위치와 시뮬레이터 모터의 실제 위치 차이 (도, p50/p95/최대)
+- 판단: motor_odometry 를 끈 실행과 잡기/놓기 판단이 같은 시나리오 수
+
+    python3 -m robot_hand.bench_odometry --scenarios 20
+    python3 -m robot_hand.bench_odometry --bound 2 --period 0.05 new_version gestures
+"""
+
+import argparse
+
+from robot_hand import stats
+from robot_hand.batch import make_scenario
+from robot_hand.controller import PRESETS, HandController
+from robot_hand.sim import run_controller
+
+
+def run_trial(preset, scenario, seed, period, bound=None):
+    """(history, 물은 횟수, 읽은 횟수, [오차]) 를 반환합니다. bound 가 None 이면 예측을 끕니다."""
+    config, triggers = PRESETS[preset]()
+    if bound is not None:
+        config = config.replace(motor_odometry=True, odometry_bound_deg=bound)
+    controllers = []
+    errors = []
+
+    def query(now):
+        controller = controllers[0]
+        odometry = controller.odometry
+        for role, position in sorted(controller.finger_positions().items()):
+            motor = getattr(controller.devices, role)
+            motor._update()  # 시뮬레이터 내부 값이므로 읽기로 세지 않습니다.
+            errors.append(abs(position - motor._position))
+        if odometry is not None:
+            controller.scheduler.call_later(period, query)
+
+    def make(devices, clock):
+        controller = HandController(config, triggers, devices, clock)
+        controllers.append(controller)
+        if bound is not None:
+            controller.scheduler.call_later(period, query)
+        return controller
+
+    run_controller(make, scenario, seed)
+    controller = controllers[0]
+    odometry = controller.odometry
+    if odometry is None:
+        return controller.history, 0, 0, errors
+    return (controller.history, odometry.reads + odometry.predictions, odometry.reads,
+            errors)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('presets', nargs='*', default=sorted(PRESETS), help='설정 이름')
+    parser.add_argument('--scenarios', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--bound', type=float, default=5.0, help='다시 읽는 예측 오차 (도)')
+    parser.add_argument('--period', type=float, default=0.02, help='위치를 묻는 간격 (초)')
+    args = parser.parse_args(argv)
+
+    print('bound %.1f deg, query every %.0f ms, %d scenarios' % (
+        args.bound, args.period * 1000, args.scenarios))
+    print('%-18s %8s %8s %6s %7s %7s %7s %9s' % (
+        'preset', 'queries', 'reads', 'read%', 'err p50', 'p95', 'max', 'decisions'))
+    for preset in args.presets:
+        queries = reads = same = 0
+        errors = []
+        for index in range(args.scenarios):
+            scenario, _, _ = make_scenario(index, args.seed)
+            history, asked, read, errs = run_trial(preset, scenario, index, args.period,
+                                                   args.bound)
+            baseline = run_trial(preset, scenario, index, args.period)[0]
+            queries += asked
+            reads += read
+            errors.extend(errs)
+            same += [h[1:] for h in history] == [h[1:] for h in baseline]
+        _, points, worst = stats.summarize(errors)
+        print('%-18s %8d %8d %5.1f%% %7.1f %7.1f %7.1f %6d/%d' % (
+            preset, queries, reads, 100.0 * reads / max(queries, 1), points[50], points[95],
+            worst, same, args.scenarios))
+
+
+if __name__ == '__main__':
+    main()
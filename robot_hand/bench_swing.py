@@ -0,0 +1,192 @@
+"""자이로 흔들기 감지 방식을 같은 자이로 기록(trace)으로 비교합니다.
+
+시뮬레이터 자이로(드리프트와 잡음 포함)를 gyro_period 마다 읽어 기록을 만들고,
+각 감지 트리거에 샘플 순서대로 넣어서 다음을 보고합니다.
+
+- 감지 지연: 흔들기를 다 끝낸 시각 -> 놓기 판단 (흔들기 도중에 판단하면 음수)
+- 놓침: 목표 횟수만큼 흔들었는데 놓지 않은 기록 수
+- 오감지: 흔들기가 아닌 동작(한 번만 흔들기, 한쪽으로 기울이기, 작은 흔들림,
+  가만히 있기)이나 흔들기 시작 전에 놓은 횟수와 분당 횟수
+- 샘플당 비용: 트리거 한 번 갱신에 걸린 실제 시간
+
+로봇에서 저장한 기록(time,angle,rate CSV)도 --load 로 같이 평가할 수 있습니다.
+
+    python3 -m robot_hand.bench_swing --traces 40
+    python3 -m robot_hand.bench_swing --save traces/ --load traces/robot_*.csv
+"""
+
+import argparse
+import os
+import random
+import time as real_time
+from collections import namedtuple
+
+from robot_hand import stats
+from robot_hand.scenarios import Scenario
+from robot_hand.scheduler import SensorEvent
+from robot_hand.sim import SimGyroSensor, SimWorld
+from robot_hand.triggers import RELEASE, GyroRateSwing, GyroRotationInterval, GyroSwingCount
+
+# 기록 하나: 샘플 [(시각, 각도, 각속도)], 목표 흔들기를 시작/끝낸 시각 (아니면 None)
+Trace = namedtuple('Trace', 'name samples swing_start swing_done')
+
+DETECTORS = {
+    'rate_swing': lambda: GyroRateSwing(45, 2),
+    'interval_1s': lambda: GyroRotationInterval(90, 1.0, 2),
+    'angle_85': lambda: GyroSwingCount(85, 3),
+}
+
+
+def record(scenario, seed, period=0.01, target=True):
+    """scenario 동안 시뮬레이터 자이로를 period 마다 읽어 Trace 를 만듭니다.
+
+    target 이 False 면 시나리오에 흔들기가 있어도 놓으면 안 되는 기록으로 남깁니다.
+    """
+    world = SimWorld(scenario, seed=seed)
+    gyro = SimGyroSensor(world, 'in4')
+    clock = world.clock
+    samples = []
+    while clock.now < scenario.duration:
+        angle, rate = gyro.angle_and_rate
+        samples.append((clock.now, angle, rate))
+        clock.advance_to(clock.now + period)
+    if not target:
+        return Trace(scenario.name, samples, None, None)
+    return Trace(scenario.name, samples, scenario.mark('swing_start'), scenario.mark('swing_done'))
+
+
+def make_traces(count, rng, period):
+    """목표 흔들기 기록과 흔들기가 아닌 기록을 count 개씩 만듭니다."""
+    traces = []
+    for i in range(count):
+        seed = rng.randrange(1 << 30)
+        swing_period = rng.uniform(1.2, 2.5)
+        traces.append(record(Scenario('swing', 6.0 + 2 * swing_period).swing(
+            at=rng.uniform(1.0, 2.0), count=2, amplitude=rng.uniform(60, 140),
+            period=swing_period), seed, period))
+
+        kind = i % 4
+        if kind == 0:
+            scenario = Scenario('swing_once', 8.0).swing(
+                at=rng.uniform(1.0, 2.0), count=1, amplitude=rng.uniform(60, 140),
+                period=rng.uniform(1.2, 2.5))
+        elif kind == 1:
+            # 한쪽으로 기울였다가 잠시 뒤 반대쪽으로 기울이기 (흔들기 아님)
+            at = rng.uniform(1.0, 2.0)
+            scenario = (Scenario('tilts', 14.0)
+                        .tilt(at, rng.uniform(60, 120), rng.uniform(1.0, 3.0))
+                        .tilt(at + 5.0, -rng.uniform(60, 120), rng.uniform(1.0, 3.0)))
+        elif kind == 2:
+            scenario = Scenario('small_shake', 10.0).swing(
+                at=rng.uniform(1.0, 2.0), count=4, amplitude=rng.uniform(10, 30),
+                period=rng.uniform(0.4, 1.0))
+        else:
+            scenario = Scenario('still', 30.0)
+        traces.append(record(scenario, seed, period, target=False))
+    return traces
+
+
+def save_trace(trace, path):
+    with open(path, 'w') as f:
+        f.write('# name=%s\n' % trace.name)
+        if trace.swing_done is not None:
+            f.write('# swing_start=%.6f\n# swing_done=%.6f\n' % (trace.swing_start, trace.swing_done))
+        f.write('time,angle,rate\n')
+        for sample in trace.samples:
+            f.write('%.6f,%d,%d\n' % sample)
+
+
+def load_trace(path):
+    """save_trace 형식의 CSV 를 읽습니다. swing_done 이 없으면 흔들기가 아닌 기록입니다."""
+    meta = {}
+    samples = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith('#'):
+                key, _, value = line[1:].strip().partition('=')
+                meta[key] = value
+            elif line and not line.startswith('time'):
+                t, angle, rate = line.split(',')
+                samples.append((float(t), int(float(angle)), int(float(rate))))
+    start = meta.get('swing_start')
+    done = meta.get('swing_done')
+    return Trace(meta.get('name', os.path.basename(path)), samples,
+                 None if start is None else float(start),
+                 None if done is None else float(done))
+
+
+def replay(trigger, trace):
+    """trace 를 trigger 에 넣고 (놓기 판단 시각 목록, 샘플당 실제 시간) 을 반환합니다."""
+    samples = trace.samples
+    t0, angle, rate = samples[0]
+    values = {'gyro': angle, 'gyro_rate': rate}
+    trigger.reset(t0, values)
+    releases = []
+    start = real_time.perf_counter()
+    for t, angle, rate in samples:
+        values['gyro'] = angle
+        values['gyro_rate'] = rate
+        trigger.sample(SensorEvent('gyro', (angle, rate), t, True, False))
+        if trigger.update(t, values) == RELEASE:
+            releases.append(t)
+            trigger.reset(t, values)
+    return releases, (real_time.perf_counter() - start) / len(samples)
+
+
+def evaluate(make, traces):
+    latencies = []
+    misses = 0
+    false_positives = 0
+    negative_time = 0.0
+    costs = []
+    for trace in traces:
+        releases, cost = replay(make(), trace)
+        costs.append(cost)
+        if trace.swing_done is None:
+            false_positives += len(releases)
+            negative_time += trace.samples[-1][0] - trace.samples[0][0]
+            continue
+        early = [t for t in releases if t < trace.swing_start]
+        after = [t for t in releases if t >= trace.swing_start]
+        false_positives += len(early) + max(0, len(after) - 1)
+        if after:
+            latencies.append(after[0] - trace.swing_done)
+        else:
+            misses += 1
+    return latencies, misses, false_positives, negative_time, costs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--traces', type=int, default=40, help='종류별 시뮬레이션 기록 수')
+    parser.add_argument('--period', type=float, default=0.01, help='자이로 읽기 주기 (초)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--save', metavar='DIR', help='만든 기록을 CSV 로 저장할 폴더')
+    parser.add_argument('--load', nargs='*', default=[], metavar='CSV', help='추가로 평가할 기록')
+    args = parser.parse_args(argv)
+
+    traces = make_traces(args.traces, random.Random(args.seed), args.period)
+    if args.save:
+        if not os.path.isdir(args.save):
+            os.makedirs(args.save)
+        for i, trace in enumerate(traces):
+            save_trace(trace, os.path.join(args.save, '%03d_%s.csv' % (i, trace.name)))
+    traces.extend(load_trace(path) for path in args.load)
+
+    positives = sum(1 for trace in traces if trace.swing_done is not None)
+    print('%d traces (%d swing, %d other), gyro period %.0f ms' % (
+        len(traces), positives, len(traces) - positives, args.period * 1000))
+    print('%-12s %7s %7s %7s %5s %5s %7s %8s' % (
+        'detector', 'p50', 'p95', 'p99', 'miss', 'fp', 'fp/min', 'us/samp'))
+    for name in sorted(DETECTORS):
+        latencies, misses, fps, negative_time, costs = evaluate(DETECTORS[name], traces)
+        _, points, _ = stats.summarize(latencies)
+        print('%-12s  %s  %s  %s %5d %5d %7.2f %8.1f' % (
+            name, stats.format_ms(points[50]), stats.format_ms(points[95]),
+            stats.format_ms(points[99]), misses, fps, fps * 60.0 / max(negative_time, 1e-9),
+            sum(costs) / len(costs) * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""틱마다 하는 sysfs I/O 비용을 기존 속성 접근 방식과 robot_hand.sysfs 로 비교합니다.
+
+tmpfs(/dev/shm) 에 가짜 /sys/class 트리를 만들어 실행하므로 EV3 없이도 돌아갑니다.
+한 틱은 초음파, 손바닥/손날 터치, 자이로 값 하나씩과 모터 세 개의 위치를 읽습니다.
+
+    python3 -m robot_hand.bench_sysfs --ticks 5000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+from time import perf_counter
+
+from robot_hand import sysfs
+
+MOTOR_PORTS = ('outA', 'outB', 'outC')
+SENSOR_PORTS = (('in1', 'US-DIST-CM', '42'), ('in2', 'TOUCH', '0'),
+                ('in3', 'TOUCH', '0'), ('in4', 'GYRO-ANG', '-3'))
+
+
+def write_file(path, text):
+    with open(path, 'w') as f:
+        f.write(text + '\n')
+
+
+def make_fake_sysfs(root):
+    """root 아래에 tacho-motor, lego-sensor 장치 디렉터리를 만듭니다."""
+    for i, port in enumerate(MOTOR_PORTS):
+        path = os.path.join(root, 'tacho-motor', 'motor%d' % i)
+        os.makedirs(path)
+        for name, text in (('address', 'ev3-ports:' + port), ('max_speed', '1050'),
+                           ('count_per_rot', '360'), ('position', '0'), ('speed', '0'),
+                           ('state', ''), ('command', ''), ('speed_sp', '0'),
+                           ('position_sp', '0'), ('stop_action', 'coast')):
+            write_file(os.path.join(path, name), text)
+    for i, (port, mode, value) in enumerate(SENSOR_PORTS):
+        path = os.path.join(root, 'lego-sensor', 'sensor%d' % i)
+        os.makedirs(path)
+        for name, text in (('address', 'ev3-ports:' + port), ('mode', mode),
+                           ('value0', value), ('value1', '0'), ('direct', '')):
+            write_file(os.path.join(path, name), text)
+
+
+def stock_paths(root):
+    """기존 방식에서 한 틱에 읽는 속성 파일 경로들입니다."""
+    paths = [os.path.join(sysfs.find_device('lego-sensor', port, root), 'value0')
+             for port, _, _ in SENSOR_PORTS]
+    paths += [os.path.join(sysfs.find_device('tacho-motor', port, root), 'position')
+              for port in MOTOR_PORTS]
+    return paths
+
+
+def tick_reopen(paths):
+    """속성을 읽을 때마다 파일을 열고 닫습니다."""
+    for path in paths:
+        with open(path, 'rb') as f:
+            int(f.read().decode().strip())
+
+
+def make_tick_file_objects(paths):
+    """ev3dev2 방식: 파일 객체를 열어 두고 seek(0) + read() + decode 합니다."""
+    files = [open(path, 'rb', buffering=0) for path in paths]
+
+    def tick():
+        for f in files:
+            f.seek(0)
+            int(f.read().decode().strip())
+    return tick, files
+
+
+def make_tick_cached(root):
+    """robot_hand.sysfs 장치들로 같은 값을 읽습니다."""
+    us = sysfs.UltrasonicSensor('in1', root)
+    palm = sysfs.TouchSensor('in2', root)
+    side = sysfs.TouchSensor('in3', root)
+    gyro = sysfs.GyroSensor('in4', root)
+    motors = [sysfs.LargeMotor(port, root) for port in MOTOR_PORTS]
+
+    def tick():
+        us.distance_centimeters
+        palm.is_pressed
+        side.is_pressed
+        gyro.angle
+        for motor in motors:
+            motor.position
+    return tick, [us, palm, side, gyro] + motors
+
+
+def measure(tick, ticks):
+    start = perf_counter()
+    for _ in range(ticks):
+        tick()
+    return (perf_counter() - start) / ticks
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--ticks', type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else None
+    root = tempfile.mkdtemp(prefix='fake-sysfs-', dir=base)
+    try:
+        make_fake_sysfs(root)
+        paths = stock_paths(root)
+
+        results = [('reopen per read', measure(lambda: tick_reopen(paths), args.ticks))]
+        tick, files = make_tick_file_objects(paths)
+        results.append(('file objects', measure(tick, args.ticks)))
+        for f in files:
+            f.close()
+        tick, devices = make_tick_cached(root)
+        results.append(('robot_hand.sysfs', measure(tick, args.ticks)))
+        for device in devices:
+            device.close()
+    finally:
+        shutil.rmtree(root)
+
+    baseline = results[0][1]
+    for name, cost in results:
+        print('%-18s %8.1f us/tick  (x%.2f)' % (name, cost * 1e6, baseline / cost))
+
+
+if __name__ == '__main__':
+    main()
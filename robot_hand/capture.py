@@ -0,0 +1,228 @@
+"""실행 중인 손의 센서 원시 값을 세션 파일로 남깁니다.
+
+CaptureRecorder.wrap() 은 초음파, 터치, 자이로 센서를 값을 읽을 때마다 기록하는
+대리 객체로 감싼 장치 묶음을 돌려줍니다. 제어기 판단 전 단계(자이로 드리프트 보정,
+필터, 트리거)를 거치지 않은 값을 남기므로, robot_hand.replay 로 같은 세션을 다른
+제어기 설정과 트리거 파라미터로 다시 돌려 볼 수 있습니다.
+
+센서마다 값이 바뀔 때만 기록합니다. (재생할 때는 다음 기록까지 같은 값을 유지)
+자이로를 하드웨어 리셋해도 리셋 직전 각도를 더해서 각도가 끊기지 않게 남깁니다.
+
+파일 형식 (리틀 엔디언):
+
+    헤더   b'RHSS', 버전(H), 기록 크기(H), 메타 길이(I), 메타(UTF-8)
+           메타는 줄마다 'sources=이름,...', 'started=시작 시각'
+    기록   EVENT 형식 (시각, 센서 번호, 값, 값2) 이 시간 순서대로 이어짐
+           자이로는 값에 각도, 값2 에 각속도를 넣고 나머지 센서는 값2 가 0 입니다.
+
+같은 파일에 다시 기록하면 기록기마다 처음 flush 할 때 헤더를 새로 써서 세션 경계를
+남기고, read_sessions() 는 헤더마다 세션을 하나씩 돌려줍니다.
+"""
+
+import copy
+import os
+import struct
+import threading
+from collections import namedtuple
+
+MAGIC = b'RHSS'
+VERSION = 1
+HEADER = struct.Struct('<4sHHI')
+EVENT = struct.Struct('<dBff')
+
+SOURCES = ('ultrasonic', 'palm_touch', 'side_touch', 'gyro')
+ULTRASONIC, PALM_TOUCH, SIDE_TOUCH, GYRO = range(len(SOURCES))
+
+# 읽은 세션: 센서 이름 -> (시각 목록, 값 목록), 시각은 모두 시작 시각 기준 초
+Session = namedtuple('Session', 'name streams duration')
+
+
+class CaptureRecorder(object):
+    """감싼 센서들이 읽은 값을 모아 두었다가 flush() 할 때 파일에 이어 씁니다."""
+
+    def __init__(self, path, clock):
+        self.path = path
+        self.clock = clock
+        self.started = clock.time()
+        self.events = []
+        self.count = 0
+        self._last = [None] * len(SOURCES)
+        self._headed = set()  # 이 세션의 헤더를 쓴 파일
+        # 센서 허브를 쓰면 센서마다 다른 스레드에서 기록합니다.
+        self._lock = threading.Lock()
+
+    def wrap(self, devices):
+        """센서를 기록용 대리 객체로 바꾼 장치 묶음을 반환합니다. 모터는 그대로 씁니다."""
+        wrapped = copy.copy(devices)
+        wrapped.ultrasonic = _CapturedUltrasonic(self, devices.ultrasonic)
+        wrapped.palm_touch = _CapturedTouch(self, devices.palm_touch, PALM_TOUCH)
+        wrapped.side_touch = _CapturedTouch(self, devices.side_touch, SIDE_TOUCH)
+        wrapped.gyro = _CapturedGyro(self, devices.gyro)
+        return wrapped
+
+    def record(self, source, value, value2=0.0):
+        with self._lock:
+            key = (value, value2)
+            if self._last[source] == key:
+                return
+            self._last[source] = key
+            self.events.append(EVENT.pack(self.clock.time(), source, value, value2))
+            self.count += 1
+
+    def flush(self, path=None):
+        """모아 둔 기록을 path 에 이어 씁니다. 파일이 없으면 헤더부터 씁니다."""
+        path = path or self.path
+        with self._lock:
+            events, self.events = self.events, []
+        if path is None or not events:
+            return 0
+        with open(path, 'ab') as f:
+            if path not in self._headed:
+                # 앞 세션이 있는 파일이어도 이 세션의 시작 시각을 담은 헤더로 경계를 남깁니다.
+                f.write(self.header())
+                self._headed.add(path)
+            f.write(b''.join(events))
+        return len(events)
+
+    def header(self):
+        meta = '\n'.join([
+            'sources=' + ','.join(SOURCES),
+            'started=%.6f' % self.started,
+        ]).encode('utf-8')
+        return HEADER.pack(MAGIC, VERSION, EVENT.size, len(meta)) + meta
+
+
+class _CapturedSensor(object):
+    """감싼 센서의 나머지 속성은 그대로 넘겨줍니다."""
+
+    def __init__(self, recorder, sensor):
+        self._recorder = recorder
+        self._sensor = sensor
+
+    def __getattr__(self, name):
+        return getattr(self._sensor, name)
+
+
+class _CapturedUltrasonic(_CapturedSensor):
+
+    @property
+    def distance_centimeters(self):
+        value = self._sensor.distance_centimeters
+        self._recorder.record(ULTRASONIC, value)
+        return value
+
+
+class _CapturedTouch(_CapturedSensor):
+
+    def __init__(self, recorder, sensor, source):
+        _CapturedSensor.__init__(self, recorder, sensor)
+        self._source = source
+
+    @property
+    def is_pressed(self):
+        value = self._sensor.is_pressed
+        self._recorder.record(self._source, 1.0 if value else 0.0)
+        return value
+
+
+class _CapturedGyro(_CapturedSensor):
+
+    def __init__(self, recorder, sensor):
+        _CapturedSensor.__init__(self, recorder, sensor)
+        self._offset = 0  # 하드웨어 리셋으로 사라진 각도의 합
+        self._angle = 0
+
+    @property
+    def angle_and_rate(self):
+        angle, rate = self._sensor.angle_and_rate
+        self._angle = angle
+        self._recorder.record(GYRO, angle + self._offset, rate)
+        return angle, rate
+
+    @property
+    def angle(self):
+        return self.angle_and_rate[0]
+
+    @property
+    def rate(self):
+        return self.angle_and_rate[1]
+
+    def reset(self):
+        self._offset += self._angle
+        self._angle = 0
+        self._sensor.reset()
+
+
+def read_sessions(path):
+    """세션 파일을 읽어 기록한 순서대로 Session 목록을 반환합니다.
+
+    세션이 여럿이면 두 번째부터 이름 뒤에 '.2', '.3' 을 붙입니다.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    name = os.path.splitext(os.path.basename(path))[0]
+    sessions = []
+    offset = 0
+    while offset < len(data):
+        label = '%s.%d' % (name, len(sessions) + 1) if sessions else name
+        offset, session = _read_block(data, offset, path, label)
+        sessions.append(session)
+    if not sessions:
+        raise ValueError('세션 파일이 아닙니다: %s' % path)
+    return sessions
+
+
+def read_session(path):
+    """세션이 하나인 파일을 읽어 Session 을 반환합니다."""
+    sessions = read_sessions(path)
+    if len(sessions) > 1:
+        raise ValueError('세션이 %d 개 들어 있습니다 (read_sessions): %s' % (len(sessions), path))
+    return sessions[0]
+
+
+def _is_header(data, offset):
+    if data[offset:offset + len(MAGIC)] != MAGIC or len(data) - offset < HEADER.size:
+        return False
+    magic, version, size, meta_length = HEADER.unpack_from(data, offset)
+    return version == VERSION and size == EVENT.size
+
+
+def _read_block(data, offset, path, name):
+    """offset 의 헤더부터 다음 헤더 앞까지 읽어 (다음 위치, Session) 을 반환합니다."""
+    magic, version, size, meta_length = HEADER.unpack_from(data, offset)
+    if magic != MAGIC:
+        raise ValueError('세션 파일이 아닙니다: %s' % path)
+    if version != VERSION:
+        raise ValueError('지원하지 않는 버전입니다: %d' % version)
+    if size != EVENT.size:
+        raise ValueError('기록 크기가 헤더와 다릅니다')
+    start = offset + HEADER.size + meta_length
+    meta = dict(line.split('=', 1) for line in
+                data[offset + HEADER.size:start].decode('utf-8').splitlines())
+    names = meta['sources'].split(',')
+    started = float(meta['started'])
+
+    # 다음 세션의 헤더는 기록 경계에서 시작합니다.
+    stop = data.find(MAGIC, start)
+    while stop >= 0 and ((stop - start) % size or not _is_header(data, stop)):
+        stop = data.find(MAGIC, stop + 1)
+    if stop < 0:
+        stop = start + (len(data) - start) // size * size
+        following = len(data)
+    else:
+        following = stop
+
+    streams = dict((name, ([], [])) for name in names)
+    end = 0.0
+    for t, source, value, value2 in EVENT.iter_unpack(data[start:stop]):
+        times, values = streams[names[source]]
+        t -= started
+        times.append(t)
+        if names[source] == 'gyro':
+            values.append((int(value), int(value2)))
+        elif names[source] == 'ultrasonic':
+            values.append(round(value, 1))
+        else:
+            values.append(value != 0)
+        end = max(end, t)
+    return following, Session(name, streams, end)
@@ -0,0 +1,80 @@
+"""제어 로직이 쓰는 시계입니다.
+
+제어 로직은 time() / sleep() 을 직접 부르지 않고 시계 객체의 clock.time(),
+clock.sleep() 만 씁니다. 로봇에서는 RealClock 을, 테스트와 벤치마크에서는
+VirtualClock 을 넣으면 같은 코드가 실제 시간을 기다리지 않고 바로 다음
+예정 시각으로 넘어갑니다. 로직이 보는 시각은 시계가 돌려주는 값뿐이므로
+같은 시각과 센서 값이 들어오면 실제 시간으로 돌릴 때와 똑같이 판단합니다.
+
+스크립트는 get_clock() 으로 시계를 받습니다. 시뮬레이터는 스크립트를 실행하기
+전에 use_clock() 으로 가상 시계를 넣어 둡니다.
+"""
+
+import time as _time
+
+
+class RealClock(object):
+    """실제 시간을 쓰는 시계입니다."""
+
+    def time(self):
+        return _time.time()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            _time.sleep(seconds)
+
+
+class TimeLimitReached(BaseException):
+    """가상 시계가 limit 을 넘었을 때 발생합니다.
+
+    스크립트의 except Exception 에 잡히지 않도록 BaseException 을 상속합니다.
+    """
+
+
+class VirtualClock(object):
+    """sleep() 하면 그만큼 바로 시간이 흐르는 가상 시계입니다.
+
+    시각은 정수 나노초로 쌓아서 아무리 오래 돌려도 반올림 오차가 누적되지 않고,
+    같은 sleep 순서면 항상 같은 시각이 나옵니다.
+    """
+
+    def __init__(self, start=0.0, limit=None):
+        self._ns = int(round(start * 1e9))
+        self.limit = limit
+        self.sleeps = 0
+
+    @property
+    def now(self):
+        return self._ns / 1e9
+
+    def time(self):
+        return self._ns / 1e9
+
+    def sleep(self, seconds):
+        self.sleeps += 1
+        if seconds > 0:
+            # 1ns 보다 짧은 대기도 최소 1ns 는 흐르게 해서 같은 시각에 갇히지 않게 합니다.
+            self._ns += max(1, int(round(seconds * 1e9)))
+        if self.limit is not None and self._ns / 1e9 > self.limit:
+            raise TimeLimitReached()
+
+    def advance_to(self, when):
+        """when 시각까지 시간을 보냅니다. 이미 지났으면 그대로 둡니다."""
+        ns = int(round(when * 1e9))
+        if ns > self._ns:
+            self._ns = ns
+
+
+_clock = RealClock()
+
+
+def get_clock():
+    """지금 쓰도록 정해진 시계를 반환합니다. 기본은 RealClock 입니다."""
+    return _clock
+
+
+def use_clock(clock):
+    """앞으로 get_clock() 이 clock 을 반환하게 하고 이전 시계를 반환합니다."""
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
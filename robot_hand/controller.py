@@ -0,0 +1,821 @@
+"""로봇 핸드 제어기입니다.
+
+스크립트마다 복사되어 있던 포트 설정, 하드웨어 생성, grasp_hand / release_hand /
+reset_motor_positions, 메인 루프를 HandController 하나로 모았습니다.
+잡기/놓기 조건은 robot_hand.triggers 의 트리거를 골라 끼워서 정합니다.
+
+    controller = HandController(HandConfig(grasp_degrees=-300),
+                                [UltrasonicDwell(), PalmTouch(), GyroSwingCount(), SideClick()])
+    controller.run()
+
+PRESETS 에는 기존 스크립트들과 같은 설정과 트리거 조합이 들어 있어서
+여러 설정을 한 프로세스에서 만들어 비교할 수 있습니다.
+"""
+
+import importlib
+import os
+import sys
+
+from robot_hand.capture import CaptureRecorder
+from robot_hand.clock import RealClock, get_clock
+from robot_hand.devices import (MOTORS, BootTimeline, DeviceNotFound, DeviceProbe,
+                                lazy_devices, process_age)
+from robot_hand.gyro import GyroBiasEstimator
+from robot_hand.motion import (CANCELLED, AdaptiveGrasp, MotionEngine, MotorCommand,
+                               spinup_time)
+from robot_hand.odometry import FingerOdometry
+from robot_hand.poses import CYLINDER, PINCH, POSE_RULES, resolve_poses
+from robot_hand.profiles import synchronized_commands
+from robot_hand.scheduler import SensorScheduler, SensorSource
+from robot_hand.states import (CLOSED, GRASPING, OPEN, RELEASE_PENDING, RELEASING, STATES,
+                               TimedState)
+from robot_hand.statetable import GRASP_DONE, HAND_TABLE, RELEASE_DONE, compile_table
+from robot_hand.telemetry import ACTION_CODES, MOTION_CODES, STATE_CODES, TelemetryRing
+from robot_hand.touch import TOUCH, TouchWatcher
+from robot_hand.triggers import (GRASP, LOCK, PARTIAL_OPEN, RELEASE, RESET, SELECT_POSE,
+                                 TIGHTEN, GyroRateSwing, GyroRotationInterval, GyroSwingCount,
+                                 PalmPress, PalmTouch, SideClick, SideGesture, SideGestures,
+                                 UltrasonicDwell)
+
+# 제어기가 읽는 센서 이름
+SENSORS = ('ultrasonic', 'palm_touch', 'side_touch', 'gyro')
+TOUCH_SENSORS = ('palm_touch', 'side_touch')
+# 센서 값이 아니라 사건을 내는 읽기 소스 (값이 바뀔 때만 이벤트를 냄)
+# TOUCH_WATCH 는 가상 시계에서 감시 스레드 대신 TouchWatcher.poll 을 부르는 소스입니다.
+TOUCH_WATCH = 'touch_watch'
+EVENT_SOURCES = ('backspace', TOUCH, TOUCH_WATCH)
+# 읽기 소스가 기다리는 장치 (없으면 소스 이름과 같고, None 이면 기다리지 않음)
+SOURCE_ROLES = {'backspace': 'buttons', TOUCH: None, TOUCH_WATCH: None}
+
+
+class HandConfig(object):
+    """포트와 동작 설정값입니다. 바꾸고 싶은 값만 키워드 인자로 넘깁니다."""
+
+    DEFAULTS = {
+        # 포트
+        'finger_motor_1_port': 'outA',
+        'finger_motor_2_port': 'outB',
+        'thumb_motor_port': 'outC',
+        'ultrasonic_sensor_port': 'in1',
+        'palm_touch_sensor_port': 'in2',
+        'side_touch_sensor_port': 'in3',
+        'gyro_sensor_port': 'in4',
+        # 모터 동작
+        'grasp_degrees': -400,
+        'grasp_speed': 15,
+        'thumb_degrees': 200,
+        'thumb_speed': 5,
+        'release_speed': 15,
+        'motion_timeout_s': 10,
+        # 트리거나 손날 제스처가 고르지 않았을 때의 잡기 자세 (robot_hand.poses 의 POSE_TABLE)
+        'grasp_pose': 'power',
+        # True 면 모터 위치를 명령과 마지막으로 읽은 위치로 예측하고, 예측 오차가
+        # odometry_bound_deg 를 넘을 때만 읽음. 잡기는 아는 위치에서 남은 만큼만 움직임
+        # (robot_hand.odometry)
+        'motor_odometry': False,
+        'odometry_bound_deg': 5.0,
+        # True 면 정해진 각도를 천천히 움직이는 대신 adaptive_speed 로 빠르게 닫다가
+        # 물체에 닿은 모터만 hold_speed 로 squeeze_deg 더 조이고 버팀 (motion.AdaptiveGrasp)
+        'adaptive_grasp': False,
+        'adaptive_speed': 40,
+        'hold_speed': 5,
+        'squeeze_deg': 10,
+        # True 면 세 모터가 함께 출발해 함께 도착하도록 속도와 가감속을 맞춤 (robot_hand.profiles)
+        # 가장 오래 걸리는 모터가 sync_speed(%) 와 ramp_ms(0->100% 가속 시간)로 움직입니다.
+        'sync_motion': False,
+        'sync_speed': 40,
+        'ramp_ms': 300,
+        # 자이로: False 면 드리프트를 소프트웨어로 추정/보정하고 기준 자세도 소프트웨어로 잡음
+        # True 면 기존 스크립트처럼 gyro_sensor.reset() 후 gyro_calibration_s 만큼 기다림
+        'gyro_hardware_reset': False,
+        # 대기 시간 (이 시간 동안에도 센서는 계속 읽습니다)
+        'gyro_calibration_s': 0.0,   # 시작할 때 자이로 보정 대기 (gyro_hardware_reset 일 때)
+        'grasp_settle_s': 1.0,       # 잡은 뒤 안정화
+        'release_delay_s': 0.0,      # 자이로로 놓기 전 대기
+        'release_cooldown_s': 0.0,   # 자이로로 놓은 뒤 대기
+        # solution-1: 손날 버튼으로 놓은 뒤에는 물체를 뺄 때까지 다시 잡지 않음
+        'lock_after_manual_release': False,
+        # solution-1: 길게 눌러 리셋하면 손 상태도 열림으로 바꿈
+        'open_after_reset': False,
+        # 손날 제스처 동작 (triggers.SideGestures)
+        'partial_open_fraction': 0.3,  # PARTIAL_OPEN: 잡은 각도에서 이 비율만큼 되돌림
+        'tighten_deg': 15,             # TIGHTEN: 모터마다 잡는 방향으로 hold_speed 로 더 도는 각도
+        # 센서별 샘플링 주기 (초)
+        'touch_period_s': 0.005,
+        'ultrasonic_period_s': 0.1,
+        'gyro_period_s': 0.01,       # 각도와 각속도를 함께 읽음 (GYRO-G&A)
+        'button_period_s': 0.1,
+        'motion_period_s': 0.02,
+        'state_period_s': 0.01,
+        # 틱마다 센서 값과 상태를 기록할 텔레메트리 파일 (None 이면 기록하지 않음)
+        'telemetry_path': None,
+        'telemetry_size': 4096,      # 링 버퍼 기록 수
+        'telemetry_flush_s': 5.0,    # 이 간격마다 파일에 이어 씀 (끝날 때도 씀, 캡처도 같음)
+        # 센서 원시 값을 기록할 세션 파일 (None 이면 기록하지 않음, robot_hand.replay 로 재생)
+        'capture_path': None,
+        # 장치 계층: 'ev3dev2' 또는 'sysfs' (robot_hand.sysfs)
+        'backend': 'ev3dev2',
+        # True 면 장치마다 백그라운드 스레드에서 동시에 찾고 찾은 센서부터 씀 (robot_hand.devices)
+        'lazy_devices': True,
+        'probe_period_s': 0.05,      # 찾은 장치가 있는지 확인하는 주기
+        'boot_report': False,        # 모든 센서가 준비되면 시작에 걸린 시간을 출력
+        # True 면 센서마다 백그라운드 스레드에서 읽어 둠 (robot_hand.hub)
+        'use_sensor_hub': False,
+        'hub_period_s': 0.005,
+        # True 면 터치 센서 두 개를 감시 스레드에서 touch_watch_period_s 마다 읽어 눌림/뗌 시각을
+        # 잡고 클릭과 길게 누르기를 가름 (robot_hand.touch, 트리거는 PalmPress, SideGesture)
+        'touch_watcher': False,
+        'touch_watch_period_s': 0.002,
+        'touch_debounce_s': 0.004,   # 이 시간 동안 이어진 값만 바뀐 것으로 봄
+        'click_min_s': 0.1,
+        'click_max_s': 2.0,
+        'long_press_s': 3.0,
+    }
+
+    def __init__(self, **settings):
+        unknown = set(settings) - set(self.DEFAULTS)
+        if unknown:
+            raise TypeError('알 수 없는 설정입니다: ' + ', '.join(sorted(unknown)))
+        self.__dict__.update(self.DEFAULTS)
+        self.__dict__.update(settings)
+
+    def replace(self, **settings):
+        """일부 값만 바꾼 새 설정을 반환합니다."""
+        merged = dict(self.__dict__)
+        merged.update(settings)
+        return HandConfig(**merged)
+
+
+class HandDevices(object):
+    """제어기가 쓰는 모터, 센서, 버튼 묶음입니다."""
+
+    def __init__(self, finger1, finger2, thumb, ultrasonic, palm_touch, side_touch, gyro,
+                 buttons=None):
+        self.finger1 = finger1
+        self.finger2 = finger2
+        self.thumb = thumb
+        self.ultrasonic = ultrasonic
+        self.palm_touch = palm_touch
+        self.side_touch = side_touch
+        self.gyro = gyro
+        self.buttons = buttons
+        self.motors = (finger1, finger2, thumb)
+
+
+def _factory(module, name, *args):
+    def make():
+        return getattr(importlib.import_module(module), name)(*args)
+    return make
+
+
+def device_factories(config):
+    """config 의 포트와 장치 계층으로 HandDevices 의 장치 이름별 생성 함수를 만듭니다.
+
+    ev3dev2 를 import 하는 시간도 장치를 찾는 스레드에서 쓰도록 생성 함수 안에서 import 합니다.
+    """
+    if config.backend == 'sysfs':
+        motors = sensors = 'robot_hand.sysfs'
+    else:
+        motors, sensors = 'ev3dev2.motor', 'ev3dev2.sensor.lego'
+    return [
+        ('finger1', _factory(motors, 'LargeMotor', config.finger_motor_1_port)),
+        ('finger2', _factory(motors, 'LargeMotor', config.finger_motor_2_port)),
+        ('thumb', _factory(motors, 'LargeMotor', config.thumb_motor_port)),
+        ('ultrasonic', _factory(sensors, 'UltrasonicSensor', config.ultrasonic_sensor_port)),
+        ('palm_touch', _factory(sensors, 'TouchSensor', config.palm_touch_sensor_port)),
+        ('side_touch', _factory(sensors, 'TouchSensor', config.side_touch_sensor_port)),
+        ('gyro', _factory(sensors, 'GyroSensor', config.gyro_sensor_port)),
+        ('buttons', _factory('ev3dev2.button', 'Button')),
+    ]
+
+
+def open_devices(config):
+    """config 의 포트와 장치 계층으로 실제 장치를 차례로 만듭니다."""
+    return HandDevices(**dict((role, make()) for role, make in device_factories(config)))
+
+
+class HandController(object):
+    """센서 스케줄러, 모션 엔진, 손 상태, 트리거를 묶은 제어기입니다.
+
+    트리거 요청과 동작 종료에 따른 상태 전이는 table (robot_hand.statetable) 로 정합니다.
+    """
+
+    table = HAND_TABLE
+
+    def __init__(self, config=None, triggers=None, devices=None, clock=None):
+        self.config = config if config is not None else HandConfig()
+        self.clock = clock if clock is not None else get_clock()
+        real = isinstance(self.clock, RealClock)
+        self.boot = BootTimeline(self.clock.time, process_age() if real else None)
+        self.probe = None
+        if devices is None and self.config.lazy_devices:
+            # 가상 시계로 돌 때는 결과가 실행마다 같도록 스레드 없이 차례로 만듭니다.
+            self.probe = DeviceProbe(device_factories(self.config), self.clock.time,
+                                     threads=real).start()
+            devices = HandDevices(**lazy_devices(self.probe))
+        self.devices = devices if devices is not None else open_devices(self.config)
+        self.capture = None
+        if self.config.capture_path:
+            self.capture = CaptureRecorder(self.config.capture_path, self.clock)
+            self.devices = self.capture.wrap(self.devices)
+        self.triggers = list(triggers) if triggers is not None else default_triggers()
+
+        cfg = self.config
+        self.scheduler = SensorScheduler(clock=self.clock.time, sleep=self.clock.sleep)
+        self.odometry = None
+        if cfg.motor_odometry:
+            self.odometry = FingerOdometry(self.clock.time, cfg.odometry_bound_deg)
+        self.motion = MotionEngine(clock=self.clock.time, timeout=cfg.motion_timeout_s,
+                                   odometry=self.odometry)
+        self.motion.subscribe(self._on_motion)
+        self.state = TimedState(OPEN, clock=self.clock.time)
+        self.machine = compile_table(self.table, self)
+        # 자세마다 모터별 각도와 속도를 미리 풀어 둡니다.
+        self.poses = resolve_poses(cfg)
+        unknown = set(name for t in self.triggers for name in t.pose_names) - set(self.poses)
+        if unknown:
+            raise ValueError('자세 표에 없는 자세입니다: ' + ', '.join(sorted(unknown)))
+        self.pose = cfg.grasp_pose  # 지금(마지막으로) 잡은 자세
+        self.next_pose = None       # SELECT_POSE: 손날 제스처로 고른 다음 잡기 자세
+        self.values = {'ultrasonic': 255.0, 'palm_touch': False, 'side_touch': False,
+                       'gyro': 0, 'gyro_rate': 0}
+        self.ready_to_grasp = True
+        self.release_locked = False  # LOCK: 손날 버튼이 아닌 놓기 요청을 무시
+        self.release_trigger = None  # 지금 진행 중인 놓기를 요청한 트리거
+        self.gyro_bias = None if self.config.gyro_hardware_reset else GyroBiasEstimator()
+        self.hub = None
+        self.touch = None  # TouchWatcher (touch_watcher)
+        self.history = []  # (시각, 동작, 트리거 이름)
+        self.last_action = None  # 이번 틱에 내린 동작 (텔레메트리용)
+        self.telemetry = None
+        if cfg.telemetry_path:
+            self.telemetry = TelemetryRing(cfg.telemetry_size, cfg.telemetry_path)
+
+        # 상태별로 평가할 트리거 목록을 미리 만들어 둡니다.
+        self._by_state = dict((state, [t for t in self.triggers if state in t.active_states])
+                              for state in STATES)
+        gyro_triggers = [t for t in self.triggers if t.uses_gyro]
+        self._swing_trigger = gyro_triggers[0] if gyro_triggers else None
+
+        self.grasp_tracker = None
+        if cfg.adaptive_grasp:
+            # ramp_ms 는 sync_motion 일 때만 모터에 씁니다. (아니면 펌웨어 가속 없음)
+            ramp_ms = cfg.ramp_ms if cfg.sync_motion else 0
+            self.grasp_tracker = AdaptiveGrasp(cfg.hold_speed, cfg.squeeze_deg,
+                                               spinup_s=spinup_time(ramp_ms))
+        # 모터 명령도 미리 만들어 둡니다. (잡기 명령은 모터를 찾은 뒤 처음 잡을 때 모든 자세를)
+        self._grasp_commands = None
+        self._release_commands = [
+            MotorCommand(motor, 'on_to_position', cfg.release_speed, 0)
+            for motor in self.devices.motors
+        ]
+
+    # --- 동작 ---
+    def grasp(self):
+        """손을 쥐기 시작합니다. 실패하면 False 를 반환합니다."""
+        if not self._start_motion(GRASP):
+            return False
+        self._change_state(GRASPING)
+        return True
+
+    def release(self):
+        """손을 놓기 시작합니다. 잡는 중이면 잡기를 취소합니다."""
+        if not self._start_motion(RELEASE):
+            return False
+        self._change_state(RELEASING)
+        return True
+
+    def _start_motion(self, name):
+        """잡기/놓기 모터 명령을 내립니다. 상태는 바꾸지 않습니다."""
+        try:
+            if name == GRASP:
+                self.motion.start(GRASP, self.grasp_commands(), tracker=self.grasp_tracker)
+            elif name == RELEASE:
+                self.motion.start(RELEASE, self.release_commands())
+            else:
+                self.motion.start(name, self.adjust_commands(name))
+        except Exception:
+            return False
+        return True
+
+    def grasp_commands(self, pose=None):
+        """pose (기본: 지금 자세) 의 잡기 명령입니다.
+
+        sync_motion 이면 모터 최고 속도를 알아야 하므로 처음 부를 때 모든 자세의 명령을
+        한꺼번에 만들어 두고, 그 뒤로는 자세를 바꿔도 찾기만 합니다.
+        motor_odometry 면 모터 위치를 알므로 잡는 각도를 절대 위치로 보고 남은 만큼만
+        움직입니다. (다 펴지지 않은 채로 다시 잡아도 그만큼 더 조이지 않음)
+        """
+        pose = self.pose if pose is None else pose
+        if self._grasp_commands is not None:
+            return self._grasp_commands[pose]
+        if self.odometry is not None:
+            return self._pose_commands(self.poses[pose])
+        self._grasp_commands = dict((name, self._pose_commands(moves))
+                                    for name, moves in self.poses.items())
+        return self._grasp_commands[pose]
+
+    def _pose_commands(self, moves):
+        """resolve_poses 의 (모터 이름, 각도, 속도) 목록을 모터 명령으로 바꿉니다."""
+        cfg = self.config
+        d = self.devices
+        moves = [(getattr(d, role), degrees, speed) for role, degrees, speed in moves]
+        if self.odometry is not None:
+            targets = [(motor, 'on_to_position', degrees, degrees - self.motor_position(motor))
+                       for motor, degrees, _ in moves]
+        else:
+            targets = [(motor, 'on_for_degrees', degrees, degrees) for motor, degrees, _ in moves]
+        if cfg.sync_motion:
+            speed = cfg.adaptive_speed if cfg.adaptive_grasp else cfg.sync_speed
+            return synchronized_commands(targets, speed, cfg.ramp_ms, d.finger1.max_speed)
+        return [MotorCommand(motor, method, cfg.adaptive_speed if cfg.adaptive_grasp else speed,
+                             target)
+                for (motor, method, target, _), (_, _, speed) in zip(targets, moves)]
+
+    def release_commands(self):
+        """0도로 돌아가는 명령입니다. sync_motion 이면 지금 위치에서 함께 도착하도록 맞춥니다."""
+        if not self.config.sync_motion:
+            return self._release_commands
+        cfg = self.config
+        return synchronized_commands(
+            [(motor, 'on_to_position', 0, self.motor_position(motor))
+             for motor in self.devices.motors],
+            cfg.sync_speed, cfg.ramp_ms, self.devices.finger1.max_speed)
+
+    def adjust_commands(self, name):
+        """쥔 채로 조금 펴거나(PARTIAL_OPEN) 더 조이는(TIGHTEN) 명령입니다."""
+        cfg = self.config
+        d = self.devices
+        if name == PARTIAL_OPEN:
+            keep = 1.0 - cfg.partial_open_fraction
+            return [MotorCommand(motor, 'on_to_position', cfg.release_speed,
+                                 int(round(self.motor_position(motor) * keep)))
+                    for motor in d.motors]
+        # 지금 자세에서 잡은 모터만 잡는 방향으로 더 돕니다.
+        return [MotorCommand(getattr(d, role), 'on_for_degrees', cfg.hold_speed,
+                             cfg.tighten_deg if degrees > 0 else -cfg.tighten_deg)
+                for role, degrees, _ in self.poses[self.pose]]
+
+    def reset_motor_positions(self):
+        """현재 모터 위치를 새로운 0도로 설정합니다."""
+        for motor in self.devices.motors:
+            motor.reset()
+        if self.odometry is not None:
+            self.odometry.reset(self.devices.motors)
+
+    def motor_position(self, motor):
+        """모터 위치(도)입니다. motor_odometry 면 예측 오차가 작을 때는 읽지 않습니다."""
+        return motor.position if self.odometry is None else self.odometry.position(motor)
+
+    def finger_positions(self):
+        """모터 이름별 지금 위치(도)입니다."""
+        return dict((role, self.motor_position(getattr(self.devices, role))) for role in MOTORS)
+
+    def off(self):
+        for role in MOTORS:
+            # 아직 찾지 못한 모터는 움직인 적도 없습니다.
+            if self.probe is None or self.probe.ready(role):
+                getattr(self.devices, role).off()
+
+    # --- 틱 ---
+    def tick(self, now):
+        """손 상태 만료를 확인하고 지금 상태의 트리거를 한 번씩 평가합니다."""
+        state = self.state
+        previous = state.name
+        name = state.tick(now)
+        if name != previous:
+            self._on_state_change(previous, name, now)
+            name = state.name
+
+        values = self.values
+        if self.config.lock_after_manual_release and not values['palm_touch']:
+            self.ready_to_grasp = True
+
+        for trigger in self._by_state[name]:
+            action = trigger.update(now, values)
+            if action is not None:
+                self._dispatch(action, trigger, now)
+                if state.name != name:
+                    break
+
+        if self.telemetry is not None:
+            self._record(now)
+
+    def _record(self, now):
+        values = self.values
+        count, angle = self._swing_trigger.progress() if self._swing_trigger else (0, 0.0)
+        active = self.motion.active
+        self.telemetry.record(
+            now, values['ultrasonic'], values['palm_touch'], values['side_touch'],
+            values['gyro'], values['gyro_rate'], STATE_CODES[self.state.name],
+            min(count, 255), angle, ACTION_CODES[self.last_action],
+            MOTION_CODES[active.status if active is not None else None])
+        self.last_action = None
+
+    def _dispatch(self, action, trigger, now):
+        self.machine.fire(self.state.name, action, trigger, now)
+
+    def _note(self, now, action, trigger):
+        self.history.append((now, action, trigger.name))
+        self.last_action = action
+
+    # --- 상태 변화 ---
+    def _change_state(self, name, duration=None, then=None):
+        previous = self.state.name
+        self.state.enter(name, duration, then)
+        self._on_state_change(previous, name, self.state.entered)
+
+    def _on_state_change(self, previous, name, now):
+        # 새로 평가를 시작하는 트리거는 초기화합니다.
+        old = self._by_state[previous]
+        for trigger in self._by_state[name]:
+            if trigger not in old:
+                trigger.reset(now, self.values)
+        if previous == RELEASE_PENDING and name == RELEASING:
+            # 놓기 전 대기가 끝났으므로 실제로 놓기 시작합니다.
+            if not self._start_motion(RELEASE):
+                self._change_state(CLOSED)
+
+    def _on_motion(self, event):
+        """잡기/놓기 동작이 끝났을 때 (완료, 멈춤, 시간초과) 전이 표로 상태를 바꿉니다."""
+        if event.status == CANCELLED:
+            return  # 다른 동작으로 바뀐 경우 (예: 잡는 도중 놓기)
+        if event.handle.name not in (GRASP, RELEASE):
+            return  # 쥔 채로 펴거나 조이기는 손 상태를 바꾸지 않습니다.
+        done = GRASP_DONE if event.handle.name == GRASP else RELEASE_DONE
+        self.machine.fire(self.state.name, done, None, event.timestamp)
+
+    # --- 전이 표의 조건 (trigger 는 요청한 트리거, 동작 종료 사건이면 None) ---
+    def _if_ready_to_grasp(self, trigger):
+        return self.ready_to_grasp
+
+    def _if_release_locked(self, trigger):
+        return self.release_locked and not trigger.manual
+
+    def _if_gyro_release_delay(self, trigger):
+        return trigger.uses_gyro and self.config.release_delay_s > 0
+
+    def _if_manual_release_lock(self, trigger):
+        return trigger.manual and self.config.lock_after_manual_release
+
+    def _if_open_after_reset(self, trigger):
+        return self.config.open_after_reset
+
+    def _if_gyro_release(self, trigger):
+        return self.release_trigger is not None and self.release_trigger.uses_gyro
+
+    def _if_gyro_release_cooldown(self, trigger):
+        return self._if_gyro_release(trigger) and self.config.release_cooldown_s > 0
+
+    # --- 전이 표의 동작 (False 를 반환하면 상태를 바꾸지 않음) ---
+    def _do_start_grasp(self, trigger, now):
+        previous = self.pose
+        self.pose = self.next_pose or trigger.pose or self.config.grasp_pose
+        if not self._start_motion(GRASP):
+            self.pose = previous
+            return False
+        self.next_pose = None
+        self._note(now, GRASP, trigger)
+
+    def _do_note_release(self, trigger, now):
+        self.release_trigger = trigger
+        self.release_locked = False
+        self._note(now, RELEASE, trigger)
+
+    def _do_start_release(self, trigger, now):
+        self._do_note_release(trigger, now)
+        return self._start_motion(RELEASE)
+
+    def _do_start_release_and_lock(self, trigger, now):
+        if not self._do_start_release(trigger, now):
+            return False
+        # 강제로 폈을 때는 물체를 뺄 때까지 다시 잡지 않습니다.
+        self.ready_to_grasp = False
+
+    def _do_partial_open(self, trigger, now):
+        if not self._start_motion(PARTIAL_OPEN):
+            return False
+        self._note(now, PARTIAL_OPEN, trigger)
+
+    def _do_tighten(self, trigger, now):
+        if not self._start_motion(TIGHTEN):
+            return False
+        self._note(now, TIGHTEN, trigger)
+
+    def _do_toggle_release_lock(self, trigger, now):
+        self.release_locked = not self.release_locked
+        self._note(now, LOCK, trigger)
+
+    def _do_select_pose(self, trigger, now):
+        self.next_pose = trigger.pose
+        self._note(now, SELECT_POSE, trigger)
+
+    def _do_reset_motors(self, trigger, now):
+        self._note(now, RESET, trigger)
+        self.reset_motor_positions()
+
+    def _do_reset_and_unlock(self, trigger, now):
+        self._do_reset_motors(trigger, now)
+        self.ready_to_grasp = True
+
+    def _do_finish_gyro_release(self, trigger, now):
+        self.release_trigger = None
+        self.zero_gyro()
+
+    def _do_finish_release(self, trigger, now):
+        self.release_trigger = None
+
+    def zero_gyro(self):
+        """지금 팔 자세를 자이로 0도로 삼습니다."""
+        if self.gyro_bias is None:
+            self.devices.gyro.reset()
+        else:
+            self.gyro_bias.zero()
+        self.values['gyro'] = 0
+
+    def _on_sample(self, event):
+        self.values[event.source] = event.value
+
+    def _on_gyro(self, event):
+        self.values['gyro'], self.values['gyro_rate'] = event.value
+
+    # --- 실행 ---
+    def sensor_reads(self):
+        """센서 이름별 (읽기 함수, 주기) 입니다. 센서 허브를 쓰면 여기서 허브를 시작합니다."""
+        cfg = self.config
+        d = self.devices
+        reads = {
+            'ultrasonic': (lambda: d.ultrasonic.distance_centimeters, cfg.ultrasonic_period_s),
+            'palm_touch': (lambda: d.palm_touch.is_pressed, cfg.touch_period_s),
+            'side_touch': (lambda: d.side_touch.is_pressed, cfg.touch_period_s),
+            # 모드를 오가지 않도록 각도와 각속도를 한 번에 읽습니다.
+            'gyro': (lambda: d.gyro.angle_and_rate, cfg.gyro_period_s),
+        }
+        touch_reads = self._start_touch_watcher(reads) if cfg.touch_watcher else {}
+        if cfg.use_sensor_hub:
+            from robot_hand.hub import SensorHub
+            if self.probe is not None:
+                self.probe.wait()  # 허브 스레드가 모든 센서를 읽을 수 있어야 합니다.
+            self.hub = SensorHub()  # 허브 스레드는 항상 실제 시간으로 돕니다.
+            for name, (read, period) in reads.items():
+                self.hub.add(name, read, min(period, cfg.hub_period_s))
+            self.hub.start()
+            if not self.hub.wait_ready():
+                # 읽은 값이 없으면 허브의 읽기 함수가 None 을 돌려주므로 시작하지 않습니다.
+                hub, self.hub = self.hub, None
+                hub.stop()
+                silent = sorted(name for name in reads if hub.latest(name) is None)
+                raise DeviceNotFound(silent[0], hub.errors.get(
+                    silent[0], '센서 허브가 값을 한 번도 읽지 못했습니다 (%s)' % ', '.join(silent)))
+            reads = dict((name, (self.hub.reader(name), period))
+                         for name, (read, period) in reads.items())
+        reads.update(touch_reads)
+        if self.gyro_bias is not None:
+            # 자이로 값은 읽을 때마다 바이어스를 추정하고 보정한 값으로 바꿉니다.
+            read_raw, period = reads['gyro']
+            update, clock = self.gyro_bias.update, self.clock.time
+            reads['gyro'] = (lambda: update(clock(), *read_raw()), period)
+        if d.buttons is not None:
+            reads['backspace'] = (lambda: d.buttons.backspace, cfg.button_period_s)
+        return reads
+
+    def _start_touch_watcher(self, reads):
+        """터치 센서를 reads 에서 TouchWatcher 로 옮기고 대신 쓸 읽기 함수들을 반환합니다.
+
+        터치 센서 값은 디바운스한 눌림 상태, TOUCH 는 지난번 뒤로 생긴 TouchEvent 튜플입니다.
+        """
+        cfg = self.config
+        watcher = self.touch = TouchWatcher(self.clock.time, self.clock.sleep,
+                                            cfg.touch_watch_period_s)
+        touch_reads = {}
+        for name in TOUCH_SENSORS:
+            read, period = reads.pop(name)
+            watcher.add(name, read, cfg.touch_debounce_s, cfg.click_min_s, cfg.click_max_s,
+                        cfg.long_press_s)
+            touch_reads[name] = (watcher.reader(name), period)
+        touch_reads[TOUCH] = (watcher.drain, cfg.touch_period_s)
+        if isinstance(self.clock, RealClock):
+            # 아직 찾는 중인 터치 센서는 감시 스레드가 찾을 때까지 기다립니다.
+            watcher.start()
+            touch_reads[TOUCH] = (self._drain_touch, cfg.touch_period_s)
+        else:
+            touch_reads[TOUCH_WATCH] = (watcher.poll, cfg.touch_watch_period_s)
+        return touch_reads
+
+    def _drain_touch(self):
+        """감시 스레드의 터치 사건을 가져옵니다.
+
+        감시 스레드가 센서를 읽다 예외가 났으면 그 예외를 올려서, 스케줄러가 센서를 읽다
+        실패할 때처럼 run() 이 모터를 끄고 멈추게 합니다.
+        """
+        self.touch.check()
+        return self.touch.drain()
+
+    def setup(self):
+        """센서 소스를 등록합니다. 아직 찾는 중인 센서는 찾는 대로 등록합니다."""
+        cfg = self.config
+        reads = self._reads = self.sensor_reads()
+        scheduler = self.scheduler
+        for name in SENSORS:
+            scheduler.subscribe(name, self._on_gyro if name == 'gyro' else self._on_sample)
+        for trigger in self.triggers:
+            for name in trigger.sources:
+                scheduler.subscribe(name, trigger.sample)
+        scheduler.subscribe('backspace', self._on_backspace)
+        self._waiting = []
+        self._ready_at = self.clock.time()
+        for name in SENSORS + EVENT_SOURCES:
+            if name not in reads:
+                continue
+            role = SOURCE_ROLES.get(name, name)
+            if self.probe is None or role is None or self.probe.ready(role):
+                self._add_sensor(name)
+            else:
+                self._waiting.append(name)
+        scheduler.add_source(SensorSource(
+            'motion', self.motion.poll, cfg.motion_period_s, only_changes=True))
+        scheduler.add_source(SensorSource(
+            'state', lambda: self.state.name, cfg.state_period_s, only_changes=True))
+        scheduler.add_tick(self.tick)
+        if (self.telemetry is not None or self.capture is not None) and cfg.telemetry_flush_s > 0:
+            scheduler.call_later(cfg.telemetry_flush_s, self._flush_logs)
+        scheduler.call_later(0.0, lambda now: self.boot.mark('first_tick', now))
+        for trigger in self._by_state[self.state.name]:
+            trigger.reset(self.clock.time(), self.values)
+        if self.probe is not None:
+            self._bind_devices(self.clock.time())
+        else:
+            scheduler.call_at(self._ready_at, self._on_ready)
+
+    def _add_sensor(self, name):
+        """찾은 센서를 스케줄러에 등록합니다."""
+        read, period = self._reads[name]
+        if name in EVENT_SOURCES:
+            self.scheduler.add_source(SensorSource(name, read, period, only_changes=True))
+            return
+        delay = 0.0
+        if name == 'gyro' and self.gyro_bias is None:
+            # 기존 스크립트처럼 리셋한 뒤 보정 시간만큼 지나서 읽기 시작합니다.
+            # 그동안 다른 장치를 찾고 센서를 읽으므로 시작이 그만큼 늦어지지는 않습니다.
+            self.devices.gyro.reset()
+            delay = self.config.gyro_calibration_s
+        self.scheduler.add_source(SensorSource(name, read, period), delay)
+        now = self.clock.time()
+        self._ready_at = max(self._ready_at, now + delay)
+        if delay > 0:
+            return
+        if name == 'gyro':
+            self.values['gyro'], self.values['gyro_rate'] = read()
+        else:
+            self.values[name] = read()
+
+    def _bind_devices(self, now):
+        """새로 찾은 센서를 등록하고, 못 찾은 장치가 있으면 멈춥니다."""
+        probe = self.probe
+        probe.check()
+        for name in list(self._waiting):
+            if probe.ready(SOURCE_ROLES.get(name, name)):
+                self._waiting.remove(name)
+                self._add_sensor(name)
+        if not probe.done():
+            self.scheduler.call_later(self.config.probe_period_s, self._bind_devices)
+        elif not self._waiting:
+            self.scheduler.call_at(max(now, self._ready_at), self._on_ready)
+
+    def _on_ready(self, now):
+        self.boot.mark('ready', now)
+        if self.config.boot_report:
+            print(self.boot.report(self.probe), file=sys.stderr)
+
+    def _flush_logs(self, now=None):
+        if self.telemetry is not None:
+            self.telemetry.flush()
+        if self.capture is not None:
+            self.capture.flush()
+        if now is not None:
+            self.scheduler.call_later(self.config.telemetry_flush_s, self._flush_logs)
+
+    def _on_backspace(self, event):
+        if event.value:
+            self.scheduler.stop()
+
+    def stop(self):
+        self.scheduler.stop()
+
+    def run(self):
+        """뒤로 가기 버튼을 누르거나 stop() 이 불릴 때까지 실행합니다."""
+        try:
+            self.setup()
+            self.scheduler.run()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if self.hub is not None:
+                self.hub.stop()
+            if self.touch is not None:
+                self.touch.stop()
+            self.off()
+            self._flush_logs()
+
+
+# ==========================================
+# 기존 스크립트와 같은 설정 조합
+# ==========================================
+def default_triggers():
+    return [UltrasonicDwell(), PalmTouch(), GyroRateSwing(), SideClick()]
+
+
+def interval_triggers():
+    """1초 간격 각도 변화로 흔들기를 세던 기존 방식입니다."""
+    return [UltrasonicDwell(), PalmTouch(), GyroRotationInterval(), SideClick()]
+
+
+# 저장소 맨 위의 스크립트
+NEW_VERSION_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'robort_hand_new_version.py')
+_script_code = {}
+
+
+def script_preset(path):
+    """스크립트의 설정 부분을 실행해 그 스크립트가 만드는 (config, triggers) 를 가져옵니다.
+
+    스크립트는 직접 실행할 때(__name__ == '__main__')만 제어기를 돌리므로 여기서는 설정과
+    트리거만 만들어집니다. 스크립트가 곧 프리셋이므로 스크립트의 기본값을 바꾸면 시뮬레이터,
+    재생, 벤치마크도 같은 설정을 씁니다. 시작 시간 출력(boot_report)만 끕니다.
+    """
+    code = _script_code.get(path)
+    if code is None:
+        with open(path, encoding='utf-8') as f:
+            code = _script_code[path] = compile(f.read(), path, 'exec')
+    namespace = {'__name__': 'robot_hand.script_preset', '__file__': path}
+    exec(code, namespace)
+    return namespace['config'].replace(boot_report=False), namespace['triggers']
+
+
+def new_version_preset():
+    """robort_hand_new_version.py 의 설정과 트리거 (스크립트에서 그대로 읽음)"""
+    return script_preset(NEW_VERSION_SCRIPT)
+
+
+def touch_watcher_preset():
+    """기본 설정에 터치 감시 스레드와 그 사건으로 판단하는 트리거를 씀 (robot_hand.touch)"""
+    return (HandConfig(touch_watcher=True),
+            [UltrasonicDwell(), PalmPress(), GyroRateSwing(), SideGesture()])
+
+
+# 기존 스크립트들의 자이로 리셋과 대기
+LEGACY_GYRO = {'gyro_hardware_reset': True, 'gyro_calibration_s': 2.0, 'release_cooldown_s': 2.0}
+
+
+def gestures_preset():
+    """touch_watcher 에 손날 제스처를 더 묶음 (조금 펴기, 더 조이기, 자이로 놓기 잠금)"""
+    bindings = {'click': RELEASE, 'hold_3': RESET, 'double_click': PARTIAL_OPEN,
+                'click_hold_1': TIGHTEN, 'triple_click': LOCK}
+    return (HandConfig(touch_watcher=True),
+            [UltrasonicDwell(), PalmPress(), GyroRateSwing(), SideGestures(bindings)])
+
+
+def poses_preset():
+    """touch_watcher 에 잡기 자세 라이브러리를 씀: 초음파로 다가온 거리와 속도로 자세를 고르고,
+    손날 두 번/세 번 클릭으로 다음 잡기를 집기/감싸기로 고름 (robot_hand.poses)"""
+    return (HandConfig(touch_watcher=True),
+            [UltrasonicDwell(rules=POSE_RULES), PalmPress(), GyroRateSwing(),
+             SideGestures(poses={'double_click': PINCH, 'triple_click': CYLINDER})])
+
+
+def demo_new_version_preset():
+    """robort_hand_demo_new_version.py"""
+    return (HandConfig(grasp_degrees=-300, thumb_degrees=300, thumb_speed=15, **LEGACY_GYRO),
+            interval_triggers())
+
+
+def solution_1_preset():
+    """solution-1: 손날 버튼으로 놓은 뒤 물체를 뺄 때까지 다시 잡지 않음"""
+    return (HandConfig(lock_after_manual_release=True, open_after_reset=True, **LEGACY_GYRO),
+            interval_triggers())
+
+
+def demo3_preset():
+    """robort_hand_demo3.py: 세 모터 모두 -300도, 자이로 각도가 ±85도를 세 번 오가면 놓기"""
+    config = HandConfig(grasp_degrees=-300, thumb_degrees=-300, thumb_speed=15,
+                        release_delay_s=1.5, gyro_hardware_reset=True, gyro_calibration_s=2.0,
+                        release_cooldown_s=3.0)
+    triggers = [UltrasonicDwell(5, 2), PalmTouch(), GyroSwingCount(85, 3), SideClick()]
+    return config, triggers
+
+
+PRESETS = {
+    'new_version': new_version_preset,
+    'touch_watcher': touch_watcher_preset,
+    'gestures': gestures_preset,
+    'poses': poses_preset,
+    'demo_new_version': demo_new_version_preset,
+    'solution-1': solution_1_preset,
+    'demo3': demo3_preset,
+}
+
+
+def make_controller(preset, devices=None, clock=None):
+    """PRESETS 이름으로 제어기를 만듭니다."""
+    config, triggers = PRESETS[preset]()
+    return HandController(config, triggers, devices, clock)
@@ -0,0 +1,181 @@
+"""EV3 장치를 백그라운드에서 동시에 찾고, 찾은 장치부터 제어기에 묶습니다.
+
+ev3dev2 장치 객체는 만들 때마다 /sys/class 아래를 훑어 포트를 찾으므로 일곱 개를
+차례로 만들면 첫 틱까지 몇 초가 걸립니다. DeviceProbe 는 장치마다 스레드 하나에서
+장치를 만들고, 제어기는 LazyDevice 대리 객체를 받아 바로 시작합니다.
+
+- 센서: 제어기가 찾은 센서부터 스케줄러에 등록하므로, 손바닥 터치 센서와 모터를 찾으면
+  초음파나 자이로 센서를 찾는 동안에도 터치로 잡을 수 있습니다.
+- 모터와 버튼: 처음 쓸 때 아직 찾는 중이면 찾을 때까지 기다립니다.
+- 자이로 리셋 뒤 보정 대기는 다른 장치를 찾고 센서를 읽는 동안 함께 흐릅니다.
+
+BootTimeline 은 파이썬 시작, 장치별로 찾은 시각, 첫 틱, 모든 센서가 준비된 시각을 모아
+한 줄로 보여 줍니다. (HandConfig 의 boot_report)
+"""
+
+import os
+import threading
+import time
+
+# HandDevices 의 모터 이름
+MOTORS = ('finger1', 'finger2', 'thumb')
+
+
+class DeviceNotFound(Exception):
+    """장치를 만들지 못했습니다. 원래 예외는 cause 에 있습니다."""
+
+    def __init__(self, role, cause):
+        Exception.__init__(self, '%s 장치를 찾지 못했습니다: %s' % (role, cause))
+        self.role = role
+        self.cause = cause
+
+
+class DeviceProbe(object):
+    """(이름, 생성 함수) 마다 스레드 하나에서 장치를 만듭니다.
+
+    threads 가 False 면 start() 에서 차례로 만듭니다. 가상 시계로 돌리는 시뮬레이터는
+    실제 시간에 도는 스레드를 기다리면 결과가 실행마다 달라지므로 이쪽을 씁니다.
+    """
+
+    def __init__(self, factories, clock=time.time, threads=True):
+        self.factories = list(factories)
+        self.clock = clock
+        self.threads = threads
+        self.started = None
+        self.devices = {}
+        self.errors = {}
+        self.found_at = {}  # 이름 -> 장치를 만든(또는 실패한) 시각
+        self._cond = threading.Condition()
+
+    def start(self):
+        self.started = self.clock()
+        for role, make in self.factories:
+            if self.threads:
+                thread = threading.Thread(target=self._probe, args=(role, make),
+                                          name='probe-' + role)
+                thread.daemon = True
+                thread.start()
+            else:
+                self._probe(role, make)
+        return self
+
+    def _probe(self, role, make):
+        try:
+            device, error = make(), None
+        except Exception as e:
+            device, error = None, DeviceNotFound(role, e)
+        with self._cond:
+            if error is None:
+                self.devices[role] = device
+            else:
+                self.errors[role] = error
+            self.found_at[role] = self.clock()
+            self._cond.notify_all()
+
+    def ready(self, role):
+        """role 장치를 찾았는지 기다리지 않고 확인합니다."""
+        return role in self.devices
+
+    def done(self):
+        """모든 장치를 찾았거나 실패했는지 확인합니다."""
+        return len(self.found_at) == len(self.factories)
+
+    def check(self):
+        """찾지 못한 장치가 있으면 그 DeviceNotFound 를 냅니다."""
+        if self.errors:
+            raise self.errors[min(self.errors, key=self.found_at.get)]
+
+    def get(self, role, timeout=None):
+        """role 장치를 반환합니다. 아직 찾는 중이면 찾을 때까지 기다립니다."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: role in self.found_at, timeout):
+                raise DeviceNotFound(role, '%.1f 초 안에 찾지 못했습니다' % timeout)
+        if role in self.errors:
+            raise self.errors[role]
+        return self.devices[role]
+
+    def wait(self, timeout=None):
+        """모든 장치를 찾을 때까지 기다리고, 실패한 장치가 있으면 예외를 냅니다."""
+        with self._cond:
+            self._cond.wait_for(self.done, timeout)
+        self.check()
+
+
+class LazyDevice(object):
+    """probe 가 찾은 장치로 속성 읽기/쓰기를 넘기는 대리 객체입니다.
+
+    처음 쓸 때 장치를 아직 찾는 중이면 찾을 때까지 기다립니다.
+    """
+
+    def __init__(self, probe, role):
+        self.__dict__.update(_probe=probe, _role=role, _device=None)
+
+    def _bind(self):
+        device = self._device
+        if device is None:
+            device = self.__dict__['_device'] = self._probe.get(self._role)
+        return device
+
+    def __getattr__(self, name):
+        return getattr(self._bind(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._bind(), name, value)
+
+    def __repr__(self):
+        return 'LazyDevice(%s, %r)' % (self._role, self._device)
+
+
+def lazy_devices(probe):
+    """probe 의 장치 이름별 LazyDevice 딕셔너리입니다. (HandDevices(**...) 로 씀)"""
+    return dict((role, LazyDevice(probe, role)) for role, _ in probe.factories)
+
+
+def process_age():
+    """파이썬 프로세스가 시작된 뒤 흐른 시간(초)입니다. /proc 이 없으면 None 입니다."""
+    try:
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        with open('/proc/self/stat') as f:
+            # 두 번째 칸(실행 파일 이름)에 공백이 있을 수 있으므로 ')' 뒤부터 셉니다.
+            fields = f.read().rsplit(')', 1)[1].split()
+        return uptime - int(fields[19]) / float(os.sysconf('SC_CLK_TCK'))
+    except (OSError, IOError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class BootTimeline(object):
+    """제어기를 만든 시각부터 장치를 찾고 첫 틱을 돌고 준비되기까지의 시각을 모읍니다."""
+
+    def __init__(self, clock=time.time, before=None):
+        self.clock = clock
+        self.start = clock()
+        self.before = before  # 제어기를 만들기 전까지 흐른 시간 (import 포함)
+        self.marks = []
+
+    def mark(self, name, when=None):
+        self.marks.append((name, self.clock() if when is None else when))
+
+    def elapsed(self, name):
+        for mark, when in self.marks:
+            if mark == name:
+                return when - self.start
+        return None
+
+    def report(self, probe=None):
+        """'boot (s): python 1.23 | finger1 0.31 | ... | ready 2.05' 형식의 한 줄입니다.
+
+        python 은 제어기를 만들기 전까지, 나머지는 제어기를 만든 뒤 흐른 시간입니다.
+        """
+        parts = []
+        if self.before is not None:
+            parts.append('python %.2f' % self.before)
+        if probe is not None:
+            for role, _ in probe.factories:
+                when = probe.found_at.get(role)
+                state = 'failed ' if role in probe.errors else ''
+                parts.append('%s %s%s' % (role, state, '-' if when is None else
+                                          '%.2f' % (when - self.start)))
+        for name, when in self.marks:
+            parts.append('%s %.2f' % (name, when - self.start))
+        return 'boot (s): ' + ' | '.join(parts)
@@ -0,0 +1,85 @@
+"""EV3 없이 실행할 때 쓰는 가짜 ev3dev2 센서들입니다.
+
+각 장치는 ev3dev2 와 같은 이름의 속성을 갖고, latency 로 sysfs 읽기에 걸리는
+시간을 흉내 낼 수 있습니다. 값은 테스트나 시나리오에서 직접 바꿔 넣습니다.
+"""
+
+from time import sleep
+
+
+class FakeDevice(object):
+    """읽을 때마다 latency 초만큼 기다리는 가짜 장치입니다."""
+
+    def __init__(self, address=None, latency=0.0, sleep=sleep):
+        self.address = address
+        self.latency = latency
+        self.reads = 0
+        self._sleep = sleep
+
+    def _io(self):
+        self.reads += 1
+        if self.latency:
+            self._sleep(self.latency)
+
+
+class FakeUltrasonicSensor(FakeDevice):
+
+    def __init__(self, address=None, distance=255.0, **kwargs):
+        FakeDevice.__init__(self, address, **kwargs)
+        self.distance = distance
+
+    @property
+    def distance_centimeters(self):
+        self._io()
+        return self.distance
+
+
+class FakeGyroSensor(FakeDevice):
+
+    def __init__(self, address=None, **kwargs):
+        FakeDevice.__init__(self, address, **kwargs)
+        self.raw_angle = 0.0
+        self.raw_rate = 0.0
+        self._zero = 0.0
+
+    @property
+    def angle(self):
+        self._io()
+        return int(round(self.raw_angle - self._zero))
+
+    @property
+    def rate(self):
+        self._io()
+        return int(round(self.raw_rate))
+
+    @property
+    def angle_and_rate(self):
+        self._io()
+        return int(round(self.raw_angle - self._zero)), int(round(self.raw_rate))
+
+    def reset(self):
+        self._zero = self.raw_angle
+
+
+class FakeTouchSensor(FakeDevice):
+
+    def __init__(self, address=None, pressed=False, **kwargs):
+        FakeDevice.__init__(self, address, **kwargs)
+        self.pressed = pressed
+
+    @property
+    def is_pressed(self):
+        self._io()
+        return self.pressed
+
+
+class FakeButton(FakeDevice):
+
+    def __init__(self, **kwargs):
+        FakeDevice.__init__(self, None, **kwargs)
+        self.backspace_pressed = False
+
+    @property
+    def backspace(self):
+        self._io()
+        return self.backspace_pressed
@@ -0,0 +1,142 @@
+"""센서 값을 한 샘플씩 받아 거르는 스트리밍 필터입니다.
+
+초음파 센서는 가끔 아주 먼 값(255 cm)이나 튀는 값을 돌려줍니다. 한 번 읽은
+값으로 바로 판단하면 잡음 하나에 감지 지속 타이머가 처음부터 다시 시작되므로,
+고정 크기 창의 중앙값과 히스테리시스로 거른 뒤 판단합니다.
+
+모든 필터는 미리 잡아 둔 리스트만 쓰므로 샘플마다 드는 비용이 일정합니다.
+"""
+
+from bisect import bisect_left, insort
+
+
+class SlidingMedian(object):
+    """마지막 size 개 값의 중앙값을 샘플마다 갱신합니다.
+
+    값을 넣은 순서대로 링 버퍼에, 크기 순서대로 정렬 리스트에 함께 보관합니다.
+    가장 오래된 값을 정렬 리스트에서 이분 탐색으로 찾아 빼고 새 값을 끼워 넣으므로
+    탐색은 O(log n) 이고, 창이 작아서 리스트 이동 비용은 무시할 만합니다.
+    """
+
+    def __init__(self, size=5):
+        if size < 1:
+            raise ValueError('size 는 1 이상이어야 합니다')
+        self.size = size
+        self._ring = [0.0] * size
+        self._sorted = []
+        self._index = 0
+
+    def reset(self):
+        self._sorted = []
+        self._index = 0
+
+    def __len__(self):
+        return len(self._sorted)
+
+    def push(self, value):
+        """value 를 넣고 현재 창의 중앙값을 반환합니다."""
+        ordered = self._sorted
+        if len(ordered) == self.size:
+            del ordered[bisect_left(ordered, self._ring[self._index])]
+        self._ring[self._index] = value
+        self._index = (self._index + 1) % self.size
+        insort(ordered, value)
+        return self.median
+
+    @property
+    def median(self):
+        ordered = self._sorted
+        n = len(ordered)
+        if n == 0:
+            return None
+        if n % 2:
+            return ordered[n // 2]
+        return (ordered[n // 2 - 1] + ordered[n // 2]) / 2.0
+
+
+class ProximityFilter(object):
+    """초음파 거리로 물체가 가까이 있는지를 판단합니다.
+
+    - 중앙값 창: 튀는 값 몇 개가 판단을 바꾸지 못하게 합니다.
+    - 히스테리시스: near_cm 보다 가까우면 감지, release_cm 보다 멀어져야 해제합니다.
+    - 측정 실패 허용: valid_max_cm 이상(에코 없음 255 cm)이나 0 이하 값은
+      max_dropouts 번 연속까지 무시하고 이전 판단을 유지합니다.
+    """
+
+    def __init__(self, near_cm=5, release_cm=None, window=5, max_dropouts=3, valid_max_cm=250):
+        self.near_cm = near_cm
+        self.release_cm = near_cm if release_cm is None else release_cm
+        self.max_dropouts = max_dropouts
+        self.valid_max_cm = valid_max_cm
+        self.window = SlidingMedian(window)
+        self.near = False
+        self.dropouts = 0   # 연속 측정 실패 횟수
+        self.distance = None  # 마지막 중앙값
+
+    def reset(self):
+        self.window.reset()
+        self.near = False
+        self.dropouts = 0
+        self.distance = None
+
+    def update(self, value):
+        """거리 값 하나를 넣고 물체가 가까이 있는지를 반환합니다."""
+        if value <= 0 or value >= self.valid_max_cm:
+            self.dropouts += 1
+            if self.dropouts <= self.max_dropouts:
+                return self.near
+        else:
+            self.dropouts = 0
+        distance = self.distance = self.window.push(value)
+        if self.near:
+            if distance > self.release_cm:
+                self.near = False
+        elif distance < self.near_cm:
+            self.near = True
+        return self.near
+
+
+class ApproachSpeed(object):
+    """거른 거리 값으로 물체가 다가오는 속도(cm/s)를 구합니다.
+
+    speed 는 span 샘플 앞의 값과 비교한 지금 속도이고, approach 는 물체가 쉬지 않고
+    다가오기 시작한 뒤의 평균 속도입니다. 멈추거나 멀어지면 approach 는 0 부터 다시 잽니다.
+    평균은 다가오기 시작한 값과 지금 값만으로 구하므로 샘플마다 튀는 잡음이 쌓이지 않습니다.
+    """
+
+    def __init__(self, span=4):
+        self.span = span
+        self._times = [0.0] * (span + 1)
+        self._values = [0.0] * (span + 1)
+        self.reset()
+
+    def reset(self):
+        self._index = 0
+        self._count = 0
+        self._origin = None  # 다가오기 시작한 (시각, 거리)
+        self.speed = 0.0
+        self.approach = 0.0
+
+    def update(self, now, distance):
+        """거리 값 하나를 넣고 지금 다가오는 속도(멀어지면 음수)를 반환합니다."""
+        index = self._index
+        self._times[index] = now
+        self._values[index] = distance
+        self._index = (index + 1) % (self.span + 1)
+        self._count += 1
+        if self._count <= self.span:
+            return 0.0
+        # 다음에 덮어쓸 자리가 span 샘플 앞의 값입니다.
+        oldest = self._index
+        then = self._times[oldest]
+        elapsed = now - then
+        speed = self.speed = (self._values[oldest] - distance) / elapsed if elapsed > 0 else 0.0
+        if speed <= 0:
+            self._origin = None
+            self.approach = 0.0
+            return speed
+        if self._origin is None:
+            self._origin = (then, self._values[oldest])
+        start, start_distance = self._origin
+        self.approach = (start_distance - distance) / (now - start)
+        return speed
@@ -0,0 +1,147 @@
+"""터치 사건(robot_hand.touch)을 하나씩 받아 여러 번 클릭, 길게 누르기 단계, 클릭한 뒤
+길게 누르기를 알아보는 제스처 인식기입니다.
+
+제스처 이름은 클릭 횟수와 마지막에 누르고 있던 시간(초)으로 짓습니다.
+
+    'click', 'double_click', 'triple_click'    1~3 번 클릭
+    'hold_3', 'hold_1.5'                        그 시간 넘게 누름
+    'click_hold_1', 'double_click_hold_1'      클릭한 뒤 다시 눌러 그 시간 넘게 누름
+
+GestureRecognizer 는 넘겨받은 제스처만 알아보고, 더 긴 제스처로 이어질 수 없으면 바로
+알립니다. 예를 들어 double_click 을 쓰지 않으면 click 은 뗄 때 바로 알리고, 쓰면
+multi_click_s 안에 다시 누르지 않을 때 알립니다. 길게 누르기는 더 긴 단계가 없으면 그
+시간이 되는 순간에, 있으면 뗄 때 지난 단계 중 가장 긴 것으로 알립니다.
+그러므로 click 만 바로 놓기에 쓰려면 클릭으로 시작하는 다른 제스처를 묶지 않습니다.
+
+사건 하나(feed)와 시간 확인(poll)은 미리 만든 표 몇 개를 찾는 O(1) 입니다.
+알리는 시각은 누른/뗀 시각에서 계산하므로 poll 이 조금 늦어도 같습니다.
+"""
+
+from collections import namedtuple
+
+from robot_hand.touch import PRESS, RELEASE
+
+# clicks: 클릭 횟수, hold_s: 마지막에 누르고 있던 시간 (0 이면 클릭으로 끝남)
+Gesture = namedtuple('Gesture', 'clicks hold_s')
+
+# 알아본 제스처: name 은 넘겨받은 이름 그대로, timestamp 는 제스처가 정해진 시각
+GestureEvent = namedtuple('GestureEvent', 'name timestamp')
+
+CLICK_NAMES = ('', 'click', 'double_click', 'triple_click')
+
+
+def parse_gesture(name):
+    """'double_click_hold_1' 같은 이름을 Gesture 로 바꿉니다."""
+    clicks, hold_s = name, 0.0
+    if 'hold_' in name:
+        clicks, _, seconds = name.rpartition('hold_')
+        clicks = clicks.rstrip('_')
+        try:
+            hold_s = float(seconds)
+        except ValueError:
+            hold_s = 0.0
+        if hold_s <= 0:
+            raise ValueError('누르는 시간이 잘못된 제스처입니다: %s' % name)
+    if clicks not in CLICK_NAMES or (not clicks and not hold_s):
+        raise ValueError('알 수 없는 제스처입니다: %s' % name)
+    return Gesture(CLICK_NAMES.index(clicks), hold_s)
+
+
+class GestureRecognizer(object):
+    """한 터치 센서의 PRESS/RELEASE 사건으로 names 의 제스처를 알아봅니다."""
+
+    def __init__(self, names, click_min_s=0.1, click_max_s=2.0, multi_click_s=0.4):
+        self.click_min_s = click_min_s
+        self.click_max_s = click_max_s
+        self.multi_click_s = multi_click_s
+        self.names = dict((parse_gesture(name), name) for name in names)
+        gestures = list(self.names)
+        self.max_clicks = max(g.clicks for g in gestures) if gestures else 0
+        # 클릭 수별 길게 누르기 단계 (짧은 것부터)
+        self.holds = [tuple(sorted(g.hold_s for g in gestures if g.clicks == clicks and g.hold_s))
+                      for clicks in range(self.max_clicks + 1)]
+        # 클릭 수별 클릭으로 볼 가장 긴 시간 (첫 단계를 넘으면 길게 누르기)
+        self.click_limits = [min((self.click_max_s,) + holds[:1]) for holds in self.holds]
+        # 그만큼 클릭한 뒤 다시 눌러 이어질 제스처가 있는지
+        self.continues = [any(g.clicks > clicks or (g.clicks == clicks and g.hold_s)
+                              for g in gestures)
+                          for clicks in range(self.max_clicks + 1)]
+        self.reset()
+
+    def reset(self):
+        self.clicks = 0           # 이번 제스처에서 끝낸 클릭 수
+        self.press_time = None    # 누르고 있으면 누른 시각
+        self.tier = -1            # 지금 누르는 동안 지난 길게 누르기 단계
+        self.hold_sent = False    # 마지막 단계를 누르는 동안 이미 알렸는지
+        self.deadline = None      # 다음 클릭을 기다리는 끝 시각
+
+    def _finish(self, gesture, timestamp):
+        """제스처를 끝내고 묶인 제스처면 GestureEvent 를 반환합니다."""
+        self.reset()
+        name = self.names.get(gesture)
+        return None if name is None else GestureEvent(name, timestamp)
+
+    def feed(self, event):
+        """TouchEvent 하나를 받아, 정해진 제스처가 있으면 GestureEvent 를 반환합니다."""
+        if event.kind == PRESS:
+            finished = None
+            if self.deadline is not None and event.timestamp >= self.deadline:
+                finished = self._finish(Gesture(self.clicks, 0.0), self.deadline)
+            self.deadline = None
+            self.press_time = event.timestamp
+            self.tier = -1
+            self.hold_sent = False
+            return finished
+        if event.kind != RELEASE or self.press_time is None:
+            return None
+
+        clicks = self.clicks
+        now = event.timestamp
+        held = now - self.press_time
+        self.press_time = None
+        if self.tier >= 0:
+            if self.hold_sent:
+                self.reset()
+                return None
+            return self._finish(Gesture(clicks, self.holds[clicks][self.tier]), now)
+        if not self.click_min_s < held < self.click_limits[clicks]:
+            self.reset()
+            return None
+        clicks = self.clicks = clicks + 1
+        if clicks > self.max_clicks:
+            self.reset()
+            return None
+        if self.continues[clicks]:
+            self.deadline = now + self.multi_click_s
+            return None
+        return self._finish(Gesture(clicks, 0.0), now)
+
+    def poll(self, now):
+        """시간이 지나서 정해진 제스처가 있으면 GestureEvent 를 반환합니다."""
+        if self.press_time is not None:
+            holds = self.holds[self.clicks]
+            tier = self.tier
+            while tier + 1 < len(holds) and now - self.press_time >= holds[tier + 1]:
+                tier += 1
+            if tier == self.tier:
+                return None
+            self.tier = tier
+            if tier == len(holds) - 1 and not self.hold_sent:
+                # 더 긴 단계가 없으므로 떼기를 기다리지 않습니다.
+                self.hold_sent = True
+                name = self.names.get(Gesture(self.clicks, holds[tier]))
+                if name is not None:
+                    return GestureEvent(name, self.press_time + holds[tier])
+            return None
+        if self.deadline is not None and now >= self.deadline:
+            return self._finish(Gesture(self.clicks, 0.0), self.deadline)
+        return None
+
+    def next_deadline(self):
+        """poll 이 제스처를 정할 수 있는 가장 이른 시각입니다. (없으면 None)"""
+        if self.press_time is not None:
+            holds = self.holds[self.clicks]
+            if self.tier + 1 < len(holds):
+                return self.press_time + holds[self.tier + 1]
+            return None
+        return self.deadline
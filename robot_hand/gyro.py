@@ -0,0 +1,132 @@
+"""자이로 각속도(rate) 채널로 팔 흔들기를 감지하고 드리프트를 보정합니다.
+
+1초마다 각도 변화를 보거나 절대 각도를 ±임계값과 비교하는 대신, 각속도를
+샘플마다 적분해서 흔들기를 시작한 자세를 기준으로 한 각도를 만듭니다.
+한 번 흔들기는 기준 각도에서 한쪽으로 amplitude_deg 넘게 나갔다가 반대쪽으로도
+amplitude_deg 넘게 나간 뒤 다시 기준(center_deg 이내)으로 돌아오는 것입니다.
+돌아온 그 샘플에서 바로 흔들기를 셉니다.
+
+팔이 멈춰 있는 동안(최근 rest_window 샘플의 |각속도| 평균이 rest_dps 미만)에는
+적분 각도를 0 으로 되돌리므로 자이로 각도 드리프트가 쌓이지 않습니다.
+
+GyroBiasEstimator 는 팔이 멈춰 있을 때의 각속도로 자이로 바이어스(드리프트)를
+계속 추정하고, 기준 자세를 소프트웨어로 다시 잡습니다. 그래서 시작할 때나
+자이로로 놓은 뒤에 gyro_sensor.reset() 과 sleep(2) 로 기다릴 필요가 없습니다.
+"""
+
+from array import array
+
+
+class RestDetector(object):
+    """최근 window 개 |각속도| 의 평균이 rest_dps 미만이면 멈춰 있다고 봅니다."""
+
+    def __init__(self, rest_dps=8, window=20):
+        self.rest_dps = rest_dps
+        self._ring = array('d', [0.0] * window)
+        self._index = 0
+        self._filled = 0
+        self._abs_sum = 0.0
+
+    @property
+    def at_rest(self):
+        return self._filled == len(self._ring) and self._abs_sum < self.rest_dps * self._filled
+
+    def update(self, rate):
+        """각속도 하나를 넣고 멈춰 있는지를 반환합니다. 합은 O(1) 로 갱신합니다."""
+        ring = self._ring
+        magnitude = abs(rate)
+        self._abs_sum += magnitude - ring[self._index]
+        ring[self._index] = magnitude
+        self._index = (self._index + 1) % len(ring)
+        if self._filled < len(ring):
+            self._filled += 1
+        return self.at_rest
+
+
+class GyroBiasEstimator(object):
+    """멈춰 있는 동안 자이로 바이어스를 추정하고 보정한 (각도, 각속도)를 돌려줍니다.
+
+    - 바이어스: 멈춰 있을 때 (각속도 - 바이어스) 를 alpha 비율로 따라가는 지수 평균
+    - 각도: 마지막 zero() 이후 센서 각도 변화에서 그동안 쌓인 바이어스를 뺀 값
+    """
+
+    def __init__(self, alpha=0.02, rest_dps=3, rest_window=50, max_bias_dps=5.0):
+        self.alpha = alpha
+        self.max_bias_dps = max_bias_dps
+        self.rest = RestDetector(rest_dps, rest_window)
+        self.bias = 0.0
+        self.drift = 0.0        # 마지막 zero() 이후 쌓인 바이어스 각도
+        self.zero_angle = None  # 기준 자세의 센서 각도
+        self.last_time = None
+        self.raw_angle = 0
+
+    def zero(self):
+        """지금 자세를 0도로 삼습니다. (gyro_sensor.reset() 대신)"""
+        self.zero_angle = self.raw_angle
+        self.drift = 0.0
+
+    def update(self, now, angle, rate):
+        """센서 (각도, 각속도) 를 넣고 보정한 (각도, 각속도) 를 반환합니다."""
+        self.raw_angle = angle
+        if self.zero_angle is None:
+            self.zero_angle = angle
+        if self.last_time is not None:
+            self.drift += self.bias * (now - self.last_time)
+        self.last_time = now
+        residual = rate - self.bias
+        # 창 전체가 멈춰 있고 이번 샘플도 작을 때만 따라가서 움직이기 시작할 때의 값은 버립니다.
+        if self.rest.update(residual) and -self.rest.rest_dps < residual < self.rest.rest_dps:
+            bias = self.bias + self.alpha * residual
+            limit = self.max_bias_dps
+            self.bias = -limit if bias < -limit else limit if bias > limit else bias
+        return angle - self.zero_angle - self.drift, rate - self.bias
+
+
+class SwingDetector(object):
+    """각속도 샘플을 받아 흔들기 횟수를 셉니다."""
+
+    def __init__(self, amplitude_deg=45, count_target=2, center_deg=10,
+                 rest_dps=8, rest_window=20, max_gap_s=4.0):
+        self.amplitude_deg = amplitude_deg
+        self.count_target = count_target
+        self.center_deg = center_deg
+        self.max_gap_s = max_gap_s
+        self.rest = RestDetector(rest_dps, rest_window)
+        self.angle = 0.0       # 흔들기 기준 자세에서 적분한 각도
+        self.last_time = None
+        self.sides = 0         # 이번 흔들기에서 나갔던 쪽: 1(+), 2(-), 3(양쪽)
+        self.reset()
+
+    def reset(self):
+        """센 횟수만 지웁니다. 이미 진행 중인 흔들기는 계속 따라갑니다."""
+        self.count = 0
+        self.last_swing = None  # 마지막으로 흔들기를 센 시각
+
+    def update(self, now, rate):
+        """각속도 샘플 하나를 넣습니다. 목표 횟수를 채우면 True 를 반환합니다."""
+        at_rest = self.rest.update(rate)
+        if self.last_time is not None:
+            self.angle += rate * (now - self.last_time)
+        self.last_time = now
+
+        if self.count and now - self.last_swing > self.max_gap_s:
+            self.count = 0  # 흔들기 사이가 너무 길면 새 동작으로 봅니다.
+
+        angle = self.angle
+        if angle > self.amplitude_deg:
+            self.sides |= 1
+        elif angle < -self.amplitude_deg:
+            self.sides |= 2
+        elif self.sides == 3 and -self.center_deg <= angle <= self.center_deg:
+            # 양쪽을 다녀와서 기준 자세로 돌아왔으므로 한 번 흔든 것입니다.
+            self.sides = 0
+            self.count += 1
+            self.last_swing = now
+            if self.count >= self.count_target:
+                self.count = 0
+                return True
+        if at_rest:
+            # 멈춰 있으면 지금 자세를 새 기준으로 삼고, 하다 만 흔들기는 버립니다.
+            self.angle = 0.0
+            self.sides = 0
+        return False
@@ -0,0 +1,130 @@
+"""센서마다 전용 백그라운드 스레드에서 값을 읽어 두는 센서 허브입니다.
+
+메인 루프에서 distance_centimeters, angle, is_pressed 를 읽으면 매번 sysfs 파일을
+순서대로 읽어야 합니다. 허브는 센서별 스레드가 값을 읽어 시각과 함께 링 버퍼에
+넣어 두고, 판단 로직은 latest() 로 가장 최근 값을 I/O 없이 바로 가져갑니다.
+
+링 버퍼마다 쓰는 스레드는 하나뿐이고 최신 값은 튜플 하나를 통째로 바꿔
+끼우므로(CPython 에서 원자적) 읽을 때 잠금이 필요 없습니다.
+"""
+
+import threading
+from collections import namedtuple
+from time import sleep, time
+
+Sample = namedtuple('Sample', 'timestamp value')
+
+
+class SampleRing(object):
+    """고정 크기 링 버퍼입니다. 쓰기는 한 스레드만 해야 합니다."""
+
+    __slots__ = ('size', 'count', 'latest', '_times', '_values')
+
+    def __init__(self, size=64):
+        self.size = size
+        self.count = 0       # 지금까지 넣은 샘플 수
+        self.latest = None   # 가장 최근 Sample
+        self._times = [0.0] * size
+        self._values = [None] * size
+
+    def push(self, timestamp, value):
+        i = self.count % self.size
+        self._times[i] = timestamp
+        self._values[i] = value
+        self.count += 1
+        self.latest = Sample(timestamp, value)
+
+    def history(self, n=None):
+        """최근 n 개 샘플을 오래된 것부터 반환합니다. 쓰는 도중이면 다시 읽습니다."""
+        while True:
+            count = self.count
+            if n is None or n > min(count, self.size):
+                n = min(count, self.size)
+            start = count - n
+            samples = [Sample(self._times[i % self.size], self._values[i % self.size])
+                       for i in range(start, count)]
+            # 복사하는 동안 덮어써진 칸이 없으면 일관된 값입니다.
+            if self.count - start <= self.size:
+                return samples
+
+
+class SensorHub(object):
+    """센서 읽기 함수를 등록하면 센서마다 스레드를 띄워 주기적으로 읽습니다."""
+
+    def __init__(self, clock=time, sleep=sleep, size=64):
+        self.clock = clock
+        self.sleep = sleep
+        self.size = size
+        self.rings = {}
+        self.reads = {}       # 이름 -> (읽기 함수, 주기)
+        self.errors = {}      # 이름 -> 마지막 예외
+        self._threads = []
+        self._stop = threading.Event()
+
+    def add(self, name, read, period):
+        """name 센서를 period 초마다 read() 로 읽도록 등록합니다."""
+        self.rings[name] = SampleRing(self.size)
+        self.reads[name] = (read, period)
+
+    def start(self):
+        self._stop.clear()
+        for name in self.reads:
+            thread = threading.Thread(target=self._run, args=(name,),
+                                      name='hub-' + name)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout=1.0):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _run(self, name):
+        read, period = self.reads[name]
+        ring = self.rings[name]
+        next_time = self.clock()
+        while not self._stop.is_set():
+            try:
+                value = read()
+            except Exception as e:  # 센서가 잠깐 빠져도 스레드는 계속 돕니다.
+                self.errors[name] = e
+            else:
+                ring.push(self.clock(), value)
+            next_time += period
+            delay = next_time - self.clock()
+            if delay > 0:
+                self.sleep(delay)
+            else:
+                next_time = self.clock()
+
+    # --- 판단 로직에서 쓰는 읽기 함수 (I/O 없음) ---
+    def latest(self, name):
+        """가장 최근 Sample 을 반환합니다. 아직 읽은 값이 없으면 None 입니다."""
+        return self.rings[name].latest
+
+    def value(self, name, default=None):
+        sample = self.rings[name].latest
+        return default if sample is None else sample.value
+
+    def reader(self, name, default=None):
+        """SensorSource 의 read 로 넘길 수 있는 함수를 반환합니다."""
+        ring = self.rings[name]
+
+        def read():
+            sample = ring.latest
+            return default if sample is None else sample.value
+        return read
+
+    def history(self, name, n=None):
+        return self.rings[name].history(n)
+
+    def wait_ready(self, timeout=2.0):
+        """모든 센서가 한 번 이상 읽힐 때까지 기다립니다."""
+        deadline = self.clock() + timeout
+        while any(ring.latest is None for ring in self.rings.values()):
+            if self.clock() >= deadline:
+                return False
+            self.sleep(0.001)
+        return True
@@ -0,0 +1,239 @@
+"""세 모터를 block=False 로 움직이고 완료/멈춤/시간초과를 이벤트로 알려주는 모션 엔진입니다.
+
+on_for_degrees(..., block=True) 처럼 동작이 끝날 때까지 기다리지 않으므로
+손가락이 움직이는 동안에도 센서와 버튼을 계속 읽을 수 있습니다.
+진행 중인 동작은 새 동작(예: 잡는 도중 놓기)을 시작하면 취소됩니다.
+
+AdaptiveGrasp 를 함께 넘기면 정해진 각도만큼 천천히 움직이는 대신 빠르게 닫다가
+모터 속도가 떨어지거나 멈추면(물체에 닿으면) 그 모터만 느린 속도로 조금 더 조인 뒤
+그 자리에서 버팁니다.
+"""
+
+from collections import namedtuple
+from time import time
+
+# 동작 결과
+RUNNING = 'running'
+DONE = 'done'
+STALLED = 'stalled'
+TIMEOUT = 'timeout'
+CANCELLED = 'cancelled'
+GRIPPED = 'gripped'  # AdaptiveGrasp: 물체에 닿아 버티는 중
+
+MotionEvent = namedtuple('MotionEvent', 'handle status timestamp')
+
+# 한 모터에 내릴 명령: method 는 'on_for_degrees' 또는 'on_to_position'
+# ramp 는 ramp_up_sp / ramp_down_sp (ms) 이며 None 이면 모터 설정을 그대로 둡니다.
+MotorCommand = namedtuple('MotorCommand', 'motor method speed target ramp')
+MotorCommand.__new__.__defaults__ = (None,)
+
+# robot_hand.sysfs 모터는 설정값 쓰기와 출발 명령을 나눠서 보낼 수 있습니다.
+_PREPARE_METHODS = {
+    'on_for_degrees': 'prepare_for_degrees',
+    'on_to_position': 'prepare_to_position',
+}
+
+
+class MotionHandle(object):
+    """시작된 동작 하나의 진행 상태입니다."""
+
+    def __init__(self, name, commands, started, deadline):
+        self.name = name
+        self.commands = commands
+        self.motors = [command.motor for command in commands]
+        self.started = started
+        self.deadline = deadline
+        self.status = RUNNING
+        self.finished = None
+        self.tracker = None  # AdaptiveGrasp 처럼 동작을 직접 따라가는 객체
+
+    @property
+    def done(self):
+        return self.status != RUNNING
+
+
+class MotionEngine(object):
+    """동작을 시작하고 poll() 로 상태를 확인해 이벤트를 발생시킵니다."""
+
+    def __init__(self, clock=time, timeout=10.0, odometry=None):
+        self.clock = clock
+        self.timeout = timeout
+        self.active = None
+        self.odometry = odometry  # robot_hand.odometry.FingerOdometry (명령과 결과를 알려 줌)
+        self._handlers = []
+
+    def subscribe(self, handler):
+        """동작이 끝날 때 handler(MotionEvent)를 호출하도록 등록합니다."""
+        self._handlers.append(handler)
+
+    def start(self, name, commands, timeout=None, tracker=None):
+        """모든 모터 명령을 바로 내리고 MotionHandle 을 반환합니다.
+
+        진행 중인 동작이 있으면 먼저 취소합니다. 새 명령이 이전 명령을
+        덮어쓰므로 모터를 따로 멈추지는 않습니다. tracker 가 있으면 poll() 에서
+        끝났는지를 tracker.poll() 로 판단합니다.
+        """
+        if self.active is not None and not self.active.done:
+            self._finish(self.active, CANCELLED)
+        now = self.clock()
+        handle = MotionHandle(name, commands, now,
+                              now + (self.timeout if timeout is None else timeout))
+        self.active = handle
+        odometry = self.odometry
+        positions = None
+        if odometry is not None:
+            # 출발 위치를 모르는 모터만 읽습니다.
+            positions = [odometry.position(command.motor, now) for command in commands]
+            for command in commands:
+                odometry.command(command.motor, command.method, command.speed, command.target,
+                                 command.ramp, now, contact=tracker is not None)
+        for command in commands:
+            if command.ramp is not None:
+                command.motor.ramp_up_sp = command.ramp
+                command.motor.ramp_down_sp = command.ramp
+        if all(hasattr(command.motor, 'run_command') for command in commands):
+            # 설정값을 모두 먼저 쓰고 출발 명령을 연달아 보내 동시에 출발시킵니다.
+            starts = [(command.motor,
+                       getattr(command.motor, _PREPARE_METHODS[command.method])(
+                           command.speed, command.target))
+                      for command in commands]
+            for motor, run in starts:
+                motor.run_command(run)
+        else:
+            for command in commands:
+                getattr(command.motor, command.method)(command.speed, command.target, block=False)
+        if tracker is not None:
+            handle.tracker = tracker
+            tracker.begin(handle, now, positions)
+        return handle
+
+    def cancel(self):
+        """진행 중인 동작을 멈추고 취소 이벤트를 보냅니다."""
+        handle = self.active
+        if handle is None or handle.done:
+            return
+        for motor in handle.motors:
+            motor.stop()
+        self._finish(handle, CANCELLED)
+
+    def poll(self):
+        """진행 중인 동작의 상태를 확인하고 현재 상태를 반환합니다."""
+        handle = self.active
+        if handle is None or handle.done:
+            return None
+        motors = handle.motors
+        if handle.tracker is not None:
+            now = self.clock()
+            status = handle.tracker.poll(handle, now)
+            if status != RUNNING:
+                self._finish(handle, status)
+            elif now >= handle.deadline:
+                for motor in motors:
+                    motor.stop()
+                self._finish(handle, TIMEOUT)
+        elif any(motor.is_stalled for motor in motors):
+            # block=True 대기와 같이 멈춤(stall)도 동작 종료로 봅니다.
+            self._finish(handle, STALLED)
+        elif not any(motor.is_running for motor in motors):
+            self._finish(handle, DONE)
+        elif self.clock() >= handle.deadline:
+            for motor in motors:
+                motor.stop()
+            self._finish(handle, TIMEOUT)
+        return handle.status
+
+    def _finish(self, handle, status):
+        handle.status = status
+        handle.finished = self.clock()
+        if self.odometry is not None:
+            for motor in handle.motors:
+                self.odometry.finish(motor, status, handle.finished)
+        event = MotionEvent(handle, status, handle.finished)
+        for handler in self._handlers:
+            handler(event)
+
+
+def native_speed(motor, speed):
+    """SpeedPercent 나 퍼센트 숫자를 모터의 deg/s 로 바꿉니다."""
+    if hasattr(speed, 'to_native_units'):
+        return abs(speed.to_native_units(motor))
+    return abs(speed) / 100.0 * motor.max_speed
+
+
+# 가속이 끝난 뒤 모터 속도 읽기가 명령 속도에 자리 잡을 때까지 더 기다리는 시간 (초)
+SPINUP_MARGIN_S = 0.2
+
+
+def spinup_time(ramp_ms):
+    """0 에서 최고 속도까지 ramp_ms 만큼 가속하는 모터가 닿음을 볼 수 있게 되는 시간 (초)"""
+    return ramp_ms / 1000.0 + SPINUP_MARGIN_S
+
+
+class AdaptiveGrasp(object):
+    """모터 속도/멈춤으로 물체에 닿은 것을 감지해 모터마다 느린 조임으로 바꿉니다.
+
+    모터마다 closing -> squeezing -> holding 순서로 진행합니다.
+    - closing: 빠른 속도로 닫는 중. 멈춤(stall)이거나, 출발 후 spinup_s 가 지났고
+      목표까지 slow_zone_deg 넘게 남았는데 속도가 명령 속도의 contact_ratio 아래로
+      떨어지면 닿은 것으로 봅니다. 닿지 않고 목표에 도착하면 done 입니다.
+      가속(ramp) 중에는 원래 느리므로 spinup_s 는 가속 시간에 SPINUP_MARGIN_S 를
+      더한 값으로 줍니다. (spinup_time)
+    - squeezing: hold_speed 로 squeeze_deg 만큼 더 조입니다.
+    - holding: 멈춰서 그 자리를 버팁니다 (stop_action hold).
+    모든 모터가 holding 또는 done 이 되면 하나라도 닿았으면 GRIPPED, 아니면 DONE 입니다.
+    """
+
+    CLOSING, SQUEEZING, HOLDING, FINISHED = range(4)
+
+    def __init__(self, hold_speed=5, squeeze_deg=10, contact_ratio=0.4, spinup_s=SPINUP_MARGIN_S,
+                 slow_zone_deg=40):
+        self.hold_speed = hold_speed
+        self.squeeze_deg = squeeze_deg
+        self.contact_ratio = contact_ratio
+        self.spinup_s = spinup_s
+        self.slow_zone_deg = slow_zone_deg
+        self.phases = []
+        self.contacts = []  # 모터별로 닿은 시각 (안 닿았으면 None)
+
+    def begin(self, handle, now, positions=None):
+        """동작을 시작합니다. positions 는 명령 직전 모터 위치입니다. (없으면 읽음)"""
+        self.started = now
+        self.phases = [self.CLOSING] * len(handle.commands)
+        self.contacts = [None] * len(handle.commands)
+        self.targets = []
+        self.directions = []
+        self.min_speeds = []
+        if positions is None:
+            positions = [command.motor.position for command in handle.commands]
+        for command, position in zip(handle.commands, positions):
+            motor = command.motor
+            if command.method == 'on_for_degrees':
+                target = position + command.target
+            else:
+                target = command.target
+            self.targets.append(target)
+            self.directions.append(1 if target >= position else -1)
+            self.min_speeds.append(native_speed(motor, command.speed) * self.contact_ratio)
+
+    def poll(self, handle, now):
+        phases = self.phases
+        spun_up = now - self.started >= self.spinup_s
+        for i, motor in enumerate(handle.motors):
+            phase = phases[i]
+            if phase == self.CLOSING:
+                if motor.is_stalled or (
+                        spun_up and abs(motor.speed) < self.min_speeds[i] and
+                        abs(self.targets[i] - motor.position) > self.slow_zone_deg):
+                    self.contacts[i] = now
+                    motor.on_for_degrees(self.hold_speed, self.directions[i] * self.squeeze_deg,
+                                         brake=True, block=False)
+                    phases[i] = self.SQUEEZING
+                elif not motor.is_running:
+                    phases[i] = self.FINISHED
+            elif phase == self.SQUEEZING:
+                if motor.is_stalled or not motor.is_running:
+                    motor.stop()
+                    phases[i] = self.HOLDING
+        if self.CLOSING in phases or self.SQUEEZING in phases:
+            return RUNNING
+        return GRIPPED if self.HOLDING in phases else DONE
@@ -0,0 +1,160 @@
+"""모터 위치를 매번 읽지 않고, 마지막으로 읽은 위치와 내린 명령으로 예측하는 손가락 상태 모델입니다.
+
+ev3dev2 모터의 position 은 읽을 때마다 sysfs 파일을 읽습니다. FingerOdometry 는 모터마다
+기준 위치(읽었거나 확실히 아는 위치), 그 시각과 오차, 진행 중인 명령(목표, 속도, 가속)을
+두고 지금 위치를 사다리꼴 속도로 예측합니다.
+
+- 오차: 기준 위치의 오차 + 기준 이후 예측한 이동 거리 * speed_error
+  (부하, 가감속, 물체에 닿아 멈춤 때문에 실제 이동이 예측과 다를 수 있는 정도)
+- position() 은 오차가 bound_deg 를 넘을 때만 모터를 읽고 그 값을 새 기준으로 삼습니다.
+  멈춰 있는 모터는 오차가 늘지 않으므로 다시 읽지 않습니다.
+- 동작이 끝나면 MotionEngine 이 finish() 로 알려 줍니다. 끝까지 간 동작(DONE)은 목표
+  위치를 기준으로 삼고, 멈춤/시간초과/취소/버팀은 위치를 모르는 것으로 봅니다. 한 모터만
+  멈춰도 동작이 끝나므로 나머지 모터는 아무도 지켜보지 않은 채 돌 수 있습니다. 그런
+  모터는 언제 멈췄을지 모르므로 오차를 예측 이동 거리 전부로 보고, 읽을 때마다 아직
+  도는지(멈춤이 아닌지)도 읽습니다. AdaptiveGrasp 로 잡을 때도 물체에 닿으면 바로 느려지므로
+  오차를 같은 방식으로 봅니다.
+- reset() 은 reset_motor_positions() 뒤에 모든 모터를 0도로 둡니다.
+
+    python3 -m robot_hand.bench_odometry      # 예측 오차와 줄어든 위치 읽기
+"""
+
+from time import time
+
+from robot_hand.motion import DONE, native_speed
+
+# 위치를 모를 때의 오차
+UNKNOWN = float('inf')
+
+# 모터가 목표에 도착했다고 알릴 때 남아 있을 수 있는 오차 (도)
+ARRIVAL_DEG = 1.0
+
+# 명령에 ramp 가 없을 때 쓰는 가속 (deg/s^2, EV3 큰 모터의 기본 가속과 비슷한 값)
+DEFAULT_ACCEL = 6000.0
+
+
+def travel(elapsed, speed, accel):
+    """정지에서 출발해 accel 로 speed 까지 가속하며 elapsed 초 동안 간 거리입니다."""
+    if elapsed <= 0 or speed <= 0:
+        return 0.0
+    ramp = speed / accel
+    if elapsed < ramp:
+        return accel * elapsed * elapsed / 2.0
+    return speed * (elapsed - ramp / 2.0)
+
+
+class MotorTrack(object):
+    """모터 하나의 기준 위치와 진행 중인 명령입니다."""
+
+    __slots__ = ('position', 'time', 'error', 'target', 'speed', 'accel', 'started',
+                 'relative', 'watched', 'contact')
+
+    def __init__(self):
+        self.position = 0.0    # 기준 위치
+        self.time = 0.0        # 기준 시각
+        self.error = UNKNOWN   # 기준 위치의 오차
+        self.target = None     # 움직이는 중이면 목표 위치
+        self.speed = 0.0       # 명령 속도 (deg/s)
+        self.accel = DEFAULT_ACCEL
+        self.started = 0.0     # 명령 시각
+        self.relative = False  # on_for_degrees 처럼 출발 위치에 따라 목표가 정해지는 명령
+        self.watched = True    # 모션 엔진이 끝날 때를 지켜보는 명령인지
+        self.contact = False   # 물체에 닿아 언제든 멈출 수 있는 명령인지
+
+    def predict(self, now, speed_error):
+        """(예측 위치, 오차) 입니다. 지켜보지 않거나 닿을 수 있는 명령은 이동 거리 전부가 오차입니다."""
+        if self.target is None:
+            return self.position, self.error
+        # 기준 시각 이후에 간 거리 (기준을 움직이는 도중에 잡았으면 그때까지 간 거리는 뺌)
+        moved = (travel(now - self.started, self.speed, self.accel) -
+                 travel(self.time - self.started, self.speed, self.accel))
+        remaining = self.target - self.position
+        if moved >= abs(remaining):
+            moved = abs(remaining)
+        position = self.position + (moved if remaining >= 0 else -moved)
+        if self.contact or not self.watched:
+            speed_error = 1.0
+        return position, self.error + moved * speed_error
+
+
+class FingerOdometry(object):
+    """모터별 MotorTrack 으로 위치를 예측하고, 오차가 bound_deg 를 넘을 때만 읽습니다."""
+
+    def __init__(self, clock=time, bound_deg=5.0, speed_error=0.25):
+        self.clock = clock
+        self.bound_deg = bound_deg
+        self.speed_error = speed_error
+        self.tracks = {}
+        self.reads = 0        # 모터를 실제로 읽은 횟수
+        self.predictions = 0  # 읽지 않고 예측으로 답한 횟수
+
+    def track(self, motor):
+        track = self.tracks.get(motor)
+        if track is None:
+            track = self.tracks[motor] = MotorTrack()
+        return track
+
+    def position(self, motor, now=None):
+        """motor 의 지금 위치(도)입니다. 예측 오차가 bound_deg 를 넘으면 읽습니다."""
+        now = self.clock() if now is None else now
+        track = self.track(motor)
+        position, error = track.predict(now, self.speed_error)
+        if error <= self.bound_deg:
+            self.predictions += 1
+            return int(round(position))
+        self.reads += 1
+        position = motor.position
+        track.position, track.time, track.error = float(position), now, 0.0
+        if track.target is not None and not track.watched:
+            if motor.is_stalled or not motor.is_running:
+                track.target = None
+        return position
+
+    def error(self, motor, now=None):
+        """motor 위치 예측의 지금 오차(도)입니다."""
+        now = self.clock() if now is None else now
+        return self.track(motor).predict(now, self.speed_error)[1]
+
+    def moving(self, motor):
+        return self.track(motor).target is not None
+
+    def command(self, motor, method, speed, target, ramp=None, now=None, contact=False):
+        """모터에 명령을 내렸음을 기록합니다. (MotionEngine.start 가 부름)
+
+        contact 는 물체에 닿으면 멈추거나 느려지는 명령입니다. (AdaptiveGrasp)
+        """
+        now = self.clock() if now is None else now
+        track = self.track(motor)
+        start, error = track.predict(now, self.speed_error)
+        if method == 'on_for_degrees':
+            # ev3dev2 처럼 속도가 음수면 반대 방향으로 돕니다.
+            signed = speed.to_native_units(motor) if hasattr(speed, 'to_native_units') else speed
+            target = start + (-target if signed < 0 else target)
+        track.position, track.time, track.error = start, now, error
+        track.target = float(target)
+        track.speed = native_speed(motor, speed)
+        track.accel = motor.max_speed * 1000.0 / ramp if ramp else DEFAULT_ACCEL
+        track.started = now
+        track.relative = method == 'on_for_degrees'
+        track.watched = True
+        track.contact = contact
+
+    def finish(self, motor, status, now=None):
+        """동작이 끝났음을 기록합니다. DONE 이면 목표 위치에 있다고 봅니다."""
+        now = self.clock() if now is None else now
+        track = self.track(motor)
+        if track.target is None:
+            return
+        if status == DONE:
+            track.error = (track.error if track.relative else 0.0) + ARRIVAL_DEG
+            track.position, track.time, track.target = track.target, now, None
+        else:
+            track.error = UNKNOWN
+            track.watched = False
+
+    def reset(self, motors, now=None):
+        """motors 의 지금 위치를 0도로 다시 잡았음을 기록합니다."""
+        now = self.clock() if now is None else now
+        for motor in motors:
+            track = self.track(motor)
+            track.position, track.time, track.error, track.target = 0.0, now, 0.0, None
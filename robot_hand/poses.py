@@ -0,0 +1,82 @@
+"""이름 붙인 잡기 자세(pose) 라이브러리와, 물체가 다가온 모습으로 자세를 고르는 규칙입니다.
+
+잡기는 원래 손가락 grasp_degrees, 엄지 thumb_degrees 하나뿐이었습니다. POSE_TABLE 의
+한 줄은 자세 하나이며 모터마다 잡는 각도의 비율과 속도(%)를 적습니다.
+
+- POWER:    세 모터를 모두 끝까지 (기존 잡기와 같음)
+- PINCH:    첫째 손가락과 엄지로만 집음 (둘째 손가락은 움직이지 않음)
+- CYLINDER: 굵은 물체를 감싸도록 손가락과 엄지를 덜 닫음
+
+비율은 HandConfig 의 grasp_degrees / thumb_degrees 에 곱하므로 엄지 방향처럼 손마다 다른
+부호와 크기는 설정을 따릅니다. 속도가 None 이면 설정의 grasp_speed / thumb_speed 입니다.
+resolve_poses() 가 시작할 때 모든 자세를 (모터 이름, 각도, 속도) 로 풀어 두고, 제어기는
+처음 잡을 때 자세마다 모터 명령을 한꺼번에 만들어 두므로 잡을 때는 딕셔너리를 한 번
+찾을 뿐입니다. (HandController.grasp_commands)
+
+자세는 다음 순서로 정합니다.
+
+1. 손날 제스처로 고른 자세 (triggers.SideGestures 의 poses, 다음 잡기 한 번에만 씀)
+2. 잡기를 요청한 트리거가 고른 자세 (UltrasonicDwell 에 rules 를 주면 choose_pose)
+3. HandConfig 의 grasp_pose
+"""
+
+from collections import namedtuple
+
+from robot_hand.devices import MOTORS
+
+POWER = 'power'
+PINCH = 'pinch'
+CYLINDER = 'cylinder'
+
+INF = float('inf')
+
+# degrees: MOTORS 순서 (finger1, finger2, thumb) 로 잡는 각도에 곱할 비율 (0 이면 움직이지 않음)
+# speeds: 같은 순서의 속도 (%, None 이면 설정값)
+GraspPose = namedtuple('GraspPose', 'name degrees speeds')
+
+POSE_TABLE = (
+    #          이름       finger1 finger2 thumb    finger1 finger2 thumb (%)
+    GraspPose(POWER,    (1.0,   1.0,    1.0),   (None,  None,   None)),
+    GraspPose(PINCH,    (0.6,   0.0,    1.0),   (10,    10,     10)),
+    GraspPose(CYLINDER, (0.8,   0.8,    0.6),   (20,    20,     10)),
+)
+
+# 초음파로 잡을 때 자세를 고르는 규칙: 물체가 멈춘 거리(cm)와 다가온 평균 속도(cm/s)가
+# 모두 이하인 첫 줄의 자세를 씁니다.
+PoseRule = namedtuple('PoseRule', 'pose max_distance_cm max_speed_cm_s')
+
+POSE_RULES = (
+    PoseRule(PINCH, 2.5, 15.0),     # 천천히 손바닥 가까이: 작은 물체를 조심스럽게 건넴
+    PoseRule(CYLINDER, INF, 15.0),  # 천천히 왔지만 멀리서 멈춤: 굵은 물체
+    PoseRule(POWER, INF, INF),
+)
+
+
+def choose_pose(rules, distance_cm, speed_cm_s):
+    """rules 에서 distance_cm, speed_cm_s 에 맞는 첫 자세 이름입니다. (없으면 None)"""
+    for rule in rules:
+        if distance_cm <= rule.max_distance_cm and speed_cm_s <= rule.max_speed_cm_s:
+            return rule.pose
+    return None
+
+
+def resolve_poses(config, table=POSE_TABLE):
+    """자세 이름 -> ((모터 이름, 각도, 속도), ...) 딕셔너리를 만듭니다.
+
+    움직이지 않는 모터는 빼고, config 의 grasp_pose 가 table 에 없으면 ValueError 입니다.
+    """
+    limits = {'finger1': (config.grasp_degrees, config.grasp_speed),
+              'finger2': (config.grasp_degrees, config.grasp_speed),
+              'thumb': (config.thumb_degrees, config.thumb_speed)}
+    poses = {}
+    for pose in table:
+        moves = []
+        for role, fraction, speed in zip(MOTORS, pose.degrees, pose.speeds):
+            degrees, default_speed = limits[role]
+            degrees = int(round(degrees * fraction))
+            if degrees:
+                moves.append((role, degrees, default_speed if speed is None else speed))
+        poses[pose.name] = tuple(moves)
+    if config.grasp_pose not in poses:
+        raise ValueError('알 수 없는 잡기 자세입니다: %s' % config.grasp_pose)
+    return poses
@@ -0,0 +1,63 @@
+"""세 모터가 함께 출발해서 함께 도착하도록 사다리꼴 속도 프로파일을 계획합니다.
+
+손가락은 -400도를 15%로, 엄지는 200도를 5%로 따로 움직이면 잡기는 가장 느린
+엄지가 끝날 때까지 걸립니다. 여기서는 이동 거리가 가장 긴(가장 오래 걸리는)
+모터를 안전 최고 속도 speed 와 가속 accel 로 움직일 때의 시간 T 를 구하고,
+나머지 모터는 같은 가속 시간과 같은 T 에 맞춰 속도와 가속을 거리 비율로
+줄입니다. 그래서 모든 모터가 같은 순간에 가속을 마치고, 감속을 시작하고, 멈춥니다.
+
+EV3 모터 펌웨어는 ramp_up_sp / ramp_down_sp (0 에서 최고 속도까지 걸리는 ms)
+로 직선 가감속만 지원하므로 S 커브 대신 사다리꼴 프로파일을 씁니다.
+"""
+
+import math
+
+from robot_hand.motion import MotorCommand
+
+
+def trapezoid_time(distance, speed, accel):
+    """distance 를 최고 속도 speed, 가속 accel 로 움직이는 데 걸리는 시간(초)입니다."""
+    distance = abs(distance)
+    if distance == 0:
+        return 0.0
+    if distance >= speed * speed / accel:
+        return distance / speed + speed / accel
+    return 2.0 * math.sqrt(distance / accel)  # 최고 속도에 닿기 전에 감속하는 삼각형
+
+
+def plan_synchronized(distances, speed, accel):
+    """모든 이동이 같은 시간에 끝나는 (T, 가속 시간, [모터별 최고 속도]) 를 반환합니다.
+
+    speed (deg/s) 와 accel (deg/s^2) 은 모든 모터에 대한 안전 한계입니다.
+    """
+    longest = max(abs(d) for d in distances)
+    if longest == 0:
+        return 0.0, 0.0, [0.0] * len(distances)
+    total = trapezoid_time(longest, speed, accel)
+    if longest >= speed * speed / accel:
+        ramp = speed / accel
+    else:
+        ramp = total / 2.0
+    # 사다리꼴 넓이 = v * (T - ramp) 이므로 거리마다 v 를 맞춥니다.
+    return total, ramp, [abs(d) / (total - ramp) for d in distances]
+
+
+def synchronized_commands(moves, speed_pct, ramp_ms, max_speed=1050):
+    """(모터, method, target, distance) 목록을 동기화된 MotorCommand 목록으로 바꿉니다.
+
+    speed_pct 는 안전 최고 속도(%), ramp_ms 는 0 에서 최고 속도(100%)까지의
+    가속 시간입니다. 반환하는 명령의 speed 는 %, ramp 는 모터에 쓸 ramp_*_sp (ms) 입니다.
+    ramp_ms 가 0 이면 모터 펌웨어처럼 가감속 없이 바로 그 속도로 도는 것으로 계획합니다.
+    """
+    speed = speed_pct / 100.0 * max_speed
+    accel = max_speed / (ramp_ms / 1000.0) if ramp_ms > 0 else float('inf')
+    _, ramp, speeds = plan_synchronized([move[3] for move in moves], speed, accel)
+    commands = []
+    for (motor, method, target, _), v in zip(moves, speeds):
+        if v <= 0:
+            commands.append(MotorCommand(motor, method, speed_pct, target, None))
+            continue
+        # 이 모터가 ramp 초 만에 v 에 닿도록 0->100% 기준 시간으로 바꿉니다.
+        commands.append(MotorCommand(motor, method, v / max_speed * 100.0, target,
+                                     int(round(ramp * max_speed / v * 1000.0))))
+    return commands
@@ -0,0 +1,339 @@
+"""캡처한 센서 세션을 여러 제어기 설정으로 최대 속도로 다시 돌려 판단을 비교합니다.
+
+로봇에서 HandConfig(capture_path=...) (robort_hand_new_version.py 의 CAPTURE_PATH) 로
+남긴 세션 파일을 가상 시계 위에서 재생합니다. 센서는 기록된 값을 시각대로 돌려주고
+(다음 기록까지 같은 값 유지) 모터는 시뮬레이터 모터(빈 손)로 움직이므로, 제어기는
+로봇에서 돌 때와 같은 코드로 판단하고 실제 시간을 기다리지 않습니다.
+
+기다리지 않을 뿐 센서는 로봇에서처럼 주기마다 모두 읽습니다. 자이로 드리프트 추정과
+누르고 있는 시간 같은 조건이 읽은 횟수와 시각에 따라 달라지므로, 기록 사이의 빈 시간을
+건너뛰면 로봇과 다르게 판단할 수 있기 때문입니다. 그래서 재생 시간은 기록 길이에
+비례하며 설정 하나에 실제 시간의 100~300 배쯤입니다. (터치 감시 주기가 짧은
+new_version 이 가장 느림. 하루치 기록이면 설정마다 5~15 분) 표의 speed 열이 이
+배율입니다.
+
+기준 설정(--base)과 비교할 설정(--variant)마다 세션의 잡기/놓기/리셋 판단을
+시각 순서대로 짝지어서 같음, 시각이 바뀜, 빠짐, 더 생김을 보고합니다.
+
+설정은 'PRESET' 또는 'PRESET:키=값,키=값' 으로 적습니다. 키가 HandConfig 설정이면
+설정을 바꾸고, '트리거이름.속성' 이면 그 트리거의 속성을 바꿉니다.
+
+    python3 -m robot_hand.replay sessions/*.rhss --variant new_version:ultrasonic.duration_s=1.5 \\
+        --variant new_version:gyro_rate_swing.detector.count_target=3,grasp_settle_s=0.5
+    python3 -m robot_hand.replay sessions/*.rhss --base demo3 \\
+        --variant demo3:gyro_swing.threshold=60 --variant demo3:side_touch.click_max_s=1.0
+    python3 -m robot_hand.replay --simulate sessions/ --sessions 20   # 시뮬레이터로 세션 만들기
+"""
+
+import argparse
+import ast
+import glob
+import os
+import random
+import time as real_time
+from collections import namedtuple
+
+from robot_hand.capture import read_sessions
+from robot_hand.clock import TimeLimitReached
+from robot_hand.controller import PRESETS, HandController
+from robot_hand.scenarios import PALM, SIDE, Scenario
+from robot_hand.sim import SimWorld, run_controller
+
+ReplayResult = namedtuple('ReplayResult', 'session decisions sim_time wall_time')
+
+# 판단 비교 결과: 종류('same', 'shifted', 'missing', 'extra'), 기준 판단, 비교 판단
+Difference = namedtuple('Difference', 'kind base other')
+
+
+# ==========================================
+# 재생 장치
+# ==========================================
+class ReplayStream(object):
+    """기록된 (시각, 값) 을 시계에 맞춰 돌려줍니다. 시각은 앞으로만 흐른다고 봅니다."""
+
+    def __init__(self, clock, times, values, default):
+        self.clock = clock
+        self.times = times
+        self.values = values
+        self.index = -1
+        self.default = values[0] if values else default
+
+    def value(self):
+        now = self.clock.now
+        times = self.times
+        i = self.index
+        while i + 1 < len(times) and times[i + 1] <= now:
+            i += 1
+        self.index = i
+        return self.values[i] if i >= 0 else self.default
+
+
+class ReplayUltrasonicSensor(object):
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    @property
+    def distance_centimeters(self):
+        return self.stream.value()
+
+
+class ReplayTouchSensor(object):
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    @property
+    def is_pressed(self):
+        return self.stream.value()
+
+
+class ReplayGyroSensor(object):
+    """기록된 각도는 끊기지 않으므로 reset() 은 지금 각도를 0도로 삼기만 합니다."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._zero = 0
+
+    @property
+    def angle_and_rate(self):
+        angle, rate = self.stream.value()
+        return angle - self._zero, rate
+
+    @property
+    def angle(self):
+        return self.angle_and_rate[0]
+
+    @property
+    def rate(self):
+        return self.angle_and_rate[1]
+
+    def reset(self):
+        self._zero = self.stream.value()[0]
+
+
+def replay_devices(world, session):
+    """모터는 world 의 시뮬레이터 모터, 센서는 session 기록을 돌려주는 장치 묶음입니다."""
+    devices = world.hand_devices()
+    clock = world.clock
+    streams = session.streams
+
+    def stream(name, default):
+        times, values = streams.get(name, ([], []))
+        return ReplayStream(clock, times, values, default)
+
+    devices.ultrasonic = ReplayUltrasonicSensor(stream('ultrasonic', 255.0))
+    devices.palm_touch = ReplayTouchSensor(stream('palm_touch', False))
+    devices.side_touch = ReplayTouchSensor(stream('side_touch', False))
+    devices.gyro = ReplayGyroSensor(stream('gyro', (0, 0)))
+    return devices
+
+
+def replay(session, make, tail_s=1.0):
+    """session 을 make(devices, clock) 로 만든 제어기로 재생하고 ReplayResult 를 반환합니다."""
+    scenario = Scenario(session.name, session.duration + tail_s)
+    scenario.object_fraction = None  # 물체 크기는 기록되지 않으므로 빈 손으로 움직입니다.
+    world = SimWorld(scenario, noise=False)
+    controller = make(replay_devices(world, session), world.clock)
+    start = real_time.perf_counter()
+    try:
+        controller.run()
+    except TimeLimitReached:
+        pass
+    wall = real_time.perf_counter() - start
+    return ReplayResult(session, list(controller.history), world.clock.now, wall)
+
+
+# ==========================================
+# 비교할 설정
+# ==========================================
+def parse_value(text):
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+def parse_variant(spec):
+    """'PRESET:키=값,...' 을 (이름, 설정 딕셔너리) 로 나눕니다."""
+    preset, _, rest = spec.partition(':')
+    if preset not in PRESETS:
+        raise ValueError('알 수 없는 프리셋입니다: %s' % preset)
+    settings = {}
+    for item in filter(None, rest.split(',')):
+        key, sep, value = item.partition('=')
+        if not sep:
+            raise ValueError('키=값 형식이 아닙니다: %s' % item)
+        settings[key.strip()] = parse_value(value.strip())
+    return preset, settings
+
+
+def variant_factory(spec):
+    """spec 설정으로 제어기를 만드는 make(devices, clock) 를 반환합니다."""
+    preset, settings = parse_variant(spec)
+    config_settings = dict((k, v) for k, v in settings.items() if '.' not in k)
+    trigger_settings = [(k.split('.'), v) for k, v in settings.items() if '.' in k]
+    # 잘못 적은 키는 세션을 돌리기 전에 알려 줍니다.
+    build(preset, config_settings, trigger_settings)
+
+    def make(devices, clock):
+        config, triggers = build(preset, config_settings, trigger_settings)
+        return HandController(config, triggers, devices, clock)
+    make.__name__ = spec
+    return make
+
+
+def build(preset, config_settings, trigger_settings):
+    config, triggers = PRESETS[preset]()
+    config = config.replace(**config_settings)
+    by_name = dict((trigger.name, trigger) for trigger in triggers)
+    for path, value in trigger_settings:
+        if path[0] not in by_name:
+            raise ValueError('%s 프리셋에 %s 트리거가 없습니다 (%s)' % (
+                preset, path[0], ', '.join(sorted(by_name))))
+        target = by_name[path[0]]
+        for name in path[1:-1]:
+            if not hasattr(target, name):
+                raise ValueError('%s 에 %s 속성이 없습니다' % (path[0], '.'.join(path[1:])))
+            target = getattr(target, name)
+        if not hasattr(target, path[-1]):
+            raise ValueError('%s 에 %s 속성이 없습니다' % (path[0], '.'.join(path[1:])))
+        setattr(target, path[-1], value)
+    return config, triggers
+
+
+# ==========================================
+# 판단 비교
+# ==========================================
+def diff_decisions(base, other, tolerance=0.05, window=2.0):
+    """두 판단 목록 [(시각, 동작, 트리거)] 을 시각 순서대로 짝지어 Difference 목록을 반환합니다.
+
+    같은 동작이 window 초 안에 있으면 짝으로 보고, 시각 차이가 tolerance 초 이하면
+    'same', 넘으면 'shifted' 입니다. 짝이 없으면 'missing' (기준에만) 또는 'extra' 입니다.
+    """
+    result = []
+    j = 0
+    for entry in base:
+        k = j
+        while k < len(other) and other[k][0] < entry[0] - window:
+            k += 1
+        match = None
+        for n in range(k, len(other)):
+            if other[n][0] > entry[0] + window:
+                break
+            if other[n][1] == entry[1]:
+                match = n
+                break
+        if match is None:
+            result.append(Difference('missing', entry, None))
+            continue
+        for n in range(j, match):
+            result.append(Difference('extra', None, other[n]))
+        kind = 'same' if abs(other[match][0] - entry[0]) <= tolerance else 'shifted'
+        result.append(Difference(kind, entry, other[match]))
+        j = match + 1
+    for n in range(j, len(other)):
+        result.append(Difference('extra', None, other[n]))
+    return result
+
+
+# ==========================================
+# 시뮬레이터 세션
+# ==========================================
+def simulate_sessions(directory, count, rng, preset='new_version'):
+    """무작위 시나리오를 preset 으로 돌리며 캡처한 세션 파일 경로 목록을 반환합니다."""
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    paths = []
+    for i in range(count):
+        scenario = Scenario('session', 60.0)
+        t = 2.0
+        while t < 50.0:
+            if rng.random() < 0.5:
+                scenario.approach(at=t, hold=rng.uniform(1.0, 4.0))
+            else:
+                scenario.press(PALM, t, rng.uniform(0.05, 1.0))
+            t += rng.uniform(4.0, 6.0)
+            if rng.random() < 0.6:
+                scenario.swing(at=t, count=rng.choice((1, 2, 2, 3)),
+                               amplitude=rng.uniform(40, 140), period=rng.uniform(1.0, 2.5))
+            else:
+                scenario.press(SIDE, t, rng.uniform(0.05, 3.5))
+            t += rng.uniform(6.0, 10.0)
+        path = os.path.join(directory, 'sim_%03d.rhss' % i)
+        if os.path.exists(path):
+            os.remove(path)
+        config, triggers = PRESETS[preset]()
+        config = config.replace(capture_path=path)
+        run_controller(lambda devices, clock: HandController(config, triggers, devices, clock),
+                       scenario, seed=rng.randrange(1 << 30))
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('sessions', nargs='*', help='세션 파일 (*.rhss) 또는 폴더')
+    parser.add_argument('--base', default='new_version', help='기준 설정')
+    parser.add_argument('--variant', action='append', default=[], help='비교할 설정')
+    parser.add_argument('--tolerance', type=float, default=0.05,
+                        help='같은 판단으로 볼 시각 차이 (초)')
+    parser.add_argument('--simulate', metavar='DIR', help='시뮬레이터로 세션을 만들어 DIR 에 저장')
+    parser.add_argument('--sessions', dest='count', type=int, default=10,
+                        help='--simulate 로 만들 세션 수')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('-v', '--verbose', action='store_true', help='다른 판단을 모두 출력')
+    args = parser.parse_args(argv)
+
+    # 잘못 적은 프리셋, 설정 키, 트리거 속성은 세션을 읽기 전에 알려 줍니다.
+    try:
+        makes = [variant_factory(spec) for spec in [args.base] + args.variant]
+    except (TypeError, ValueError) as e:
+        parser.error(str(e))
+
+    paths = []
+    if args.simulate:
+        paths.extend(simulate_sessions(args.simulate, args.count, random.Random(args.seed),
+                                       parse_variant(args.base)[0]))
+    for path in args.sessions:
+        if os.path.isdir(path):
+            paths.extend(sorted(glob.glob(os.path.join(path, '*.rhss'))))
+        else:
+            paths.append(path)
+    if not paths:
+        parser.error('세션 파일이 없습니다')
+
+    sessions = [session for path in paths for session in read_sessions(path)]
+    recorded = sum(session.duration for session in sessions)
+    print('%d sessions, %.1f min recorded' % (len(sessions), recorded / 60.0))
+
+    results = [[replay(session, make) for session in sessions] for make in makes]
+    print('%-40s %6s %7s %6s %7s %6s %6s %8s' % (
+        'variant', 'grasp', 'release', 'same', 'shifted', 'miss', 'extra', 'speed'))
+    for make, runs in zip(makes, results):
+        diffs = [diff_decisions(base.decisions, run.decisions, args.tolerance)
+                 for base, run in zip(results[0], runs)]
+        kinds = [diff.kind for session_diffs in diffs for diff in session_diffs]
+        actions = [entry[1] for run in runs for entry in run.decisions]
+        wall = sum(run.wall_time for run in runs)
+        print('%-40s %6d %7d %6d %7d %6d %6d %7.0fx' % (
+            make.__name__, actions.count('grasp'), actions.count('release'),
+            kinds.count('same'), kinds.count('shifted'), kinds.count('missing'),
+            kinds.count('extra'), recorded / max(wall, 1e-9)))
+        if args.verbose and make is not makes[0]:
+            for session, session_diffs in zip(sessions, diffs):
+                for diff in session_diffs:
+                    if diff.kind != 'same':
+                        print('    %-12s %-8s %s -> %s' % (
+                            session.name, diff.kind, format_decision(diff.base),
+                            format_decision(diff.other)))
+
+
+def format_decision(entry):
+    if entry is None:
+        return '-'
+    return '%.2f %s (%s)' % entry
+
+
+if __name__ == '__main__':
+    main()
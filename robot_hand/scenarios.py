@@ -0,0 +1,139 @@
+"""시뮬레이터에 넣을 입력 시나리오입니다.
+
+시나리오는 시간에 따른 물체 거리, 팔(자이로) 각도, 터치 센서 입력을 정의합니다.
+approach(), swing(), tilt(), press() 로 동작을 이어 붙여 만들고, 각 동작의 기준 시각은
+marks 에 (시각, 이름) 으로 남겨 지연 시간 측정에 씁니다.
+"""
+
+import math
+
+PALM = 'palm_touch'
+SIDE = 'side_touch'
+
+
+class Scenario(object):
+    """시간 t(초)에서의 센서 입력을 계산합니다."""
+
+    def __init__(self, name, duration, background_cm=100.0):
+        self.name = name
+        self.duration = duration
+        self.background_cm = background_cm
+        self.segments = []   # 물체 거리: (시작, 끝, 시작 거리, 끝 거리)
+        self.swings = []     # 팔 흔들기: (시작, 주기, 진폭, 횟수)
+        self.tilts = []      # 한쪽으로 기울였다 돌아오기: (시작, 걸린 시간, 각도)
+        self.presses = {PALM: [], SIDE: []}  # (누른 시각, 뗀 시각)
+        self.marks = []      # (시각, 이름)
+        self.object_fraction = 0.7  # 물체가 있을 때 손가락이 닿는 위치 (잡기 구간 비율, None 이면 빈 손)
+
+    # --- 시나리오 만들기 ---
+    def approach(self, at, near_cm=3.0, speed_cm_s=20.0, hold=4.0, far_cm=None):
+        """at 초부터 물체가 speed 로 다가와 near_cm 에서 hold 초 머문 뒤 멀어집니다."""
+        far = self.background_cm if far_cm is None else far_cm
+        travel = (far - near_cm) / float(speed_cm_s)
+        arrive = at + travel
+        self.segments.append((at, arrive, far, near_cm))
+        self.segments.append((arrive, arrive + hold, near_cm, near_cm))
+        self.segments.append((arrive + hold, arrive + hold + travel, near_cm, far))
+        self.marks.append((arrive, 'object_arrived'))
+        self.marks.append((arrive + hold, 'object_leaving'))
+        return self
+
+    def swing(self, at, count=2, amplitude=120.0, period=2.0):
+        """at 초부터 팔을 amplitude 도로 count 번 왕복합니다."""
+        self.swings.append((at, period, amplitude, count))
+        self.marks.append((at, 'swing_start'))
+        for i in range(1, count + 1):
+            self.marks.append((at + period * i, 'swing_%d' % i))
+        self.marks.append((at + period * count, 'swing_done'))
+        return self
+
+    def tilt(self, at, angle=90.0, duration=2.0):
+        """at 초부터 팔을 한쪽으로 angle 도 기울였다가 duration 초 뒤 제자리로 돌아옵니다."""
+        self.tilts.append((at, duration, angle))
+        self.marks.append((at, 'tilt_start'))
+        self.marks.append((at + duration, 'tilt_done'))
+        return self
+
+    def press(self, sensor, at, duration):
+        self.presses[sensor].append((at, at + duration))
+        self.marks.append((at, sensor + '_press'))
+        self.marks.append((at + duration, sensor + '_release'))
+        return self
+
+    # --- 시각 t 에서의 값 ---
+    def distance(self, t):
+        for start, end, d0, d1 in self.segments:
+            if start <= t < end:
+                return d0 + (d1 - d0) * (t - start) / (end - start)
+        return self.background_cm
+
+    def angle(self, t):
+        angle = 0.0
+        for start, period, amplitude, count in self.swings:
+            if start <= t < start + period * count:
+                angle += amplitude * math.sin(2 * math.pi * (t - start) / period)
+        for start, duration, tilt in self.tilts:
+            if start <= t < start + duration:
+                angle += tilt * (1 - math.cos(2 * math.pi * (t - start) / duration)) / 2
+        return angle
+
+    def rate(self, t):
+        rate = 0.0
+        for start, period, amplitude, count in self.swings:
+            if start <= t < start + period * count:
+                w = 2 * math.pi / period
+                rate += amplitude * w * math.cos(w * (t - start))
+        for start, duration, tilt in self.tilts:
+            if start <= t < start + duration:
+                w = 2 * math.pi / duration
+                rate += tilt * w * math.sin(w * (t - start)) / 2
+        return rate
+
+    def pressed(self, sensor, t):
+        for start, end in self.presses[sensor]:
+            if start <= t < end:
+                return True
+        return False
+
+    def object_present(self, t, within_cm=10.0):
+        return self.distance(t) < within_cm or self.pressed(PALM, t)
+
+    def mark(self, name):
+        """name 으로 남긴 첫 기준 시각을 반환합니다."""
+        for t, mark in self.marks:
+            if mark == name:
+                return t
+        return None
+
+
+# ==========================================
+# 기본 시나리오
+# (스크립트들이 시작할 때 자이로 보정으로 2초를 기다리므로 입력은 그 뒤에 시작합니다)
+# ==========================================
+def object_approach():
+    """물체가 다가와 머물다가, 팔을 두 번 흔들어 놓습니다."""
+    return (Scenario('object_approach', 24.0)
+            .approach(at=1.0, hold=7.5)
+            .swing(at=9.0, count=2))
+
+
+def swing_twice():
+    """손바닥 터치로 잡고 팔을 두 번 흔들어 놓습니다."""
+    return (Scenario('swing_twice', 18.0)
+            .press(PALM, at=3.0, duration=2.0)
+            .swing(at=6.25, count=2))
+
+
+def side_long_press():
+    """잡은 뒤 손날 버튼을 짧게 눌러 놓고, 3초 이상 눌러 모터 위치를 리셋합니다."""
+    return (Scenario('side_long_press', 16.0)
+            .press(PALM, at=3.0, duration=0.5)
+            .press(SIDE, at=6.0, duration=0.5)
+            .press(SIDE, at=10.0, duration=3.5))
+
+
+SCENARIOS = {
+    'object_approach': object_approach,
+    'swing_twice': swing_twice,
+    'side_long_press': side_long_press,
+}
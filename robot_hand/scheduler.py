@@ -0,0 +1,154 @@
+"""센서별 샘플링 주기를 갖는 이벤트 기반 스케줄러입니다.
+
+모든 센서를 한 루프에서 읽고 sleep(0.05) 하는 대신, 센서마다 자신의 주기와
+마감 시간(deadline)을 갖는 소스로 등록하고, 읽은 값을 이벤트로 핸들러에
+전달합니다. 길게 누르기 같은 시간 조건은 타이머(call_at/call_later)로 처리합니다.
+add_tick() 으로 등록한 함수는 이벤트를 처리한 뒤 한 번씩 불립니다.
+"""
+
+import heapq
+from collections import namedtuple
+from time import sleep, time
+
+# 센서 소스가 핸들러에 전달하는 이벤트
+# late: 예정 시각보다 deadline 이상 늦게 읽혔는지 여부
+SensorEvent = namedtuple('SensorEvent', 'source value timestamp changed late')
+
+
+class SensorSource(object):
+    """주기적으로 읽히는 센서 하나를 나타냅니다."""
+
+    def __init__(self, name, read, period, deadline=None, only_changes=False):
+        self.name = name
+        self.read = read
+        self.period = period
+        self.deadline = period if deadline is None else deadline
+        self.only_changes = only_changes  # True면 값이 바뀔 때만 이벤트 발생
+        self.value = None
+        self.timestamp = None
+        self.next_due = None
+        self.samples = 0
+        self.missed = 0  # deadline을 넘겨 읽힌 횟수
+
+
+class Timer(object):
+    """call_at/call_later 로 예약된 한 번짜리 작업입니다."""
+
+    __slots__ = ('when', 'callback', 'cancelled')
+
+    def __init__(self, when, callback):
+        self.when = when
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class SensorScheduler(object):
+    """센서 소스와 타이머를 마감 시각 순서대로 실행합니다."""
+
+    def __init__(self, clock=time, sleep=sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self.sources = {}
+        self._handlers = {}
+        self._tick_handlers = []
+        self._heap = []  # (예정 시각, 순번, 소스 또는 타이머)
+        self._seq = 0
+        self._running = False
+
+    # --- 등록 ---
+    def add_source(self, source, delay=0.0):
+        """소스를 등록하고 delay 초 뒤에 첫 샘플을 읽도록 예약합니다."""
+        self.sources[source.name] = source
+        self._handlers.setdefault(source.name, [])
+        self.reschedule(source.name, delay)
+        return source
+
+    def subscribe(self, name, handler):
+        """name 소스의 이벤트를 받을 핸들러를 등록합니다."""
+        self._handlers.setdefault(name, []).append(handler)
+
+    def add_tick(self, handler):
+        """기한이 된 작업을 처리할 때마다 마지막에 handler(now)를 한 번 부릅니다."""
+        self._tick_handlers.append(handler)
+
+    def reschedule(self, name, delay=0.0):
+        """소스의 다음 샘플 시각을 지금부터 delay 초 뒤로 다시 잡습니다."""
+        source = self.sources[name]
+        source.next_due = self.clock() + delay
+        self._push(source.next_due, source)
+
+    def call_at(self, when, callback):
+        """when 시각에 callback(now)을 한 번 호출하고 Timer를 반환합니다."""
+        timer = Timer(when, callback)
+        self._push(when, timer)
+        return timer
+
+    def call_later(self, delay, callback):
+        return self.call_at(self.clock() + delay, callback)
+
+    def _push(self, when, item):
+        self._seq += 1
+        heapq.heappush(self._heap, (when, self._seq, item))
+
+    # --- 실행 ---
+    def run_once(self):
+        """지금까지 기한이 된 작업을 모두 처리하고 다음 예정 시각을 반환합니다."""
+        heap = self._heap
+        now = self.clock()
+        ran = False
+        while heap and heap[0][0] <= now:
+            due, _, item = heapq.heappop(heap)
+            if isinstance(item, Timer):
+                if not item.cancelled:
+                    item.callback(now)
+                    ran = True
+            elif item.next_due == due:  # 다시 예약된 소스의 옛 항목은 건너뜀
+                self._sample(item, due)
+                ran = True
+            now = self.clock()
+        if ran:
+            for handler in self._tick_handlers:
+                handler(now)
+        return heap[0][0] if heap else None
+
+    def _sample(self, source, due):
+        value = source.read()
+        now = self.clock()
+        late = now - due > source.deadline
+        if late:
+            source.missed += 1
+        changed = value != source.value
+        source.value = value
+        source.timestamp = now
+        source.samples += 1
+
+        # 다음 샘플 예약 (밀렸으면 건너뛰고 지금 기준으로 다시 맞춤)
+        next_due = due + source.period
+        if next_due <= now:
+            next_due = now + source.period
+        source.next_due = next_due
+        self._push(next_due, source)
+
+        if changed or not source.only_changes:
+            event = SensorEvent(source.name, value, now, changed, late)
+            for handler in self._handlers[source.name]:
+                handler(event)
+
+    def run(self):
+        """stop()이 호출될 때까지 스케줄을 실행합니다."""
+        self._running = True
+        while self._running:
+            next_time = self.run_once()
+            if not self._running or next_time is None:
+                break
+            delay = next_time - self.clock()
+            if delay > 0:
+                self.sleep(delay)
+        self._running = False
+
+    def stop(self, now=None):
+        """실행 중인 run()을 멈춥니다. 타이머 콜백으로도 쓸 수 있습니다."""
+        self._running = False
@@ -0,0 +1,471 @@
+"""EV3 없이 로봇 핸드 스크립트를 실행하는 시뮬레이터입니다.
+
+ev3dev2 의 LargeMotor, UltrasonicSensor, GyroSensor, TouchSensor, Button 을
+시뮬레이션 장치로 바꿔 끼우고, time.time / time.sleep 과 robot_hand.clock 의
+시계를 가상 시계로 바꿔서 기존 스크립트를 고치지 않고 실제 시간보다 훨씬
+빠르게 돌립니다.
+
+- 모터: 속도/가속(ramp_up_sp, ramp_down_sp) 제한이 있는 위치 이동, 물체에 닿으면 멈춤(stall),
+  도착/멈춤 시각을 기록
+- 초음파 센서: 가우시안 잡음과 가끔 튀는 값(255 cm)
+- 자이로 센서: 시간에 따라 쌓이는 드리프트
+- 터치 센서 / 뒤로 가기 버튼: 시나리오대로 눌림
+
+    python3 -m robot_hand.sim robort_hand_new_version.py --scenario object_approach
+"""
+
+import argparse
+import math
+import random
+import sys
+import time as real_time
+import types
+from collections import namedtuple
+
+from robot_hand.clock import TimeLimitReached, VirtualClock, use_clock
+from robot_hand.scenarios import SCENARIOS
+
+# 스크립트들이 쓰는 기본 포트 배치
+PORTS = {
+    'outA': 'finger1',
+    'outB': 'finger2',
+    'outC': 'thumb',
+    'in1': 'ultrasonic',
+    'in2': 'palm_touch',
+    'in3': 'side_touch',
+    'in4': 'gyro',
+}
+
+# 모터 명령 기록: (시각, 포트, 명령, 값)
+MotorLogEntry = namedtuple('MotorLogEntry', 'time port command value')
+
+
+class SpeedPercent(object):
+
+    def __init__(self, percent):
+        self.percent = percent
+
+    def to_native_units(self, motor):
+        return self.percent / 100.0 * motor.max_speed
+
+
+# ==========================================
+# 시뮬레이션 장치
+# ==========================================
+class SimMotor(object):
+    """속도와 가속 제한을 두고 목표 위치로 움직이는 EV3 큰 모터입니다."""
+
+    max_speed = 1050       # deg/s
+    count_per_rot = 360
+    accel = 6000.0         # deg/s^2
+    step = 0.001           # 적분 간격 (초)
+
+    def __init__(self, world, port):
+        self.world = world
+        self.port = port
+        self._position = 0.0
+        self._speed = 0.0
+        self._target = 0.0
+        self._speed_sp = 0.0
+        self._running = False
+        self._stalled = False
+        self._stall_at = None
+        self._updated = world.clock.now
+        self.stalled_time = 0.0  # 멈춘(stall) 채로 계속 힘을 준 시간 (모터가 물체를 가는 시간)
+        self.ramp_up_sp = 0      # 0 에서 max_speed 까지 걸리는 ms (0 이면 accel 한계만 적용)
+        self.ramp_down_sp = 0
+        world.motors.append(self)
+
+    # --- 동역학 ---
+    def _update(self):
+        now = self.world.clock.now
+        dt = now - self._updated
+        self._updated = now
+        if self._running and self._stalled and dt > 0:
+            self.stalled_time += dt
+        if not self._running or self._stalled or dt <= 0:
+            return
+        direction = 1.0 if self._target >= self._position else -1.0
+        accel_up = self._ramp_accel(self.ramp_up_sp)
+        accel_down = self._ramp_accel(self.ramp_down_sp)
+        t = now - dt
+        while dt > 0:
+            h = min(self.step, dt)
+            dt -= h
+            t += h
+            remaining = abs(self._target - self._position)
+            limit = min(self._speed_sp, math.sqrt(2 * accel_down * remaining))
+            self._speed = min(limit, self._speed + accel_up * h)
+            self._position += direction * self._speed * h
+            if self._stall_at is not None and (self._position - self._stall_at) * direction >= 0:
+                self._position = self._stall_at
+                self._speed = 0.0
+                self._stalled = True
+                self.world.record(self.port, 'stalled', int(round(self._position)), t)
+                return
+            if (self._target - self._position) * direction <= 0.5:
+                self._position = self._target
+                self._speed = 0.0
+                self._running = False
+                self.world.record(self.port, 'arrived', int(round(self._position)), t)
+                return
+
+    def _ramp_accel(self, ramp_ms):
+        if ramp_ms > 0:
+            return min(self.accel, self.max_speed * 1000.0 / ramp_ms)
+        return self.accel
+
+    def _start(self, command, target, speed_sp):
+        self._update()
+        self._target = float(target)
+        self._speed_sp = min(abs(speed_sp), self.max_speed)
+        self._running = True
+        self._stalled = False
+        self._stall_at = None
+        # 손이 닫히는 쪽(0 에서 멀어지는 쪽)으로 움직일 때 물체가 있으면 중간에 닿습니다.
+        scenario = self.world.scenario
+        if (scenario.object_fraction is not None and abs(target) > abs(self._position) and
+                scenario.object_present(self.world.clock.now)):
+            self._stall_at = self._position + scenario.object_fraction * (target - self._position)
+        self.world.record(self.port, command, target)
+
+    def _native(self, speed):
+        if hasattr(speed, 'to_native_units'):
+            return speed.to_native_units(self)
+        return speed / 100.0 * self.max_speed
+
+    # --- ev3dev2 와 같은 인터페이스 ---
+    @property
+    def position(self):
+        self._update()
+        return int(round(self._position))
+
+    @property
+    def speed(self):
+        self._update()
+        return int(round(self._speed if self._target >= self._position else -self._speed))
+
+    @property
+    def state(self):
+        self._update()
+        if self._stalled:
+            return ['running', 'stalled']
+        return ['running'] if self._running else ['holding']
+
+    @property
+    def is_running(self):
+        self._update()
+        return self._running
+
+    @property
+    def is_stalled(self):
+        self._update()
+        return self._stalled
+
+    def on_for_degrees(self, speed, degrees, brake=True, block=True):
+        speed_sp = self._native(speed)
+        if speed_sp < 0:
+            speed_sp, degrees = -speed_sp, -degrees
+        self._update()
+        self._start('on_for_degrees', self._position + degrees, speed_sp)
+        if block:
+            self.wait_until_not_moving()
+
+    def on_to_position(self, speed, position, brake=True, block=True):
+        self._start('on_to_position', position, self._native(speed))
+        if block:
+            self.wait_until_not_moving()
+
+    def stop(self):
+        self._update()
+        self._running = False
+        self._stalled = False
+        self._speed = 0.0
+        self.world.record(self.port, 'stop', None)
+
+    def off(self, brake=True):
+        self.stop()
+
+    def reset(self):
+        self._update()
+        self._position = 0.0
+        self._target = 0.0
+        self._running = False
+        self._stalled = False
+        self._speed = 0.0
+        self.world.record(self.port, 'reset', None)
+
+    def wait_until_not_moving(self, timeout=None):
+        """ev3dev2 와 같이 멈추거나 stall 될 때까지 기다립니다. timeout 은 ms 입니다."""
+        clock = self.world.clock
+        deadline = None if timeout is None else clock.now + timeout / 1000.0
+        while self.is_running and not self._stalled:
+            if deadline is not None and clock.now >= deadline:
+                return False
+            clock.sleep(0.005)
+        return True
+
+
+class SimUltrasonicSensor(object):
+
+    def __init__(self, world, port, noise_cm=0.3, spike_rate=0.02):
+        self.world = world
+        self.port = port
+        self.noise_cm = noise_cm
+        self.spike_rate = spike_rate
+
+    @property
+    def distance_centimeters(self):
+        world = self.world
+        rng = world.rng
+        if world.noise and rng.random() < self.spike_rate:
+            return 255.0
+        d = world.scenario.distance(world.clock.now)
+        if world.noise:
+            d += rng.gauss(0.0, self.noise_cm)
+        return round(min(255.0, max(0.0, d)), 1)
+
+
+class SimGyroSensor(object):
+
+    def __init__(self, world, port, drift_dps=0.2, noise_deg=0.5):
+        self.world = world
+        self.port = port
+        self.drift_dps = drift_dps
+        self.noise_deg = noise_deg
+        self._zero = 0.0
+
+    def _raw_angle(self):
+        world = self.world
+        now = world.clock.now
+        angle = world.scenario.angle(now) + self.drift_dps * now
+        if world.noise:
+            angle += world.rng.gauss(0.0, self.noise_deg)
+        return angle
+
+    def _raw_rate(self):
+        world = self.world
+        rate = world.scenario.rate(world.clock.now) + self.drift_dps
+        if world.noise:
+            rate += world.rng.gauss(0.0, self.noise_deg)
+        return rate
+
+    @property
+    def angle(self):
+        return int(round(self._raw_angle() - self._zero))
+
+    @property
+    def rate(self):
+        return int(round(self._raw_rate()))
+
+    @property
+    def angle_and_rate(self):
+        return self.angle, self.rate
+
+    def reset(self):
+        self._zero = self._raw_angle()
+        self.world.record(self.port, 'gyro_reset', None)
+
+
+class SimTouchSensor(object):
+
+    def __init__(self, world, port):
+        self.world = world
+        self.port = port
+        self.role = world.ports.get(port, port)
+
+    @property
+    def is_pressed(self):
+        world = self.world
+        now = world.clock.now
+        world.note_read(self.role, now)
+        return world.scenario.pressed(self.role, now)
+
+
+class SimButton(object):
+    """시나리오가 끝나면 뒤로 가기 버튼이 눌린 것으로 봅니다."""
+
+    def __init__(self, world):
+        self.world = world
+
+    @property
+    def backspace(self):
+        return self.world.clock.now >= self.world.scenario.duration
+
+
+# ==========================================
+# 시뮬레이션 세계
+# ==========================================
+class SimWorld(object):
+    """시나리오, 가상 시계, 장치들을 묶어 둡니다."""
+
+    def __init__(self, scenario, clock=None, seed=0, noise=True, ports=None):
+        self.scenario = scenario
+        # 시나리오가 끝났는데도 스크립트가 멈추지 않으면 5초 뒤에 강제로 끝냅니다.
+        self.clock = clock if clock is not None else VirtualClock(limit=scenario.duration + 5.0)
+        self.rng = random.Random(seed)
+        self.noise = noise
+        self.ports = dict(PORTS if ports is None else ports)
+        self.log = []
+        self.reads = {}   # 역할 -> 센서를 읽은 시각 목록 (루프 주기 측정용)
+        self.motors = []
+
+    def note_read(self, role, now):
+        times = self.reads.get(role)
+        if times is None:
+            times = self.reads[role] = []
+        times.append(now)
+
+    def record(self, port, command, value, time=None):
+        self.log.append(MotorLogEntry(self.clock.now if time is None else time,
+                                      port, command, value))
+
+    def settle(self):
+        """아무도 다시 읽지 않은 모터도 지금 시각까지 움직여서 도착/멈춤을 기록합니다."""
+        for motor in self.motors:
+            motor._update()
+
+    def commands(self, command=None):
+        """기록된 모터 명령 중 command 와 같은 것만 골라 반환합니다."""
+        return [entry for entry in self.log if command is None or entry.command == command]
+
+    def make_modules(self):
+        """이 세계에 연결된 가짜 ev3dev2 모듈들을 만듭니다."""
+        world = self
+
+        class LargeMotor(SimMotor):
+            def __init__(self, address):
+                SimMotor.__init__(self, world, address)
+
+        class UltrasonicSensor(SimUltrasonicSensor):
+            def __init__(self, address):
+                SimUltrasonicSensor.__init__(self, world, address)
+
+        class GyroSensor(SimGyroSensor):
+            def __init__(self, address):
+                SimGyroSensor.__init__(self, world, address)
+
+        class TouchSensor(SimTouchSensor):
+            def __init__(self, address):
+                SimTouchSensor.__init__(self, world, address)
+
+        class Button(SimButton):
+            def __init__(self):
+                SimButton.__init__(self, world)
+
+        ev3dev2 = types.ModuleType('ev3dev2')
+        motor = types.ModuleType('ev3dev2.motor')
+        motor.LargeMotor = LargeMotor
+        motor.SpeedPercent = SpeedPercent
+        sensor = types.ModuleType('ev3dev2.sensor')
+        lego = types.ModuleType('ev3dev2.sensor.lego')
+        lego.UltrasonicSensor = UltrasonicSensor
+        lego.GyroSensor = GyroSensor
+        lego.TouchSensor = TouchSensor
+        button = types.ModuleType('ev3dev2.button')
+        button.Button = Button
+        ev3dev2.motor, ev3dev2.sensor, ev3dev2.button, sensor.lego = motor, sensor, button, lego
+
+        shim = types.ModuleType('time')
+        shim.__dict__.update(real_time.__dict__)
+        shim.time = self.clock.time
+        shim.sleep = self.clock.sleep
+        return {'ev3dev2': ev3dev2, 'ev3dev2.motor': motor, 'ev3dev2.sensor': sensor,
+                'ev3dev2.sensor.lego': lego, 'ev3dev2.button': button, 'time': shim}
+
+    def hand_devices(self):
+        """HandController 에 바로 넣을 수 있는 장치 묶음을 만듭니다."""
+        from robot_hand.controller import HandDevices
+        roles = dict((role, port) for port, role in self.ports.items())
+        return HandDevices(
+            SimMotor(self, roles['finger1']),
+            SimMotor(self, roles['finger2']),
+            SimMotor(self, roles['thumb']),
+            SimUltrasonicSensor(self, roles['ultrasonic']),
+            SimTouchSensor(self, roles['palm_touch']),
+            SimTouchSensor(self, roles['side_touch']),
+            SimGyroSensor(self, roles['gyro']),
+            SimButton(self))
+
+
+SimResult = namedtuple('SimResult', 'script scenario world sim_time wall_time')
+
+
+def load_source(path):
+    """스크립트 소스를 읽습니다. 맨 앞의 // 메모 줄은 주석으로 바꿉니다."""
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines(True)
+    return ''.join('#' + line if line.startswith('//') else line for line in lines)
+
+
+def run_script(path, scenario, seed=0, noise=True):
+    """path 스크립트를 scenario 로 시뮬레이션하고 SimResult 를 반환합니다."""
+    world = SimWorld(scenario, seed=seed, noise=noise)
+    code = compile(load_source(path), path, 'exec')
+    modules = world.make_modules()
+
+    saved = dict((name, sys.modules.get(name)) for name in modules)
+    before = set(sys.modules)
+    sys.modules.update(modules)
+    previous_clock = use_clock(world.clock)
+    start = real_time.perf_counter()
+    try:
+        exec(code, {'__name__': '__main__', '__file__': path})
+    except TimeLimitReached:
+        pass
+    finally:
+        wall = real_time.perf_counter() - start
+        world.settle()
+        use_clock(previous_clock)
+        # 실행 중 처음 import 된 모듈은 가상 시계에 묶여 있으므로 버립니다.
+        for name in set(sys.modules) - before:
+            del sys.modules[name]
+        for name, module in saved.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+    return SimResult(path, scenario, world, world.clock.now, wall)
+
+
+def run_controller(make, scenario, seed=0, noise=True):
+    """make(devices, clock) 로 만든 HandController 를 scenario 로 시뮬레이션합니다.
+
+    스크립트를 exec 하지 않으므로 여러 설정을 한 프로세스에서 바로 비교할 수 있습니다.
+    make 대신 robot_hand.controller.PRESETS 의 이름을 넘겨도 됩니다.
+    """
+    label = getattr(make, '__name__', 'controller')
+    if not callable(make):
+        from robot_hand.controller import make_controller
+        preset = label = make
+        make = lambda devices, clock: make_controller(preset, devices, clock)
+    world = SimWorld(scenario, seed=seed, noise=noise)
+    controller = make(world.hand_devices(), world.clock)
+    start = real_time.perf_counter()
+    try:
+        controller.run()
+    except TimeLimitReached:
+        pass
+    wall = real_time.perf_counter() - start
+    world.settle()
+    return SimResult('preset:' + label, scenario, world, world.clock.now, wall)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('script')
+    parser.add_argument('--scenario', default='object_approach', choices=sorted(SCENARIOS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-noise', action='store_true')
+    args = parser.parse_args(argv)
+
+    scenario = SCENARIOS[args.scenario]()
+    result = run_script(args.script, scenario, args.seed, not args.no_noise)
+    for entry in result.world.log:
+        print('%8.3f  %-5s %-15s %s' % entry)
+    print('simulated %.1f s in %.3f s (x%.0f)' % (
+        result.sim_time, result.wall_time, result.sim_time / max(result.wall_time, 1e-9)))
+
+
+if __name__ == '__main__':
+    main()
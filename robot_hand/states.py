@@ -0,0 +1,61 @@
+"""만료 시각을 갖는 손 상태입니다.
+
+잡은 뒤의 안정화 sleep(1) 이나 놓은 뒤의 sleep(2) 처럼 컨트롤러 전체를 멈추는
+대기 대신, 상태에 만료 시각을 두고 매 틱마다 tick(now) 로 확인합니다.
+대기하는 동안에도 센서는 계속 읽히고 안전 입력은 살아 있습니다.
+"""
+
+from time import time
+
+# --- 손 상태 ---
+OPEN = 'open'
+GRASPING = 'grasping'                  # 손가락이 닫히는 중
+GRASP_SETTLING = 'grasp_settling'      # 잡은 뒤 안정화 대기
+CLOSED = 'closed'
+RELEASE_PENDING = 'release_pending'    # 놓기 전 대기
+RELEASING = 'releasing'                # 손가락이 열리는 중
+RELEASE_COOLDOWN = 'release_cooldown'  # 놓은 뒤 다시 잡기 전 대기
+
+STATES = (OPEN, GRASPING, GRASP_SETTLING, CLOSED, RELEASE_PENDING, RELEASING, RELEASE_COOLDOWN)
+
+
+class TimedState(object):
+    """현재 상태 이름과 만료 시각, 만료 후 넘어갈 상태를 관리합니다."""
+
+    def __init__(self, name=OPEN, clock=time):
+        self.clock = clock
+        self.name = name
+        self.entered = clock()
+        self.until = None
+        self.next_name = None
+
+    def enter(self, name, duration=None, then=None):
+        """name 상태로 바꿉니다. duration 이 있으면 그 뒤에 then 상태로 넘어갑니다."""
+        self.name = name
+        self.entered = self.clock()
+        if duration is None:
+            self.until = None
+            self.next_name = None
+        else:
+            self.until = self.entered + duration
+            self.next_name = then
+
+    def tick(self, now=None):
+        """만료 시각이 지났으면 다음 상태로 넘어가고 현재 상태 이름을 반환합니다."""
+        if self.until is not None:
+            if now is None:
+                now = self.clock()
+            if now >= self.until:
+                self.enter(self.next_name)
+        return self.name
+
+    def remaining(self, now=None):
+        """만료까지 남은 시간(초)입니다. 만료 시각이 없으면 None 입니다."""
+        if self.until is None:
+            return None
+        if now is None:
+            now = self.clock()
+        return max(0.0, self.until - now)
+
+    def __repr__(self):
+        return 'TimedState(%r)' % (self.name,)
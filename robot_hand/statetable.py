@@ -0,0 +1,198 @@
+"""손 동작을 선언형 전이 표로 정의하고, 시작할 때 정수 인덱스 분기 표로 컴파일합니다.
+
+표의 한 줄(Transition)은 "이 상태들에서 이 사건이 오면, 조건(guard)이 맞을 때
+동작(action)을 하고 다음 상태(target)로 간다" 입니다. 같은 (상태, 사건) 에 여러 줄이
+있으면 표에 적힌 순서대로 조건을 보고 처음 맞는 줄 하나만 실행합니다.
+duration 을 적으면 target 상태에 그 설정값(초)만큼 머문 뒤 then 상태로 넘어갑니다.
+
+compile_table() 은 상태와 사건을 번호로 바꾸고 (상태 번호 * 사건 수 + 사건 번호) 칸마다
+(조건 함수, 동작 함수, 다음 상태, 머무는 시간, 그다음 상태) 튜플을 미리 묶어 둡니다.
+그래서 틱마다 문자열을 비교하는 if/elif 대신 리스트 인덱싱 한 번으로 할 일을 찾습니다.
+조건과 동작은 이름으로 적고, 제어기의 '_if_이름' / '_do_이름' 메서드에 묶습니다.
+
+validate() 는 컴파일 전에 표를 검사합니다.
+
+- 모르는 상태/사건, 제어기에 없는 조건/동작, duration 과 then 의 짝
+- 앞 줄이 조건 없이 항상 실행되거나 같은 조건이라 절대 실행되지 않는 줄
+- 도달할 수 없는 상태, 들어가면 나올 수 없는 상태
+- 잡기 요청으로 놓기 쪽 상태로 가거나 그 반대인 줄, 잡기와 놓기 요청을 모두 받는 상태
+
+    python3 -m robot_hand.bench_dispatch      # 틱당 평가 비용
+"""
+
+from collections import namedtuple
+
+from robot_hand.states import (CLOSED, GRASP_SETTLING, GRASPING, OPEN, RELEASE_COOLDOWN,
+                               RELEASE_PENDING, RELEASING, STATES)
+from robot_hand.triggers import GRASP, LOCK, PARTIAL_OPEN, RELEASE, RESET, SELECT_POSE, TIGHTEN
+
+# 모션 엔진이 알려 주는 사건 (취소된 동작은 알리지 않음)
+GRASP_DONE = 'grasp_done'
+RELEASE_DONE = 'release_done'
+
+EVENTS = (GRASP, RELEASE, RESET, GRASP_DONE, RELEASE_DONE, PARTIAL_OPEN, TIGHTEN, LOCK,
+          SELECT_POSE)
+
+# 놓기 요청을 받을 수 있는 손 상태
+RELEASABLE_STATES = (GRASPING, GRASP_SETTLING, CLOSED)
+
+# 쥔 채로 손가락을 조금 펴거나 더 조일 수 있는 손 상태
+HOLDING_STATES = (GRASP_SETTLING, CLOSED)
+
+# 잡기 요청과 놓기 요청이 갈 수 있는 상태 (validate 의 잡기/놓기 충돌 검사)
+GRASP_SIDE = (GRASPING, GRASP_SETTLING, CLOSED)
+RELEASE_SIDE = (RELEASE_PENDING, RELEASING, RELEASE_COOLDOWN, OPEN)
+
+# states 는 상태 이름 하나 또는 튜플, guard/action 은 이름 (없으면 None),
+# duration 은 target 에 머물 시간을 담은 HandConfig 설정 이름
+Transition = namedtuple('Transition', 'states event guard action target duration then')
+Transition.__new__.__defaults__ = (None, None, None, None, None)
+
+HAND_TABLE = (
+    # 잡기 (solution-1: 손날 버튼으로 놓은 뒤에는 물체를 뺄 때까지 잡지 않음)
+    Transition(OPEN, GRASP, 'ready_to_grasp', 'start_grasp', GRASPING),
+    # 놓기: 자이로 놓기를 잠갔으면 손날 버튼이 아닌 놓기 요청은 무시
+    Transition(RELEASABLE_STATES, RELEASE, 'release_locked'),
+    # 자이로로 놓을 때 놓기 전 대기가 있으면 기다렸다가 놓음
+    Transition(RELEASABLE_STATES, RELEASE, 'gyro_release_delay', 'note_release',
+               RELEASE_PENDING, 'release_delay_s', RELEASING),
+    Transition(RELEASABLE_STATES, RELEASE, 'manual_release_lock', 'start_release_and_lock',
+               RELEASING),
+    Transition(RELEASABLE_STATES, RELEASE, None, 'start_release', RELEASING),
+    # 손날 버튼 길게 누르기: 모터 위치 리셋 (solution-1 은 손도 열림으로 봄)
+    Transition(STATES, RESET, 'open_after_reset', 'reset_and_unlock', OPEN),
+    Transition(STATES, RESET, None, 'reset_motors'),
+    # 손날 제스처: 쥔 채로 조금 펴기 / 더 조이기 (손 상태는 그대로), 자이로 놓기 잠금 전환
+    Transition(HOLDING_STATES, PARTIAL_OPEN, None, 'partial_open'),
+    Transition(HOLDING_STATES, TIGHTEN, None, 'tighten'),
+    Transition(STATES, LOCK, None, 'toggle_release_lock'),
+    # 손날 제스처로 다음 잡기 자세 고르기 (손 상태는 그대로)
+    Transition(STATES, SELECT_POSE, None, 'select_pose'),
+    # 동작이 끝났을 때
+    Transition(STATES, GRASP_DONE, None, None, GRASP_SETTLING, 'grasp_settle_s', CLOSED),
+    Transition(STATES, RELEASE_DONE, 'gyro_release_cooldown', 'finish_gyro_release',
+               RELEASE_COOLDOWN, 'release_cooldown_s', OPEN),
+    Transition(STATES, RELEASE_DONE, 'gyro_release', 'finish_gyro_release', OPEN),
+    Transition(STATES, RELEASE_DONE, None, 'finish_release', OPEN),
+)
+
+
+def _states(row):
+    return (row.states,) if isinstance(row.states, str) else tuple(row.states)
+
+
+def validate(table, handler_type=None, states=STATES, events=EVENTS, initial=OPEN):
+    """표의 문제를 문장 목록으로 반환합니다. 문제가 없으면 빈 목록입니다."""
+    problems = []
+    cells = {}
+    for n, row in enumerate(table):
+        where = '%d번 줄 (%s)' % (n + 1, row.event)
+        for state in _states(row):
+            if state not in states:
+                problems.append('%s: 모르는 상태 %s' % (where, state))
+            else:
+                cells.setdefault((state, row.event), []).append(row)
+        if row.event not in events:
+            problems.append('%s: 모르는 사건' % where)
+        for state in (row.target, row.then):
+            if state is not None and state not in states:
+                problems.append('%s: 모르는 상태 %s' % (where, state))
+        if (row.duration is None) != (row.then is None):
+            problems.append('%s: duration 과 then 은 함께 적어야 합니다' % where)
+        if row.duration is not None and row.target is None:
+            problems.append('%s: duration 은 target 상태에 머무는 시간입니다' % where)
+        if handler_type is not None:
+            if row.guard is not None and not hasattr(handler_type, '_if_' + row.guard):
+                problems.append('%s: 제어기에 조건 _if_%s 가 없습니다' % (where, row.guard))
+            if row.action is not None and not hasattr(handler_type, '_do_' + row.action):
+                problems.append('%s: 제어기에 동작 _do_%s 가 없습니다' % (where, row.action))
+        if row.event == GRASP and row.target in RELEASE_SIDE:
+            problems.append('%s: 잡기 요청으로 %s 상태로 갑니다' % (where, row.target))
+        if row.event == RELEASE and row.target in GRASP_SIDE:
+            problems.append('%s: 놓기 요청으로 %s 상태로 갑니다' % (where, row.target))
+
+    # 같은 칸에서 앞 줄 때문에 절대 실행되지 않는 줄
+    for (state, event), rows in sorted(cells.items()):
+        guards = set()
+        for i, row in enumerate(rows):
+            if None in guards or row.guard in guards:
+                problems.append('%s 상태의 %s: %s 줄은 앞 줄에 가려 실행되지 않습니다' % (
+                    state, event, row.guard or row.action))
+            guards.add(row.guard)
+    for state in states:
+        if (state, GRASP) in cells and (state, RELEASE) in cells:
+            problems.append('%s 상태가 잡기와 놓기 요청을 모두 받습니다' % state)
+
+    # 도달할 수 있는 상태와 빠져나갈 수 있는 상태
+    edges = dict((state, set()) for state in states)
+    for row in table:
+        for state in _states(row):
+            if state in edges and row.target is not None and row.target in edges:
+                edges[state].add(row.target)
+        if row.target in edges and row.then is not None:
+            edges[row.target].add(row.then)
+    reached = set([initial])
+    frontier = [initial]
+    while frontier:
+        for target in edges.get(frontier.pop(), ()):
+            if target not in reached:
+                reached.add(target)
+                frontier.append(target)
+    for state in states:
+        if state not in reached:
+            problems.append('%s 상태에 도달할 수 없습니다' % state)
+        elif not edges[state] - set([state]):
+            problems.append('%s 상태에 들어가면 나올 수 없습니다' % state)
+    return problems
+
+
+class CompiledTable(object):
+    """(상태, 사건) 칸마다 실행할 줄을 미리 묶어 둔 분기 표입니다."""
+
+    def __init__(self, rows, state_index, event_index, enter):
+        self.rows = rows
+        self.state_index = state_index
+        self.event_index = event_index
+        self.events = len(event_index)
+        self.enter = enter
+
+    def fire(self, state, event, trigger, now):
+        """state 상태에서 event 를 처리합니다. 실행한 줄이 있으면 True 를 반환합니다.
+
+        동작이 False 를 반환하면 (예: 모터 명령 실패) 상태를 바꾸지 않습니다.
+        """
+        cell = self.state_index[state] * self.events + self.event_index[event]
+        for guard, action, target, duration, then in self.rows[cell]:
+            if guard is not None and not guard(trigger):
+                continue
+            if action is not None and action(trigger, now) is False:
+                return False
+            if target is not None:
+                self.enter(target, duration, then)
+            return True
+        return False
+
+
+def compile_table(table, handler, states=STATES, events=EVENTS, initial=OPEN):
+    """table 을 검사하고 handler 의 조건/동작 메서드와 설정값을 묶어 CompiledTable 을 만듭니다.
+
+    handler 에는 _if_*, _do_* 메서드, config, _change_state(name, duration, then) 가 있어야 합니다.
+    """
+    problems = validate(table, type(handler), states, events, initial)
+    if problems:
+        raise ValueError('손 전이 표가 올바르지 않습니다:\n  ' + '\n  '.join(problems))
+    state_index = dict((state, i) for i, state in enumerate(states))
+    event_index = dict((event, i) for i, event in enumerate(events))
+    rows = [() for _ in range(len(states) * len(events))]
+    for row in table:
+        compiled = (
+            None if row.guard is None else getattr(handler, '_if_' + row.guard),
+            None if row.action is None else getattr(handler, '_do_' + row.action),
+            row.target,
+            None if row.duration is None else getattr(handler.config, row.duration),
+            row.then,
+        )
+        for state in _states(row):
+            cell = state_index[state] * len(events) + event_index[row.event]
+            rows[cell] += (compiled,)
+    return CompiledTable(rows, state_index, event_index, handler._change_state)
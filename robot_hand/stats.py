@@ -0,0 +1,25 @@
+"""벤치마크 결과를 요약하는 간단한 통계 함수들입니다."""
+
+
+def percentile(values, p):
+    """정렬된 values 의 p 백분위수(0~100)를 선형 보간으로 구합니다."""
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    k = (len(values) - 1) * p / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def summarize(values, points=(50, 95, 99)):
+    """(개수, {백분위: 값}, 최댓값) 을 반환합니다. 값이 없으면 백분위는 None 입니다."""
+    values = sorted(values)
+    return (len(values),
+            dict((p, percentile(values, p)) for p in points),
+            values[-1] if values else None)
+
+
+def format_ms(seconds):
+    return '     -' if seconds is None else '%6.0f' % (seconds * 1000.0)
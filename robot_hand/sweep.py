@@ -0,0 +1,538 @@
+"""트리거 임계값 조합 수천 개를 기록(trace) 위에서 NumPy 배열 연산으로 한꺼번에 평가합니다.
+
+초음파 감지 지속(UltrasonicDwell)과 자이로 놓기 세 가지(GyroSwingCount,
+GyroRotationInterval, GyroRateSwing)를 트리거 객체로 샘플마다 돌리는 대신, 기록
+전체를 배열로 놓고 설정 격자 전체에 대해 처음 판단하는 시각을 구합니다.
+
+- 샘플마다 상태가 이어지는 부분은 누적 합, 누적 최댓값(마지막 사건 이어 붙이기),
+  슬라이딩 창 중앙값으로 바꿉니다.
+- 격자의 한 축(감지 지속 시간, 목표 횟수, 임계 각도)은 브로드캐스팅으로 한 번에 셉니다.
+- GyroRotationInterval 은 interval 마다 한 번씩 보는 검사 횟수만큼, GyroRateSwing 은
+  같은 구간 코드가 이어지는 묶음 수만큼만 파이썬에서 돌고 샘플 단위로는 돌지 않습니다.
+
+트리거는 손 상태에 들어올 때마다 초기화되므로 기록마다 첫 판단만 봅니다. 보고하는 값:
+
+- 지연: 초음파는 물체가 멈춘 시각 -> 잡기, 자이로는 흔들기를 끝낸 시각 -> 놓기
+- 놓침: 목표 동작을 했는데 판단하지 않은 기록 수
+- 오감지: 목표가 아닌 기록에서 판단했거나 목표 동작 전에 판단한 횟수와 분당 횟수
+  (자이로는 목표 횟수 C 마다 C 번 흔든 기록이 목표, 덜 흔들었거나 흔들지 않은 기록이 목표 아님)
+
+    python3 -m robot_hand.sweep --traces 40
+    python3 -m robot_hand.sweep --detector dwell --top 20
+    python3 -m robot_hand.sweep --load traces/robot_*.csv --load-swings 2
+    python3 -m robot_hand.sweep --load captures/*.rhss --load-swings 0
+
+--load 는 bench_swing --save 의 CSV(자이로)와 capture 의 세션 파일(.rhss, 초음파와
+자이로)을 받습니다. 세션은 값이 바뀔 때만 기록하므로 시뮬레이션 기록과 같은 주기로
+다시 펼친 뒤 평가합니다. 세션에는 목표 동작 시각이 없어서 --load-swings 로 흔든 횟수를,
+--load-offered 로 물체를 내민 기록인지를 알려 주며, 지연은 구하지 않고 놓침과 오감지만 셉니다.
+"""
+
+import argparse
+import itertools
+import random
+import time as real_time
+from collections import namedtuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from robot_hand.bench_swing import load_trace, record
+from robot_hand.capture import read_sessions
+from robot_hand.scenarios import Scenario
+from robot_hand.sim import SimUltrasonicSensor, SimWorld
+
+# 배열로 바꾼 기록: 시각, 값 배열과 목표 동작 정보
+# 자이로: values = (각도, 각속도), swings = 흔든 횟수, start/done = 흔들기 시작/끝 시각
+# 초음파: values = (거리,), swings = 1(잡아야 함) 또는 0, start/done = 다가오기 시작/멈춘 시각
+TraceArrays = namedtuple('TraceArrays', 'name time values swings start done')
+
+# 탐색할 설정 격자 (이름, 값 목록). 마지막 축은 한 번에 브로드캐스팅으로 셉니다.
+GRIDS = {
+    'dwell': (
+        ('window', (1, 3, 5, 7)),
+        ('max_dropouts', (0, 1, 3, 5)),
+        ('distance_cm', (3, 4, 5, 6, 7, 8)),
+        ('release_extra_cm', (0, 1, 2)),
+        ('duration_s', tuple(np.round(np.arange(0.5, 3.01, 0.25), 2))),
+    ),
+    'swing_count': (
+        ('threshold', tuple(range(40, 121, 5))),
+        ('count_target', (1, 2, 3, 4)),
+    ),
+    'rotation': (
+        ('interval_s', (0.5, 0.75, 1.0, 1.5)),
+        ('angle_threshold', tuple(range(40, 121, 5))),
+        ('count_target', (1, 2, 3, 4)),
+    ),
+    'rate_swing': (
+        ('center_deg', (5, 10, 20)),
+        ('max_gap_s', (2.0, 4.0)),
+        ('amplitude_deg', tuple(range(20, 101, 5))),
+        ('count_target', (1, 2, 3, 4)),
+    ),
+}
+
+# 지금 스크립트들이 쓰는 설정 (결과 표에 * 로 표시)
+CURRENT = {
+    'dwell': [{'window': 5, 'max_dropouts': 3, 'distance_cm': 5, 'release_extra_cm': 1,
+               'duration_s': 2.0}],
+    'swing_count': [{'threshold': 85, 'count_target': 3}],
+    'rotation': [{'interval_s': 1.0, 'angle_threshold': 90, 'count_target': 2}],
+    'rate_swing': [{'center_deg': 10, 'max_gap_s': 4.0, 'amplitude_deg': 45, 'count_target': 2}],
+}
+
+
+# ==========================================
+# 배열 도우미
+# ==========================================
+def hold_last(events, initial=0):
+    """마지막 축을 따라 -1 이 아닌 마지막 값을 이어 붙입니다. 아직 없으면 initial 입니다."""
+    n = events.shape[-1]
+    index = np.maximum.accumulate(np.where(events >= 0, np.arange(n), -1), axis=-1)
+    filled = np.take_along_axis(events, np.maximum(index, 0), axis=-1)
+    return np.where(index >= 0, filled, initial)
+
+
+def run_lengths(mask):
+    """mask 가 그 샘플까지 연속으로 True 인 길이입니다."""
+    index = np.arange(len(mask))
+    last_false = np.maximum.accumulate(np.where(mask, -1, index))
+    return np.where(mask, index - last_false, 0)
+
+
+def first_true(mask):
+    """마지막 축에서 처음 True 인 위치, 없으면 -1 입니다."""
+    return np.where(mask.any(axis=-1), mask.argmax(axis=-1), -1)
+
+
+def grid_shape(grid):
+    return tuple(len(values) for _, values in grid)
+
+
+# ==========================================
+# 초음파 감지 지속 (UltrasonicDwell + ProximityFilter)
+# ==========================================
+def filtered_distance(values, window, max_dropouts, valid_max_cm):
+    """(창에 들어간 샘플 번호, 그때의 중앙값) 을 구합니다. 측정 실패는 연속 max_dropouts 번까지 무시합니다."""
+    invalid = (values <= 0) | (values >= valid_max_cm)
+    pushed = ~invalid | (run_lengths(invalid) > max_dropouts)
+    kept = values[pushed]
+    median = np.empty(len(kept))
+    for i in range(min(window - 1, len(kept))):
+        median[i] = np.median(kept[:i + 1])  # 창이 아직 다 차지 않은 앞부분
+    if len(kept) >= window:
+        median[window - 1:] = np.median(sliding_window_view(kept, window), axis=1)
+    return np.flatnonzero(pushed), median
+
+
+def first_near_times(times, values, distance_cm, valid_max_cm):
+    """샘플마다 가까운 값이 이어지기 시작한 시각, 이어지고 있지 않으면 nan 입니다."""
+    near = (values > 0) & (values < distance_cm)
+    events = np.where(near, 1, np.where(values < valid_max_cm, 0, -1))
+    state = hold_last(events)
+    previous = np.concatenate(([0], state[:-1]))
+    starts = np.where(near & (previous != 1), np.arange(len(values)), -1)
+    start = np.maximum.accumulate(starts)
+    return np.where((state == 1) & (start >= 0), times[np.maximum(start, 0)], np.nan)
+
+
+def dwell_fire_times(trace, grid, valid_max_cm=250):
+    """dwell 격자의 모든 설정에 대해 처음 잡는 시각(없으면 nan)을 격자 모양으로 반환합니다."""
+    times = trace.time
+    distances = trace.values[0]
+    (_, windows), (_, dropouts), (_, near_cms), (_, extras), (_, durations) = grid
+    durations = np.asarray(durations, dtype=float)
+    out = np.full(grid_shape(grid), np.nan)
+    end = times[-1] + (times[-1] - times[-2] if len(times) > 1 else 0.0)
+    first_near = dict((near_cm, first_near_times(times, distances, near_cm, valid_max_cm))
+                      for near_cm in near_cms)
+    # (가까움 기준, 해제 기준) 쌍 전체를 한 번에 셉니다.
+    pairs = list(itertools.product(near_cms, extras))
+    near_cm = np.array([pair[0] for pair in pairs], dtype=float)[:, None]
+    release_cm = near_cm + np.array([pair[1] for pair in pairs], dtype=float)[:, None]
+    for a, window in enumerate(windows):
+        for b, max_dropouts in enumerate(dropouts):
+            index, median = filtered_distance(distances, window, max_dropouts, valid_max_cm)
+            if not len(index):
+                continue
+            events = np.where(median < near_cm, 1, np.where(median > release_cm, 0, -1))
+            near = hold_last(events)
+            previous = np.concatenate((np.zeros((len(pairs), 1), dtype=near.dtype),
+                                       near[:, :-1]), axis=1)
+            for p, (n_cm, extra) in enumerate(pairs):
+                rises = index[np.flatnonzero((near[p] == 1) & (previous[p] == 0))]
+                falls = index[np.flatnonzero((near[p] == 0) & (previous[p] == 1))]
+                if not len(rises):
+                    continue
+                ends = np.full(len(rises), end)
+                after = np.searchsorted(falls, rises)
+                ends[after < len(falls)] = times[falls[after[after < len(falls)]]]
+                starts = first_near[n_cm][rises]
+                starts = np.where(np.isnan(starts), times[rises], starts)
+                # 가까운 동안 지속 시간을 넘기면 잡습니다. 기록마다 첫 판단만 봅니다.
+                run = first_true((ends - starts)[None, :] > durations[:, None])
+                fire = np.where(run >= 0, starts[np.maximum(run, 0)] + durations, np.nan)
+                out[a, b, near_cms.index(n_cm), extras.index(extra)] = fire
+    return out
+
+
+# ==========================================
+# 자이로: 각도가 ±threshold 를 번갈아 넘은 횟수 (GyroSwingCount)
+# ==========================================
+def swing_count_fire_times(trace, grid):
+    times = trace.time
+    angle = trace.values[0]
+    (_, thresholds), (_, targets) = grid
+    threshold = np.asarray(thresholds, dtype=float)[:, None]
+    side = np.where(angle > threshold, 1, np.where(angle < -threshold, -1, 0))
+    # 직전까지 마지막으로 넘었던 쪽과 다른 쪽을 넘으면 한 번입니다.
+    previous = hold_last(np.where(side != 0, side + 1, -1), initial=1) - 1
+    previous = np.concatenate((np.zeros((len(thresholds), 1), dtype=previous.dtype),
+                               previous[:, :-1]), axis=1)
+    counts = np.cumsum((side != 0) & (previous != 0) & (side != previous), axis=1)
+    target = np.asarray(targets)[None, :, None]
+    first = first_true(counts[:, None, :] >= target)
+    return np.where(first >= 0, times[np.maximum(first, 0)], np.nan)
+
+
+# ==========================================
+# 자이로: interval 마다 각도 변화 (GyroRotationInterval)
+# ==========================================
+def check_indices(times, interval):
+    """첫 샘플에서 초기화한 뒤 interval 이 지날 때마다 검사하는 샘플 번호입니다."""
+    checks = []
+    last = times[0]
+    i = 0
+    n = len(times)
+    while True:
+        i = int(np.searchsorted(times, last + interval))
+        while i > 0 and times[i - 1] - last >= interval:
+            i -= 1
+        while i < n and times[i] - last < interval:
+            i += 1
+        if i >= n:
+            return np.array(checks, dtype=int)
+        checks.append(i)
+        last = times[i]
+
+
+def rotation_fire_times(trace, grid):
+    times = trace.time
+    angle = trace.values[0]
+    (_, intervals), (_, thresholds), (_, targets) = grid
+    threshold = np.asarray(thresholds, dtype=float)
+    target = np.asarray(targets)
+    out = np.full(grid_shape(grid), np.nan)
+    for a, interval in enumerate(intervals):
+        checks = check_indices(times, interval)
+        changes = np.diff(angle[np.concatenate(([0], checks))])
+        direction = np.zeros(len(thresholds), dtype=int)
+        count = np.zeros(len(thresholds), dtype=int)
+        fired = np.full((len(thresholds), len(targets)), np.nan)
+        # 검사 횟수(기록 길이 / interval)만큼만 돌고, 임계값 축은 한 번에 셉니다.
+        for check, change in zip(checks, changes):
+            counted = (direction != 0) & (direction * change < -threshold)
+            count += counted
+            start = np.where(change > threshold, 1, np.where(change < -threshold, -1, 0))
+            direction = np.where(counted, 0, np.where(direction == 0, start, direction))
+            fired = np.where(np.isnan(fired) & (count[:, None] >= target[None, :]),
+                             times[check], fired)
+        out[a] = fired
+    return out
+
+
+# ==========================================
+# 자이로: 각속도 적분 흔들기 (GyroRateSwing / SwingDetector)
+# ==========================================
+def integrated_angle(times, rate, rest_dps, rest_window):
+    """(멈춤 판단, 마지막 멈춤 이후 적분한 각도) 를 SwingDetector 와 같은 순서로 구합니다."""
+    magnitude = np.concatenate(([0.0], np.cumsum(np.abs(rate))))
+    n = len(rate)
+    window_sum = np.full(n, np.inf)
+    if n >= rest_window:
+        window_sum[rest_window - 1:] = magnitude[rest_window:] - magnitude[:-rest_window]
+    at_rest = window_sum < rest_dps * rest_window
+    steps = np.concatenate(([0.0], rate[1:] * np.diff(times)))
+    total = np.cumsum(steps)
+    # 멈춘 샘플을 처리한 뒤 각도를 0 으로 되돌리므로 다음 샘플부터 다시 적분합니다.
+    rest_index = np.maximum.accumulate(np.where(at_rest, np.arange(n), -1))
+    previous = np.concatenate(([-1], rest_index[:-1]))
+    return at_rest, total - np.where(previous >= 0, total[np.maximum(previous, 0)], 0.0)
+
+
+def swing_times(times, angle, at_rest, amplitude, center):
+    """흔들기를 센 시각 배열입니다. 같은 구간 코드가 이어지는 샘플은 한 번만 봅니다."""
+    region = np.where(angle > amplitude, 1, np.where(
+        angle < -amplitude, 2, np.where(np.abs(angle) <= center, 3, 0)))
+    code = region * 2 + at_rest
+    kept = np.flatnonzero(code != 0)
+    if not len(kept):
+        return np.empty(0)
+    codes = code[kept]
+    heads = kept[np.concatenate(([True], codes[1:] != codes[:-1]))]
+    swings = []
+    sides = 0
+    for i, r, rest in zip(heads.tolist(), region[heads].tolist(), at_rest[heads].tolist()):
+        if r == 1:
+            sides |= 1
+        elif r == 2:
+            sides |= 2
+        elif r == 3 and sides == 3:
+            sides = 0
+            swings.append(times[i])
+        if rest:
+            sides = 0
+    return np.array(swings)
+
+
+def rate_swing_fire_times(trace, grid, rest_dps=8, rest_window=20):
+    times = trace.time
+    rate = trace.values[1]
+    (_, centers), (_, gaps), (_, amplitudes), (_, targets) = grid
+    target = np.asarray(targets)
+    out = np.full(grid_shape(grid), np.nan)
+    at_rest, angle = integrated_angle(times, rate, rest_dps, rest_window)
+    for a, center in enumerate(centers):
+        for c, amplitude in enumerate(amplitudes):
+            swings = swing_times(times, angle, at_rest, amplitude, center)
+            if not len(swings):
+                continue
+            for b, max_gap in enumerate(gaps):
+                # 흔들기 사이가 max_gap 보다 길면 처음부터 다시 셉니다.
+                broken = np.concatenate(([True], np.diff(swings) > max_gap))
+                index = np.arange(len(swings))
+                chain = index - np.maximum.accumulate(np.where(broken, index, 0)) + 1
+                first = first_true(chain[None, :] >= target[:, None])
+                out[a, b, c] = np.where(first >= 0, swings[np.maximum(first, 0)], np.nan)
+    return out
+
+
+DETECTORS = {
+    'dwell': dwell_fire_times,
+    'swing_count': swing_count_fire_times,
+    'rotation': rotation_fire_times,
+    'rate_swing': rate_swing_fire_times,
+}
+
+
+# ==========================================
+# 기록 만들기
+# ==========================================
+def gyro_arrays(trace, swings):
+    samples = np.array(trace.samples, dtype=float)
+    return TraceArrays(trace.name, samples[:, 0], (samples[:, 1], samples[:, 2]), swings,
+                       trace.swing_start, trace.swing_done)
+
+
+def resample(times, values, end, period):
+    """값이 바뀔 때만 남긴 기록을 period 마다 (시각, 그때의 마지막 값) 배열로 펼칩니다."""
+    grid = np.arange(0.0, end + period / 2, period)
+    index = np.maximum(np.searchsorted(times, grid, side='right') - 1, 0)
+    return grid, np.asarray(values, dtype=float)[index]
+
+
+def session_arrays(session, swings, offered, gyro_period=0.01, distance_period=0.1):
+    """세션 파일 하나를 (자이로 기록, 초음파 기록) 으로 바꿉니다. 없는 센서는 None 입니다."""
+    gyro = distance = None
+    times, values = session.streams.get('gyro', ((), ()))
+    if times:
+        grid, samples = resample(times, values, session.duration, gyro_period)
+        gyro = TraceArrays(session.name, grid, (samples[:, 0], samples[:, 1]), swings,
+                           None, None)
+    times, values = session.streams.get('ultrasonic', ((), ()))
+    if times:
+        grid, samples = resample(times, values, session.duration, distance_period)
+        distance = TraceArrays(session.name, grid, (samples,), 1 if offered else 0, None, None)
+    return gyro, distance
+
+
+def load_traces(paths, swings, offered):
+    """--load 로 받은 파일을 (자이로 기록 목록, 초음파 기록 목록) 으로 읽습니다."""
+    gyro_traces = []
+    dwell_traces = []
+    for path in paths:
+        if path.endswith('.rhss'):
+            for session in read_sessions(path):
+                gyro, distance = session_arrays(session, swings, offered)
+                if gyro is not None:
+                    gyro_traces.append(gyro)
+                if distance is not None:
+                    dwell_traces.append(distance)
+        else:
+            trace = load_trace(path)
+            gyro_traces.append(gyro_arrays(trace, swings if trace.swing_done is not None else 0))
+    return gyro_traces, dwell_traces
+
+
+def make_gyro_traces(count, rng, period=0.01):
+    """흔들기 1~4 번 기록과 흔들기가 아닌 기록(기울이기, 작은 흔들림, 가만히)을 만듭니다."""
+    traces = []
+    for i in range(count):
+        seed = rng.randrange(1 << 30)
+        swings = i % 4 + 1
+        swing_period = rng.uniform(1.2, 2.5)
+        scenario = Scenario('swing%d' % swings, 5.0 + (swings + 1) * swing_period).swing(
+            at=rng.uniform(1.0, 2.0), count=swings, amplitude=rng.uniform(60, 140),
+            period=swing_period)
+        traces.append(gyro_arrays(record(scenario, seed, period), swings))
+
+        kind = i % 3
+        if kind == 0:
+            at = rng.uniform(1.0, 2.0)
+            scenario = (Scenario('tilts', 14.0)
+                        .tilt(at, rng.uniform(60, 120), rng.uniform(1.0, 3.0))
+                        .tilt(at + 5.0, -rng.uniform(60, 120), rng.uniform(1.0, 3.0)))
+        elif kind == 1:
+            scenario = Scenario('small_shake', 10.0).swing(
+                at=rng.uniform(1.0, 2.0), count=4, amplitude=rng.uniform(10, 30),
+                period=rng.uniform(0.4, 1.0))
+        else:
+            scenario = Scenario('still', 30.0)
+        traces.append(gyro_arrays(record(scenario, seed, period, target=False), 0))
+    return traces
+
+
+def record_distance(scenario, seed, period=0.1):
+    """scenario 동안 시뮬레이터 초음파 센서를 period 마다 읽은 (시각, 거리) 배열입니다."""
+    world = SimWorld(scenario, seed=seed)
+    sensor = SimUltrasonicSensor(world, 'in1')
+    clock = world.clock
+    samples = []
+    while clock.now < scenario.duration:
+        samples.append((clock.now, sensor.distance_centimeters))
+        clock.advance_to(clock.now + period)
+    return np.array(samples, dtype=float)
+
+
+def make_dwell_traces(count, rng, period=0.1):
+    """물체를 내밀고 기다리는 기록과 스쳐 지나가거나 멀리 있는 기록을 만듭니다."""
+    traces = []
+    for i in range(count):
+        seed = rng.randrange(1 << 30)
+        at = rng.uniform(1.0, 3.0)
+        scenario = Scenario('offer', 20.0).approach(
+            at=at, near_cm=rng.uniform(1.5, 4.0), speed_cm_s=rng.uniform(10, 40),
+            hold=rng.uniform(3.5, 8.0))
+        samples = record_distance(scenario, seed, period)
+        traces.append(TraceArrays('offer', samples[:, 0], (samples[:, 1],), 1,
+                                  at, scenario.mark('object_arrived')))
+
+        kind = i % 3
+        if kind == 0:
+            # 손 앞을 스쳐 지나가기 (잠깐 머묾)
+            scenario = Scenario('pass', 15.0).approach(
+                at=at, near_cm=rng.uniform(1.5, 4.0), speed_cm_s=rng.uniform(20, 60),
+                hold=rng.uniform(0.0, 1.2))
+        elif kind == 1:
+            # 감지 거리 밖에서 머물기
+            scenario = Scenario('hover', 15.0).approach(
+                at=at, near_cm=rng.uniform(9.0, 20.0), hold=rng.uniform(3.0, 8.0))
+        else:
+            scenario = Scenario('empty', 30.0)
+        samples = record_distance(scenario, seed, period)
+        traces.append(TraceArrays(scenario.name, samples[:, 0], (samples[:, 1],), 0,
+                                  None, None))
+    return traces
+
+
+# ==========================================
+# 평가
+# ==========================================
+def evaluate(detector, traces, grid):
+    """격자의 설정마다 (지연 p50, p95, 놓침, 오감지, 오감지/분) 배열을 반환합니다."""
+    fire = np.stack([DETECTORS[detector](trace, grid).reshape(-1) for trace in traces])
+    names = [name for name, _ in grid]
+    axes = np.meshgrid(*[np.asarray(values, dtype=float) for _, values in grid], indexing='ij')
+    settings = dict((name, axis.reshape(-1)) for name, axis in zip(names, axes))
+
+    swings = np.array([trace.swings for trace in traces])[:, None]
+    if 'count_target' in settings:
+        target = settings['count_target'][None, :]
+        positive = swings == target
+        negative = swings < target
+    else:
+        positive = np.broadcast_to(swings == 1, fire.shape)
+        negative = np.broadcast_to(swings == 0, fire.shape)
+    start = np.array([np.nan if t.start is None else t.start for t in traces])[:, None]
+    done = np.array([np.nan if t.done is None else t.done for t in traces])[:, None]
+    duration = np.array([t.time[-1] - t.time[0] for t in traces])[:, None]
+
+    fired = ~np.isnan(fire)
+    early = positive & fired & (fire < start)
+    hit = positive & fired & ~early
+    latency = np.where(hit, fire - done, np.nan)
+    columns = ~np.isnan(latency).all(axis=0)
+    p50 = np.full(fire.shape[1], np.nan)
+    p95 = np.full(fire.shape[1], np.nan)
+    if columns.any():
+        p50[columns], p95[columns] = np.nanpercentile(latency[:, columns], (50, 95), axis=0)
+    misses = (positive & ~hit).sum(axis=0)
+    false = (negative & fired).sum(axis=0) + early.sum(axis=0)
+    per_minute = false * 60.0 / np.maximum((negative * duration).sum(axis=0), 1e-9)
+    return settings, p50, p95, misses, false, per_minute
+
+
+def format_setting(names, settings, i):
+    return ' '.join('%s=%g' % (name, settings[name][i]) for name in names)
+
+
+def report(detector, traces, grid, top):
+    start = real_time.perf_counter()
+    settings, p50, p95, misses, false, per_minute = evaluate(detector, traces, grid)
+    elapsed = real_time.perf_counter() - start
+    names = [name for name, _ in grid]
+    print('== %s: %d settings x %d traces in %.2f s' % (
+        detector, len(p50), len(traces), elapsed))
+    # 오감지 -> 놓침 -> 지연 p95 순서로 좋은 설정부터 보여 줍니다.
+    order = np.lexsort((np.nan_to_num(p95, nan=np.inf), misses, false))
+    current = set()
+    for wanted in CURRENT.get(detector, []):
+        match = np.ones(len(p50), dtype=bool)
+        for name, value in wanted.items():
+            match &= np.isclose(settings[name], value)
+        current.update(np.flatnonzero(match).tolist())
+    rows = order[:top].tolist() + [i for i in sorted(current) if i not in order[:top]]
+    print('  %7s %7s %5s %5s %7s  setting' % ('p50', 'p95', 'miss', 'fp', 'fp/min'))
+    for i in rows:
+        print('%s %s %s %5d %5d %7.2f  %s' % (
+            '*' if i in current else ' ', stats_ms(p50[i]), stats_ms(p95[i]),
+            misses[i], false[i], per_minute[i], format_setting(names, settings, i)))
+
+
+def stats_ms(seconds):
+    return '      -' if np.isnan(seconds) else '%7.0f' % (seconds * 1000.0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--detector', action='append', choices=sorted(DETECTORS),
+                        help='평가할 트리거 (여러 번 적을 수 있음, 기본은 전부)')
+    parser.add_argument('--traces', type=int, default=40, help='종류별 시뮬레이션 기록 수')
+    parser.add_argument('--top', type=int, default=10, help='보여 줄 설정 수')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--load', nargs='*', default=[], metavar='FILE',
+                        help='추가로 평가할 기록 (bench_swing --save 의 CSV 또는 .rhss 세션)')
+    parser.add_argument('--load-swings', type=int, default=2,
+                        help='--load 기록 중 흔들기 기록의 흔든 횟수 (세션은 0 이면 흔들지 않은 기록)')
+    parser.add_argument('--load-offered', action='store_true',
+                        help='--load 한 세션이 물체를 내밀어 잡아야 하는 기록임')
+    args = parser.parse_args(argv)
+
+    detectors = args.detector or sorted(DETECTORS)
+    rng = random.Random(args.seed)
+    loaded_gyro, loaded_dwell = load_traces(args.load, args.load_swings, args.load_offered)
+    gyro_traces = []
+    if any(name != 'dwell' for name in detectors):
+        gyro_traces = make_gyro_traces(args.traces, rng) + loaded_gyro
+    dwell_traces = []
+    if 'dwell' in detectors:
+        dwell_traces = make_dwell_traces(args.traces, rng) + loaded_dwell
+
+    for detector in detectors:
+        traces = dwell_traces if detector == 'dwell' else gyro_traces
+        report(detector, traces, GRIDS[detector], args.top)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+"""sysfs 속성 파일을 열어 둔 채로 읽고 쓰는 가벼운 EV3 장치 계층입니다.
+
+ev3dev2 의 LargeMotor / UltrasonicSensor / GyroSensor / TouchSensor 대신 그대로
+쓸 수 있도록 스크립트에서 쓰는 속성과 메서드 이름을 맞췄습니다.
+
+- 속성 파일은 처음 쓸 때 한 번만 열고, 이후에는 lseek + readv 로 미리 잡아 둔
+  버퍼에 다시 읽습니다. 문자열 디코딩 없이 바로 int 로 바꿉니다.
+- speed_sp, stop_action, mode 처럼 값이 바뀌지 않는 쓰기는 건너뜁니다.
+- MotorGroup 은 세 모터의 설정값을 먼저 모두 쓰고 command 를 연달아 써서
+  모터들이 거의 동시에 출발하게 합니다.
+"""
+
+import os
+from time import sleep
+
+SYS_CLASS = '/sys/class'
+
+
+class Attribute(object):
+    """열어 둔 sysfs 속성 파일 하나입니다."""
+
+    __slots__ = ('path', 'fd', 'last_written', '_buf', '_bufs')
+
+    def __init__(self, path, writable=False, size=64):
+        self.path = path
+        self.fd = os.open(path, os.O_RDWR if writable else os.O_RDONLY)
+        self.last_written = None
+        self._buf = bytearray(size)
+        self._bufs = [self._buf]
+
+    def read_raw(self):
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        n = os.readv(self.fd, self._bufs)
+        return self._buf[:n]
+
+    def read_int(self):
+        return int(self.read_raw())
+
+    def read_str(self):
+        return self.read_raw().decode().strip()
+
+    def write(self, value, force=False):
+        """value 를 씁니다. force 가 아니면 마지막으로 쓴 값과 같을 때 건너뜁니다."""
+        if not force and value == self.last_written:
+            return
+        data = value if isinstance(value, bytes) else str(value).encode()
+        os.lseek(self.fd, 0, os.SEEK_SET)
+        os.write(self.fd, data)
+        self.last_written = value
+
+    def close(self):
+        os.close(self.fd)
+
+
+def find_device(class_name, address, root=SYS_CLASS):
+    """root/class_name 아래에서 address 포트에 연결된 장치 경로를 찾습니다."""
+    class_dir = os.path.join(root, class_name)
+    for name in sorted(os.listdir(class_dir)):
+        path = os.path.join(class_dir, name)
+        with open(os.path.join(path, 'address')) as f:
+            if address in f.read():
+                return path
+    raise IOError('%s 포트에 연결된 %s 장치가 없습니다.' % (address, class_name))
+
+
+class Device(object):
+    """장치 디렉터리와 열어 둔 속성 파일들을 관리합니다."""
+
+    SYSTEM_CLASS_NAME = None
+    WRITABLE = ()
+
+    def __init__(self, address, root=SYS_CLASS):
+        self.address = address
+        self.path = find_device(self.SYSTEM_CLASS_NAME, address, root)
+        self._attributes = {}
+
+    def attribute(self, name):
+        attribute = self._attributes.get(name)
+        if attribute is None:
+            attribute = Attribute(os.path.join(self.path, name), name in self.WRITABLE)
+            self._attributes[name] = attribute
+        return attribute
+
+    def close(self):
+        for attribute in self._attributes.values():
+            attribute.close()
+        self._attributes = {}
+
+
+# ==========================================
+# 모터
+# ==========================================
+class LargeMotor(Device):
+    """ev3dev2.motor.LargeMotor 와 같은 방식으로 쓰는 tacho 모터입니다."""
+
+    SYSTEM_CLASS_NAME = 'tacho-motor'
+    WRITABLE = ('command', 'speed_sp', 'position_sp', 'stop_action', 'position',
+                'ramp_up_sp', 'ramp_down_sp', 'duty_cycle_sp')
+
+    def __init__(self, address, root=SYS_CLASS):
+        Device.__init__(self, address, root)
+        # 바뀌지 않는 값은 한 번만 읽어 둡니다.
+        self.max_speed = self.attribute('max_speed').read_int()
+        self.count_per_rot = self.attribute('count_per_rot').read_int()
+        self._position = self.attribute('position')
+        self._speed = self.attribute('speed')
+        self._state = self.attribute('state')
+        self._command = self.attribute('command')
+
+    # --- 읽기 ---
+    @property
+    def position(self):
+        return self._position.read_int()
+
+    @position.setter
+    def position(self, value):
+        self._position.write(value, force=True)
+
+    @property
+    def speed(self):
+        return self._speed.read_int()
+
+    @property
+    def duty_cycle(self):
+        return self.attribute('duty_cycle').read_int()
+
+    @property
+    def state(self):
+        return self._state.read_str().split()
+
+    @property
+    def is_running(self):
+        return b'running' in self._state.read_raw()
+
+    @property
+    def is_stalled(self):
+        return b'stalled' in self._state.read_raw()
+
+    # --- 설정값 ---
+    @property
+    def ramp_up_sp(self):
+        return self.attribute('ramp_up_sp').read_int()
+
+    @ramp_up_sp.setter
+    def ramp_up_sp(self, value):
+        self.attribute('ramp_up_sp').write(int(value))
+
+    @property
+    def ramp_down_sp(self):
+        return self.attribute('ramp_down_sp').read_int()
+
+    @ramp_down_sp.setter
+    def ramp_down_sp(self, value):
+        self.attribute('ramp_down_sp').write(int(value))
+
+    def native_speed(self, speed):
+        """SpeedPercent 같은 속도 객체나 퍼센트 숫자를 모터 단위로 바꿉니다."""
+        if hasattr(speed, 'to_native_units'):
+            return int(round(speed.to_native_units(self)))
+        return int(round(speed * self.max_speed / 100.0))
+
+    def prepare_for_degrees(self, speed, degrees, brake=True):
+        """on_for_degrees 에 필요한 설정값만 쓰고 출발 명령은 반환합니다."""
+        speed_sp = self.native_speed(speed)
+        if speed_sp < 0:
+            speed_sp, degrees = -speed_sp, -degrees
+        self.attribute('speed_sp').write(speed_sp)
+        self.attribute('position_sp').write(int(round(degrees * self.count_per_rot / 360.0)))
+        self.attribute('stop_action').write('hold' if brake else 'coast')
+        return 'run-to-rel-pos'
+
+    def prepare_to_position(self, speed, position, brake=True):
+        self.attribute('speed_sp').write(abs(self.native_speed(speed)))
+        self.attribute('position_sp').write(int(round(position)))
+        self.attribute('stop_action').write('hold' if brake else 'coast')
+        return 'run-to-abs-pos'
+
+    # --- 명령 ---
+    def run_command(self, command):
+        self._command.write(command, force=True)
+
+    def on_for_degrees(self, speed, degrees, brake=True, block=True):
+        self.run_command(self.prepare_for_degrees(speed, degrees, brake))
+        if block:
+            self.wait_until_not_moving()
+
+    def on_to_position(self, speed, position, brake=True, block=True):
+        self.run_command(self.prepare_to_position(speed, position, brake))
+        if block:
+            self.wait_until_not_moving()
+
+    def stop(self):
+        self.run_command('stop')
+
+    def off(self, brake=True):
+        self.attribute('stop_action').write('hold' if brake else 'coast')
+        self.run_command('stop')
+
+    def reset(self):
+        self.run_command('reset')
+        # reset 은 모터 설정값도 초기화하므로 기억해 둔 값을 버립니다.
+        for attribute in self._attributes.values():
+            attribute.last_written = None
+
+    def wait_until_not_moving(self, timeout=None, sleep=sleep, period=0.01):
+        waited = 0.0
+        while True:
+            state = self._state.read_raw()
+            if b'running' not in state or b'stalled' in state:
+                return True
+            if timeout is not None and waited >= timeout:
+                return False
+            sleep(period)
+            waited += period
+
+
+class MotorGroup(object):
+    """여러 모터의 설정값을 먼저 모두 쓰고 출발 명령을 연달아 보냅니다."""
+
+    def __init__(self, *motors):
+        self.motors = motors
+
+    def on_for_degrees(self, commands, block=True):
+        """commands: (모터, 속도, 각도) 목록"""
+        starts = [(motor, motor.prepare_for_degrees(speed, degrees))
+                  for motor, speed, degrees in commands]
+        self._start(starts, block)
+
+    def on_to_position(self, commands, block=True):
+        """commands: (모터, 속도, 위치) 목록"""
+        starts = [(motor, motor.prepare_to_position(speed, position))
+                  for motor, speed, position in commands]
+        self._start(starts, block)
+
+    def _start(self, starts, block):
+        for motor, command in starts:
+            motor.run_command(command)
+        if block:
+            for motor, _ in starts:
+                motor.wait_until_not_moving()
+
+    def off(self, brake=True):
+        for motor in self.motors:
+            motor.off(brake)
+
+
+# ==========================================
+# 센서
+# ==========================================
+class Sensor(Device):
+    """mode 를 바꿔 가며 value0, value1 을 읽는 lego-sensor 장치입니다."""
+
+    SYSTEM_CLASS_NAME = 'lego-sensor'
+    WRITABLE = ('mode', 'direct')
+
+    def __init__(self, address, root=SYS_CLASS):
+        Device.__init__(self, address, root)
+        self._mode = self.attribute('mode')
+        self._mode.last_written = self._mode.read_str()
+        self._value0 = self.attribute('value0')
+
+    def set_mode(self, mode):
+        self._mode.write(mode)
+
+    def value(self, n=0):
+        if n == 0:
+            return self._value0.read_int()
+        return self.attribute('value%d' % n).read_int()
+
+
+class UltrasonicSensor(Sensor):
+
+    @property
+    def distance_centimeters(self):
+        self._mode.write('US-DIST-CM')
+        return self._value0.read_int() * 0.1
+
+
+class GyroSensor(Sensor):
+
+    @property
+    def angle(self):
+        self._mode.write('GYRO-ANG')
+        return self._value0.read_int()
+
+    @property
+    def rate(self):
+        self._mode.write('GYRO-RATE')
+        return self._value0.read_int()
+
+    @property
+    def angle_and_rate(self):
+        self._mode.write('GYRO-G&A')
+        return self._value0.read_int(), self.value(1)
+
+    def reset(self):
+        # ev3dev2 GyroSensor.reset() 과 같이 direct 에 0x11 을 씁니다.
+        self.attribute('direct').write(b'\x11', force=True)
+
+
+class TouchSensor(Sensor):
+
+    @property
+    def is_pressed(self):
+        self._mode.write('TOUCH')
+        return self._value0.read_int() == 1
@@ -0,0 +1,216 @@
+"""제어 틱마다 센서 값과 손 상태를 남기는 바이너리 텔레메트리입니다.
+
+기록은 미리 잡아 둔 bytearray 링 버퍼에 struct.pack_into 로 바로 쓰므로 틱마다
+새 객체를 만들지 않습니다. flush() 하면 아직 파일에 쓰지 않은 기록만 이어 씁니다.
+링이 다 차기 전에 flush 하지 않으면 가장 오래된 기록부터 덮어씁니다.
+같은 파일에 다시 기록하면 링마다 처음 flush 할 때 헤더를 새로 써서 실행 경계를 남기고,
+read_runs() 는 헤더마다 실행을 하나씩 돌려줍니다. CSV 의 run 열이 몇 번째 실행인지입니다.
+
+파일 형식 (리틀 엔디언):
+
+    헤더   b'RHTL', 버전(H), 기록 크기(H), 메타 길이(I), 메타(UTF-8)
+           메타는 줄마다 'fields=이름:형식,...', 'states=...', 'actions=...', 'motions=...'
+    기록   RECORD 형식의 고정 크기 기록이 시간 순서대로 이어짐
+
+    python3 -m robot_hand.telemetry hand.rhtl              # CSV 를 화면에 출력
+    python3 -m robot_hand.telemetry hand.rhtl -o hand.csv
+"""
+
+import argparse
+import struct
+import sys
+
+from robot_hand.motion import CANCELLED, DONE, GRIPPED, RUNNING, STALLED, TIMEOUT
+from robot_hand.states import STATES
+from robot_hand.triggers import GRASP, LOCK, PARTIAL_OPEN, RELEASE, RESET, SELECT_POSE, TIGHTEN
+
+MAGIC = b'RHTL'
+VERSION = 1
+HEADER = struct.Struct('<4sHHI')
+
+# (이름, struct 형식)
+FIELDS = (
+    ('time', 'd'),
+    ('ultrasonic', 'f'),
+    ('palm_touch', 'B'),
+    ('side_touch', 'B'),
+    ('gyro', 'f'),
+    ('gyro_rate', 'f'),
+    ('state', 'B'),        # STATES 의 번호
+    ('swing_count', 'B'),  # 자이로 놓기 트리거가 센 횟수
+    ('swing_angle', 'f'),  # 자이로 놓기 트리거가 보는 각도
+    ('action', 'B'),       # 이번 틱에 내린 동작 (ACTIONS 의 번호)
+    ('motion', 'B'),       # 모션 엔진 상태 (MOTIONS 의 번호)
+)
+RECORD = struct.Struct('<' + ''.join(kind for _, kind in FIELDS))
+
+ACTIONS = ('', GRASP, RELEASE, RESET, PARTIAL_OPEN, TIGHTEN, LOCK, SELECT_POSE)
+MOTIONS = ('', RUNNING, DONE, STALLED, TIMEOUT, CANCELLED, GRIPPED)
+
+STATE_CODES = dict((name, i) for i, name in enumerate(STATES))
+ACTION_CODES = dict((name, i) for i, name in enumerate(ACTIONS))
+ACTION_CODES[None] = 0
+MOTION_CODES = dict((name, i) for i, name in enumerate(MOTIONS))
+MOTION_CODES[None] = 0
+
+
+class TelemetryRing(object):
+    """고정 크기 기록 링 버퍼입니다."""
+
+    def __init__(self, size=4096, path=None):
+        self.size = size
+        self.path = path
+        self.buffer = bytearray(RECORD.size * size)
+        self.written = 0  # 지금까지 쓴 기록 수
+        self.flushed = 0  # 그중 파일에 쓴 기록 수
+        self._headed = set()  # 이 실행의 헤더를 쓴 파일
+        self._pack = RECORD.pack_into
+
+    def record(self, *values):
+        """FIELDS 순서의 값으로 기록 하나를 씁니다."""
+        self._pack(self.buffer, (self.written % self.size) * RECORD.size, *values)
+        self.written += 1
+
+    def __len__(self):
+        return min(self.written, self.size)
+
+    def pending(self):
+        """아직 파일에 쓰지 않은 기록을 시간 순서대로 bytes 로 반환합니다."""
+        start = max(self.flushed, self.written - self.size)
+        if start >= self.written:
+            return b''
+        first = (start % self.size) * RECORD.size
+        last = (self.written % self.size) * RECORD.size
+        view = memoryview(self.buffer)
+        if first < last:
+            return bytes(view[first:last])
+        return bytes(view[first:]) + bytes(view[:last])
+
+    def flush(self, path=None):
+        """아직 쓰지 않은 기록을 path 에 이어 씁니다. 파일이 없으면 헤더부터 씁니다."""
+        path = path or self.path
+        data = self.pending()
+        if path is None or not data:
+            return 0
+        with open(path, 'ab') as f:
+            if path not in self._headed:
+                # 앞 실행의 기록이 있는 파일이어도 헤더로 이번 실행의 시작을 남깁니다.
+                f.write(header())
+                self._headed.add(path)
+            f.write(data)
+        self.flushed = self.written
+        return len(data) // RECORD.size
+
+    def records(self):
+        """링에 남아 있는 기록을 시간 순서대로 튜플로 돌려줍니다."""
+        for i in range(max(0, self.written - self.size), self.written):
+            yield RECORD.unpack_from(self.buffer, (i % self.size) * RECORD.size)
+
+
+def header():
+    meta = '\n'.join([
+        'fields=' + ','.join('%s:%s' % field for field in FIELDS),
+        'states=' + ','.join(STATES),
+        'actions=' + ','.join(ACTIONS),
+        'motions=' + ','.join(MOTIONS),
+    ]).encode('utf-8')
+    return HEADER.pack(MAGIC, VERSION, RECORD.size, len(meta)) + meta
+
+
+def read_runs(path):
+    """파일에 기록한 실행마다 (필드 이름, 이름표 딕셔너리, 기록 목록) 을 순서대로 반환합니다.
+
+    이름표 딕셔너리는 'state', 'action', 'motion' 필드의 번호 -> 이름 목록입니다.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    runs = []
+    offset = 0
+    while offset < len(data):
+        offset, run = _read_run(data, offset, path)
+        runs.append(run)
+    if not runs:
+        raise ValueError('텔레메트리 파일이 아닙니다: %s' % path)
+    return runs
+
+
+def read_log(path):
+    """실행이 하나인 파일을 읽어 (필드 이름, 이름표 딕셔너리, 기록 목록) 을 반환합니다."""
+    runs = read_runs(path)
+    if len(runs) > 1:
+        raise ValueError('실행이 %d 번 들어 있습니다 (read_runs): %s' % (len(runs), path))
+    return runs[0]
+
+
+def _is_header(data, offset, size):
+    if data[offset:offset + len(MAGIC)] != MAGIC or len(data) - offset < HEADER.size:
+        return False
+    magic, version, record_size, meta_length = HEADER.unpack_from(data, offset)
+    return version == VERSION and record_size == size
+
+
+def _read_run(data, offset, path):
+    """offset 의 헤더부터 다음 헤더 앞까지 읽어 (다음 위치, 실행) 을 반환합니다."""
+    magic, version, size, meta_length = HEADER.unpack_from(data, offset)
+    if magic != MAGIC:
+        raise ValueError('텔레메트리 파일이 아닙니다: %s' % path)
+    if version != VERSION:
+        raise ValueError('지원하지 않는 버전입니다: %d' % version)
+    start = offset + HEADER.size + meta_length
+    meta = dict(line.split('=', 1) for line in
+                data[offset + HEADER.size:start].decode('utf-8').splitlines())
+    fields = [field.split(':') for field in meta['fields'].split(',')]
+    record = struct.Struct('<' + ''.join(kind for _, kind in fields))
+    if record.size != size:
+        raise ValueError('기록 크기가 헤더와 다릅니다')
+    labels = {
+        'state': meta['states'].split(','),
+        'action': meta['actions'].split(','),
+        'motion': meta['motions'].split(','),
+    }
+    # 다음 실행의 헤더는 기록 경계에서 시작합니다.
+    stop = data.find(MAGIC, start)
+    while stop >= 0 and ((stop - start) % size or not _is_header(data, stop, size)):
+        stop = data.find(MAGIC, stop + 1)
+    following = len(data) if stop < 0 else stop
+    count = (following - start) // size
+    records = [record.unpack_from(data, start + i * size) for i in range(count)]
+    return following, ([name for name, _ in fields], labels, records)
+
+
+def write_csv(path, out):
+    runs = read_runs(path)
+    out.write(','.join(['run'] + runs[0][0]) + '\n')
+    count = 0
+    for run, (names, labels, records) in enumerate(runs, 1):
+        columns = [labels.get(name) for name in names]
+        for values in records:
+            cells = [str(run)]
+            for value, label in zip(values, columns):
+                if label is not None:
+                    cells.append(label[value] if value < len(label) else str(value))
+                elif isinstance(value, float):
+                    cells.append('%.6f' % value if value != int(value) else '%d' % value)
+                else:
+                    cells.append(str(value))
+            out.write(','.join(cells) + '\n')
+        count += len(records)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='텔레메트리 파일을 CSV 로 바꿉니다.')
+    parser.add_argument('log')
+    parser.add_argument('-o', '--output', help='CSV 파일 (없으면 화면에 출력)')
+    args = parser.parse_args(argv)
+
+    if args.output:
+        with open(args.output, 'w') as out:
+            count = write_csv(args.log, out)
+        print('%d records -> %s' % (count, args.output))
+    else:
+        write_csv(args.log, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+"""터치 센서를 따로 빠르게 읽어 눌림/뗌 순간을 정확한 시각으로 잡는 터치 입력 계층입니다.
+
+손날 버튼의 클릭과 길게 누르기를 루프에서 읽은 값으로 가르면, 판단 시각의 정밀도가
+루프 주기와 그 사이에 걸린 다른 일에 묶이고, 루프 한 번보다 짧은 터치는 아예 놓칩니다.
+TouchWatcher 는 터치 센서들을 period(기본 1 ms) 마다 읽어 센서마다 다음 사건을 만듭니다.
+
+- PRESS / RELEASE: Debouncer 로 debounce_s 동안 이어진 값만 바뀐 것으로 보고, 시각은 새 값을
+  처음 읽은 시각으로 잡습니다. RELEASE 의 duration 은 누르고 있던 시간입니다.
+- CLICK: 뗄 때 누른 시간이 click_min_s 와 click_max_s 사이면 RELEASE 바로 뒤에 냅니다.
+- LONG_PRESS: 누른 채 long_press_s 가 지나면 냅니다. 시각은 누른 시각 + long_press_s 이고,
+  그 뒤에 떼면 CLICK 은 내지 않습니다.
+
+사건은 큐에 쌓였다가 제어기가 drain() 으로 가져가 'touch' 센서 값으로 트리거에 넘깁니다.
+(robot_hand.triggers 의 PalmPress, SideGesture) subscribe(handler) 로 등록한 함수는 감시
+스레드에서 사건이 나는 순간 불리므로 인터럽트 처리기처럼 짧고 스레드 안전해야 합니다.
+
+start() 로 스레드를 띄우지 않고 poll() 을 직접 불러도 됩니다. 가상 시계로 돌리는
+시뮬레이터는 스케줄러가 period 마다 poll() 을 부릅니다. 감시 스레드는 센서를 읽다 난
+예외를 errors 에 남기고 계속 돌며, 제어기는 check() 로 확인해서 멈춥니다.
+"""
+
+import threading
+from collections import deque, namedtuple
+from time import sleep, time
+
+# 제어기에서 터치 사건 묶음이 들어오는 센서 이름
+TOUCH = 'touch'
+
+# 사건 종류
+PRESS = 'press'
+RELEASE = 'release'
+CLICK = 'click'
+LONG_PRESS = 'long_press'
+
+# duration: RELEASE/CLICK 은 누르고 있던 시간, LONG_PRESS 는 long_press_s, PRESS 는 0
+TouchEvent = namedtuple('TouchEvent', 'source kind timestamp duration')
+
+
+class Debouncer(object):
+    """새 값이 debounce_s 동안 이어져야 바뀐 것으로 봅니다."""
+
+    __slots__ = ('debounce_s', 'pressed', '_since')
+
+    def __init__(self, debounce_s=0.004, pressed=False):
+        self.debounce_s = debounce_s
+        self.pressed = pressed  # 확정된 값
+        self._since = None      # 확정된 값과 다른 값을 처음 읽은 시각
+
+    def update(self, now, raw):
+        """확정된 값이 바뀌면 새 값을 처음 읽은 시각을, 아니면 None 을 반환합니다."""
+        if raw == self.pressed:
+            self._since = None
+            return None
+        if self._since is None:
+            self._since = now
+        if now - self._since >= self.debounce_s:
+            since, self._since = self._since, None
+            self.pressed = raw
+            return since
+        return None
+
+
+class TouchChannel(object):
+    """터치 센서 하나의 디바운스와 클릭/길게 누르기 판단입니다."""
+
+    def __init__(self, name, read, debounce_s=0.004, click_min_s=0.1, click_max_s=2.0,
+                 long_press_s=3.0):
+        self.name = name
+        self.read = read
+        self.debouncer = Debouncer(debounce_s)
+        self.click_min_s = click_min_s
+        self.click_max_s = click_max_s
+        self.long_press_s = long_press_s
+        self.press_time = None
+        self.long_sent = False
+
+    @property
+    def pressed(self):
+        return self.debouncer.pressed
+
+    def poll(self, now, emit):
+        """센서를 한 번 읽고 생긴 사건마다 emit(TouchEvent) 를 부릅니다."""
+        edge = self.debouncer.update(now, bool(self.read()))
+        if edge is not None:
+            if self.debouncer.pressed:
+                self.press_time = edge
+                self.long_sent = False
+                emit(TouchEvent(self.name, PRESS, edge, 0.0))
+            elif self.press_time is not None:
+                held = edge - self.press_time
+                self.press_time = None
+                emit(TouchEvent(self.name, RELEASE, edge, held))
+                if not self.long_sent and self.click_min_s < held < self.click_max_s:
+                    emit(TouchEvent(self.name, CLICK, edge, held))
+        elif (self.press_time is not None and not self.long_sent and self.long_press_s and
+              now - self.press_time >= self.long_press_s):
+            self.long_sent = True
+            emit(TouchEvent(self.name, LONG_PRESS, self.press_time + self.long_press_s,
+                            self.long_press_s))
+
+
+class TouchWatcher(object):
+    """터치 센서들을 period 마다 읽어 TouchEvent 를 만드는 감시기입니다."""
+
+    def __init__(self, clock=time, sleep=sleep, period=0.001):
+        self.clock = clock
+        self.sleep = sleep
+        self.period = period
+        self.channels = {}
+        self.polls = 0
+        self.max_gap = 0.0  # 감시 스레드가 읽은 간격의 최댓값 (정밀도 확인용)
+        self.errors = {}    # 이름 -> 감시 스레드가 센서를 읽다 난 마지막 예외
+        self._events = deque()
+        self._handlers = []
+        self._last_poll = None
+        self._thread = None
+        self._running = False
+
+    def add(self, name, read, debounce_s=0.004, click_min_s=0.1, click_max_s=2.0,
+            long_press_s=3.0):
+        self.channels[name] = TouchChannel(name, read, debounce_s, click_min_s, click_max_s,
+                                           long_press_s)
+        return self.channels[name]
+
+    def subscribe(self, handler):
+        """사건이 날 때 감시 스레드에서 바로 handler(TouchEvent) 를 부르도록 등록합니다."""
+        self._handlers.append(handler)
+
+    def reader(self, name):
+        """디바운스한 눌림 상태를 반환하는 읽기 함수입니다. (센서를 다시 읽지 않음)"""
+        channel = self.channels[name]
+        return lambda: channel.debouncer.pressed
+
+    def poll(self, errors=None):
+        """터치 센서들을 한 번 읽습니다.
+
+        errors 가 없으면 읽다 난 예외를 그대로 올리고, 있으면 센서 이름별로 남기고
+        나머지 센서를 계속 읽습니다.
+        """
+        now = self.clock()
+        if self._last_poll is not None and now - self._last_poll > self.max_gap:
+            self.max_gap = now - self._last_poll
+        self._last_poll = now
+        self.polls += 1
+        for channel in self.channels.values():
+            if errors is None:
+                channel.poll(now, self._emit)
+                continue
+            try:
+                channel.poll(now, self._emit)
+            except Exception as e:
+                errors[channel.name] = e
+
+    def _emit(self, event):
+        self._events.append(event)
+        for handler in self._handlers:
+            handler(event)
+
+    def drain(self):
+        """지난번 drain() 뒤에 생긴 사건들을 튜플로 반환합니다."""
+        events = self._events
+        if not events:
+            return ()
+        drained = []
+        while events:
+            drained.append(events.popleft())
+        return tuple(drained)
+
+    def check(self):
+        """감시 스레드가 센서를 읽다 예외가 났으면 그 예외를 다시 올립니다."""
+        if self.errors:
+            raise self.errors[sorted(self.errors)[0]]
+
+    # --- 감시 스레드 ---
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name='touch-watcher')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        due = self.clock()
+        while self._running:
+            # 센서가 빠져도 스레드가 소리 없이 끝나지 않게 예외는 errors 에 남깁니다.
+            self.poll(self.errors)
+            due += self.period
+            delay = due - self.clock()
+            if delay > 0:
+                self.sleep(delay)
+            else:
+                due = self.clock()  # 밀렸으면 따라잡으려고 몰아 읽지 않습니다.
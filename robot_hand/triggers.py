@@ -0,0 +1,449 @@
+"""HandController 에 끼워 쓰는 잡기/놓기 트리거들입니다.
+
+트리거는 매 틱마다 update(now, values) 로 한 번씩 평가되고, 조건을 만족하면
+동작 이름(GRASP, RELEASE, RESET)을, 아니면 None 을 반환합니다. values 는
+제어기가 최신 센서 값을 넣어 두는 딕셔너리입니다. (자이로는 'gyro' 에 각도,
+'gyro_rate' 에 각속도, gyro 샘플 이벤트의 값은 (각도, 각속도) 입니다) 틱마다 새 객체를 만들지
+않도록 상태는 모두 트리거 속성에 둡니다.
+
+active_states 에 있는 손 상태에서만 평가되며, 그 상태로 처음 들어올 때
+reset(now, values) 이 불립니다. sources 에 센서 이름을 적어 두면 그 센서의
+샘플이 들어올 때마다 손 상태와 상관없이 sample(event) 도 불립니다.
+
+HandConfig 의 touch_watcher 를 켜면 'touch' 센서 샘플의 값은 감시 스레드가 잡은
+TouchEvent 튜플입니다. (robot_hand.touch, PalmPress 와 SideGesture 가 씀)
+
+틱 없이 도는 robot_hand.aio 실행기는 sources 나 inputs 센서에 새 값이 오거나
+next_deadline() 시각이 되었을 때만 update 를 부릅니다.
+"""
+
+from robot_hand.filters import ApproachSpeed, ProximityFilter
+from robot_hand.gestures import GestureRecognizer
+from robot_hand.gyro import SwingDetector
+from robot_hand.poses import choose_pose
+from robot_hand.states import CLOSED, GRASP_SETTLING, OPEN, STATES
+from robot_hand.touch import CLICK, LONG_PRESS, PRESS, RELEASE as TOUCH_RELEASE, TOUCH
+
+# 트리거가 요청하는 동작
+GRASP = 'grasp'
+RELEASE = 'release'
+RESET = 'reset'
+# 손날 제스처로 요청하는 동작 (SideGestures): 쥔 채로 조금 펴기, 더 조이기,
+# 자이로 놓기 잠금/풀기 (잠긴 동안에도 손날 버튼으로는 놓을 수 있음)
+PARTIAL_OPEN = 'partial_open'
+TIGHTEN = 'tighten'
+LOCK = 'lock'
+# 다음 잡기에 쓸 자세를 고름 (트리거의 pose, robot_hand.poses)
+SELECT_POSE = 'select_pose'
+
+
+class Trigger(object):
+    """트리거 기본 클래스입니다."""
+
+    name = 'trigger'
+    active_states = ()
+    uses_gyro = False  # 자이로 동작으로 놓으면 놓기 전 대기, 자이로 리셋, 놓은 뒤 대기를 적용
+    manual = False     # 사용자가 버튼으로 직접 놓은 경우 (solution-1 의 다시 잡기 잠금)
+    sources = ()       # 샘플마다 sample(event) 를 받을 센서 이름
+    inputs = ()        # update 가 values 에서 읽는 센서 이름 (sources 는 빼고)
+    pose = None        # GRASP 나 SELECT_POSE 를 요청할 때 고른 자세 이름 (None 이면 제어기 기본)
+    pose_names = ()    # 고를 수 있는 자세 이름 (제어기가 시작할 때 자세 표에 있는지 확인)
+
+    def reset(self, now, values):
+        pass
+
+    def sample(self, event):
+        pass
+
+    def update(self, now, values):
+        return None
+
+    def progress(self):
+        """텔레메트리용 (센 횟수, 보고 있는 각도) 입니다."""
+        return 0, 0.0
+
+    def next_deadline(self):
+        """새 센서 값이 없어도 update 가 동작을 요청할 수 있는 가장 이른 시각입니다."""
+        return None
+
+
+# ==========================================
+# 잡기 트리거
+# ==========================================
+class UltrasonicDwell(Trigger):
+    """물체가 distance_cm 보다 가까이 duration_s 넘게 머물면 잡습니다.
+
+    거리는 ProximityFilter 로 거르므로 튀는 값이나 측정 실패 몇 번으로는
+    감지 지속 시간이 처음부터 다시 시작되지 않습니다.
+
+    rules (예: poses.POSE_RULES) 를 주면 물체가 멈춘 거리와 감지 거리까지 다가온 평균 속도로
+    잡기 자세를 골라 pose 에 둡니다.
+    """
+
+    name = 'ultrasonic'
+    active_states = (OPEN,)
+    sources = ('ultrasonic',)
+
+    def __init__(self, distance_cm=5, duration_s=2, release_cm=None, window=5, max_dropouts=3,
+                 rules=None):
+        self.distance_cm = distance_cm
+        self.duration_s = duration_s
+        if release_cm is None:
+            release_cm = distance_cm + 1
+        self.filter = ProximityFilter(distance_cm, release_cm, window, max_dropouts)
+        self.first_near = None  # 가까운 값이 이어지기 시작한 시각 (중앙값 지연 보정)
+        self.start_time = None
+        self.rules = rules
+        self.approach = ApproachSpeed() if rules is not None else None
+        self.pose_names = tuple(rule.pose for rule in rules or ())
+
+    def reset(self, now, values):
+        self.first_near = None
+        self.start_time = None
+        if self.approach is not None:
+            self.approach.reset()
+
+    def sample(self, event):
+        value = event.value
+        if 0 < value < self.distance_cm:
+            if self.first_near is None:
+                self.first_near = event.timestamp
+        elif value < self.filter.valid_max_cm:
+            self.first_near = None
+        if self.filter.update(value):
+            if self.start_time is None:
+                # 중앙값이 바뀌기까지 걸린 샘플만큼 늦지 않도록 처음 가까워진 시각부터 잽니다.
+                self.start_time = self.first_near if self.first_near is not None else event.timestamp
+        else:
+            self.start_time = None
+            # 감지 거리 안에 들어오기까지 다가온 속도만 잽니다.
+            if self.approach is not None and 0 < value < self.filter.valid_max_cm:
+                self.approach.update(event.timestamp, self.filter.distance)
+
+    def update(self, now, values):
+        if self.start_time is not None and now - self.start_time > self.duration_s:
+            self.start_time = None
+            if self.rules is not None:
+                self.pose = choose_pose(self.rules, self.filter.distance, self.approach.approach)
+            return GRASP
+        return None
+
+    def next_deadline(self):
+        return None if self.start_time is None else self.start_time + self.duration_s
+
+
+class PalmTouch(Trigger):
+    """손바닥 터치 센서가 눌려 있으면 잡습니다."""
+
+    name = 'palm_touch'
+    active_states = (OPEN,)
+    inputs = ('palm_touch',)
+
+    def update(self, now, values):
+        return GRASP if values['palm_touch'] else None
+
+
+# ==========================================
+# 놓기 트리거
+# ==========================================
+class GyroRotationInterval(Trigger):
+    """interval_s 마다 각도 변화를 보고, 한 방향 회전 뒤 반대 방향 회전을 한 번으로 셉니다.
+
+    robort_hand_new_version.py 가 예전에 쓰던 자이로 놓기 방식입니다. 지금 스크립트는
+    GyroRateSwing 을 씁니다.
+    """
+
+    name = 'gyro_rotation'
+    active_states = (GRASP_SETTLING, CLOSED)
+    uses_gyro = True
+
+    def __init__(self, angle_threshold=90, interval_s=1.0, count_target=2):
+        self.angle_threshold = angle_threshold
+        self.interval_s = interval_s
+        self.count_target = count_target
+        self.last_check_time = 0.0
+        self.last_angle = 0
+        self.direction = 0  # 0: 중심, 1: +, -1: -
+        self.count = 0
+
+    def reset(self, now, values):
+        self.last_check_time = now
+        self.last_angle = values['gyro']
+        self.direction = 0
+        self.count = 0
+
+    def update(self, now, values):
+        if now - self.last_check_time < self.interval_s:
+            return None
+        angle = values['gyro']
+        change = angle - self.last_angle
+        threshold = self.angle_threshold
+        if self.direction == 0:
+            if change > threshold:
+                self.direction = 1
+            elif change < -threshold:
+                self.direction = -1
+        elif self.direction * change < -threshold:
+            self.count += 1
+            self.direction = 0
+        self.last_check_time = now
+        self.last_angle = angle
+
+        if self.count >= self.count_target:
+            self.count = 0
+            self.direction = 0
+            return RELEASE
+        return None
+
+    def progress(self):
+        return self.count, self.last_angle
+
+    def next_deadline(self):
+        return self.last_check_time + self.interval_s
+
+
+class GyroSwingCount(Trigger):
+    """각도가 +threshold 와 -threshold 를 번갈아 넘은 횟수를 셉니다.
+
+    robort_hand_demo3.py, solution-2 의 자이로 놓기 방식입니다.
+    """
+
+    name = 'gyro_swing'
+    active_states = (GRASP_SETTLING, CLOSED)
+    uses_gyro = True
+    inputs = ('gyro',)
+
+    def __init__(self, threshold=85, count_target=3):
+        self.threshold = threshold
+        self.count_target = count_target
+        self.side = 0  # 0: 중심, 1: positive, -1: negative
+        self.count = 0
+        self.angle = 0
+
+    def reset(self, now, values):
+        self.side = 0
+        self.count = 0
+
+    def progress(self):
+        return self.count, self.angle
+
+    def update(self, now, values):
+        angle = self.angle = values['gyro']
+        if angle > self.threshold:
+            side = 1
+        elif angle < -self.threshold:
+            side = -1
+        else:
+            return None
+        if self.side == 0:
+            self.side = side
+        elif side != self.side:
+            self.side = side
+            self.count += 1
+            if self.count >= self.count_target:
+                self.count = 0
+                self.side = 0
+                return RELEASE
+        return None
+
+
+class GyroRateSwing(Trigger):
+    """자이로 각속도를 샘플마다 적분해 팔을 count_target 번 흔들면 놓습니다.
+
+    흔들기가 끝나는 샘플에서 바로 놓으며, 절대 각도를 쓰지 않으므로 드리프트에
+    영향을 받지 않습니다. (robot_hand.gyro.SwingDetector)
+    """
+
+    name = 'gyro_rate_swing'
+    active_states = (GRASP_SETTLING, CLOSED)
+    uses_gyro = True
+    sources = ('gyro',)
+
+    def __init__(self, amplitude_deg=45, count_target=2, **options):
+        self.count_target = count_target
+        self.detector = SwingDetector(amplitude_deg, count_target, **options)
+        self.fired = False
+
+    def reset(self, now, values):
+        # 센 횟수만 지웁니다. 닫히기 전에 끝난 흔들기는 세지 않고, 닫히기 전에 시작해
+        # 아직 끝나지 않은 흔들기는 계속 따라가다가 끝나면 셉니다.
+        self.detector.reset()
+        self.fired = False
+
+    def sample(self, event):
+        if self.detector.update(event.timestamp, event.value[1]):
+            self.fired = True
+
+    def progress(self):
+        return self.detector.count, self.detector.angle
+
+    def update(self, now, values):
+        if self.fired:
+            self.fired = False
+            return RELEASE
+        return None
+
+
+# ==========================================
+# 손날 버튼 (놓기 / 리셋)
+# ==========================================
+# SideClick 버튼 상태
+BUTTON_RELEASED, BUTTON_PRESSING, BUTTON_ACTION_TAKEN = range(3)
+
+
+class SideClick(Trigger):
+    """짧게 클릭하면 놓고, long_press_s 이상 누르면 모터 위치를 리셋합니다."""
+
+    name = 'side_touch'
+    active_states = STATES
+    manual = True
+    inputs = ('side_touch',)
+
+    def __init__(self, click_min_s=0.1, click_max_s=2.0, long_press_s=3.0):
+        self.click_min_s = click_min_s
+        self.click_max_s = click_max_s
+        self.long_press_s = long_press_s
+        self.state = BUTTON_RELEASED
+        self.press_time = 0.0
+
+    def update(self, now, values):
+        if values['side_touch']:
+            if self.state == BUTTON_RELEASED:
+                self.state = BUTTON_PRESSING
+                self.press_time = now
+            elif self.state == BUTTON_PRESSING and now - self.press_time >= self.long_press_s:
+                self.state = BUTTON_ACTION_TAKEN
+                return RESET
+        elif self.state != BUTTON_RELEASED:
+            pressing = self.state == BUTTON_PRESSING
+            self.state = BUTTON_RELEASED
+            if pressing and self.click_min_s < now - self.press_time < self.click_max_s:
+                return RELEASE
+        return None
+
+    def next_deadline(self):
+        if self.state == BUTTON_PRESSING:
+            return self.press_time + self.long_press_s
+        return None
+
+
+# ==========================================
+# 터치 감시 사건으로 판단하는 트리거 (HandConfig 의 touch_watcher)
+# ==========================================
+class PalmPress(Trigger):
+    """손바닥 터치 센서가 눌려 있거나 열린 뒤 한 번이라도 눌렸으면 잡습니다.
+
+    PalmTouch 와 같지만 틱 사이에 눌렀다 뗀 짧은 터치도 놓치지 않습니다.
+    """
+
+    name = 'palm_touch'
+    active_states = (OPEN,)
+    sources = (TOUCH,)
+
+    def __init__(self):
+        self.pressed = False
+        self.tapped = False  # 눌렀다가 이미 뗐더라도 잡기를 요청
+
+    def reset(self, now, values):
+        # 열리기 전에 누른 것은 세지 않지만, 누른 채로 열리면 PalmTouch 처럼 잡습니다.
+        self.tapped = False
+
+    def sample(self, event):
+        for touch in event.value:
+            if touch.source == 'palm_touch':
+                if touch.kind == PRESS:
+                    self.pressed = self.tapped = True
+                elif touch.kind == TOUCH_RELEASE:
+                    self.pressed = False
+
+    def update(self, now, values):
+        if self.pressed or self.tapped:
+            self.tapped = False
+            return GRASP
+        return None
+
+
+class SideGesture(Trigger):
+    """손날 버튼 클릭으로 놓고, 길게 누르면 모터 위치를 리셋합니다.
+
+    SideClick 과 같지만 클릭과 길게 누르기는 감시 스레드가 누른 시각과 뗀 시각으로
+    가르므로 루프가 늦어도 누른 시간을 잘못 재지 않습니다. (기준 시간은 HandConfig 의
+    click_min_s, click_max_s, long_press_s)
+    """
+
+    name = 'side_touch'
+    active_states = STATES
+    manual = True
+    sources = (TOUCH,)
+    ACTIONS = {CLICK: RELEASE, LONG_PRESS: RESET}
+
+    def __init__(self):
+        self.pending = None
+
+    def sample(self, event):
+        for touch in event.value:
+            if touch.source == 'side_touch' and touch.kind in self.ACTIONS:
+                self.pending = self.ACTIONS[touch.kind]
+
+    def update(self, now, values):
+        action, self.pending = self.pending, None
+        return action
+
+
+class SideGestures(Trigger):
+    """손날 버튼 제스처마다 동작을 묶습니다. (robot_hand.gestures)
+
+    bindings 는 제스처 이름 -> 동작 딕셔너리이며, 기본값은 SideGesture 와 같은
+    {'click': RELEASE, 'hold_3': RESET} 입니다. 예:
+
+        SideGestures({'click': RELEASE, 'hold_3': RESET, 'hold_1': TIGHTEN,
+                      'double_click': PARTIAL_OPEN, 'triple_click': LOCK})
+
+    클릭으로 시작하는 제스처를 더 묶으면 click 은 multi_click_s 동안 다음 클릭을 기다립니다.
+
+    poses 는 제스처 이름 -> 자세 이름 딕셔너리이며, 그 제스처는 다음 잡기에 쓸 자세를
+    고릅니다. (SELECT_POSE, 예: {'double_click': PINCH})
+    """
+
+    name = 'side_touch'
+    active_states = STATES
+    manual = True
+    sources = (TOUCH,)
+
+    def __init__(self, bindings=None, click_min_s=0.1, click_max_s=2.0, multi_click_s=0.4,
+                 poses=None):
+        self.bindings = dict(bindings if bindings is not None else {'click': RELEASE,
+                                                                    'hold_3': RESET})
+        self.poses = dict(poses or {})
+        both = set(self.bindings) & set(self.poses)
+        if both:
+            raise ValueError('동작과 자세에 함께 묶인 제스처입니다: ' + ', '.join(sorted(both)))
+        self.pose_names = tuple(sorted(set(self.poses.values())))
+        self.recognizer = GestureRecognizer(list(self.bindings) + list(self.poses),
+                                            click_min_s, click_max_s, multi_click_s)
+        self.pending = None
+        self.gesture = None  # 마지막으로 알아본 GestureEvent
+
+    def _take(self, gesture):
+        if gesture is None:
+            return
+        self.gesture = gesture
+        pose = self.poses.get(gesture.name)
+        if pose is None:
+            self.pending = self.bindings[gesture.name]
+        else:
+            self.pose = pose
+            self.pending = SELECT_POSE
+
+    def sample(self, event):
+        for touch in event.value:
+            if touch.source == 'side_touch':
+                self._take(self.recognizer.feed(touch))
+
+    def update(self, now, values):
+        self._take(self.recognizer.poll(now))
+        action, self.pending = self.pending, None
+        return action
+
+    def next_deadline(self):
+        return self.recognizer.next_deadline()
@@ -0,0 +1,85 @@
+"""캡처한 세션 파일을 읽고 같은 제어기로 재생해 봅니다."""
+
+import pytest
+
+from robot_hand.capture import GYRO, ULTRASONIC, CaptureRecorder, read_session, read_sessions
+from robot_hand.clock import VirtualClock
+from robot_hand.controller import PRESETS, HandController
+from robot_hand.replay import replay
+from robot_hand.scenarios import Scenario
+from robot_hand.sim import run_controller
+from robot_hand.triggers import GRASP, RELEASE
+
+
+def scenario():
+    # 재생할 때는 빈 손으로 닫으므로 다 닫은 뒤에 흔듭니다.
+    return Scenario('offer_swing', 26.0).approach(at=1.0, hold=12.0).swing(at=14.0, count=2)
+
+
+def capture_run(path):
+    """scenario() 를 캡처를 켜고 돌린 판단 기록입니다."""
+    config, triggers = PRESETS['new_version']()
+    config = config.replace(capture_path=path)
+    controllers = []
+
+    def make(devices, clock):
+        controllers.append(HandController(config, triggers, devices, clock))
+        return controllers[0]
+
+    run_controller(make, scenario(), seed=0)
+    return controllers[0].history
+
+
+def test_session_has_every_sensor_stream(tmp_path):
+    path = str(tmp_path / 'hand.rhss')
+    capture_run(path)
+    session = read_session(path)
+    assert session.name == 'hand'
+    assert set(session.streams) == {'ultrasonic', 'palm_touch', 'side_touch', 'gyro'}
+    times, values = session.streams['ultrasonic']
+    assert times == sorted(times) and min(values) < 5.0
+    assert all(isinstance(value, tuple) for value in session.streams['gyro'][1])
+    assert session.duration <= scenario().duration + 1.0
+
+
+def test_captured_session_replays_the_same_decisions(tmp_path):
+    path = str(tmp_path / 'hand.rhss')
+    history = capture_run(path)
+    config, triggers = PRESETS['new_version']()
+    replayed = replay(read_session(path),
+                      lambda devices, clock: HandController(config, triggers, devices, clock))
+    assert [action for _, action, _ in history] == [GRASP, RELEASE]
+    assert [action for _, action, _ in replayed.decisions] == [GRASP, RELEASE]
+    for (t, _, _), (replayed_t, _, _) in zip(history, replayed.decisions):
+        assert replayed_t == pytest.approx(t, abs=0.05)
+
+
+def record_session(path, clock, distances):
+    """clock 의 지금 시각부터 0.1 초마다 distances 를 기록하고 두 번 나눠 flush 합니다."""
+    recorder = CaptureRecorder(path, clock)
+    for i, distance in enumerate(distances):
+        recorder.record(ULTRASONIC, distance)
+        recorder.record(GYRO, i, 0)
+        if i == len(distances) // 2:
+            recorder.flush()
+        clock.sleep(0.1)
+    recorder.flush()
+
+
+def test_second_session_in_the_same_file_keeps_its_own_start(tmp_path):
+    path = str(tmp_path / 'day.rhss')
+    clock = VirtualClock(start=1000.0)
+    record_session(path, clock, [30.0, 20.0, 10.0, 4.0])
+    clock.sleep(3600.0)
+    record_session(path, clock, [50.0, 3.0, 3.5])
+
+    first, second = read_sessions(path)
+    assert (first.name, second.name) == ('day', 'day.2')
+    times, values = first.streams['ultrasonic']
+    assert times == pytest.approx([0.0, 0.1, 0.2, 0.3]) and values == [30.0, 20.0, 10.0, 4.0]
+    times, values = second.streams['ultrasonic']
+    assert times == pytest.approx([0.0, 0.1, 0.2]) and values == [50.0, 3.0, 3.5]
+    assert second.duration == pytest.approx(0.2)
+    assert len(second.streams['gyro'][0]) == 3
+    with pytest.raises(ValueError):
+        read_session(path)
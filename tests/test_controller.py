@@ -0,0 +1,79 @@
+"""HandController 프리셋을 시뮬레이터 시나리오로 돌려 판단 순서와 모터 명령을 확인합니다."""
+
+import os
+
+import pytest
+
+from robot_hand.controller import (PRESETS, HandConfig, HandController, default_triggers,
+                                   make_controller)
+from robot_hand.scenarios import (PALM, SCENARIOS, SIDE, Scenario, object_approach,
+                                  side_long_press)
+from robot_hand.sim import run_controller, run_script
+from robot_hand.triggers import GRASP, RELEASE, RESET
+
+NEW_VERSION_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'robort_hand_new_version.py')
+
+
+def run_history(preset, scenario):
+    """preset 제어기로 scenario 를 돌린 판단 기록 (시각, 동작, 트리거 이름) 목록입니다."""
+    controllers = []
+
+    def make(devices, clock):
+        controllers.append(make_controller(preset, devices, clock))
+        return controllers[0]
+
+    run_controller(make, scenario, seed=0)
+    return controllers[0].history
+
+
+@pytest.mark.parametrize('preset', ['new_version', 'solution-1', 'demo3'])
+def test_grasps_near_object_and_releases_on_swing(preset):
+    scenario = object_approach()
+    history = run_history(preset, scenario)
+    assert [action for _, action, _ in history] == [GRASP, RELEASE]
+    assert history[0][0] >= scenario.mark('object_arrived')
+    assert history[1][0] >= scenario.mark('swing_start')
+
+
+@pytest.mark.parametrize('preset', sorted(PRESETS))
+def test_palm_grasp_side_release_and_long_press_reset(preset):
+    scenario = side_long_press()
+    history = run_history(preset, scenario)
+    assert [action for _, action, _ in history] == [GRASP, RELEASE, RESET]
+    (click, _), (long_press, _) = scenario.presses[SIDE]
+    assert history[0][0] >= scenario.mark(PALM + '_press')
+    assert click <= history[1][0] < click + 1.0
+    assert history[2][0] >= long_press + 3.0
+
+
+def test_slow_side_click_still_releases():
+    # CLICK_MAX_S 보다 짧게 누르면 1 초를 넘겨도 클릭으로 놓습니다.
+    scenario = Scenario('slow_click', 12.0).press(PALM, at=3.0, duration=0.5).press(
+        SIDE, at=6.0, duration=1.5)
+    world = run_script(NEW_VERSION_SCRIPT, scenario, seed=0).world
+    release = [entry for entry in world.commands('on_to_position') if entry.value == 0]
+    assert release and 7.5 <= release[0].time < 8.0
+
+
+@pytest.mark.parametrize('ramp_ms', [300, 1500])
+def test_adaptive_grasp_waits_out_the_ramp_before_looking_for_contact(ramp_ms):
+    # 빈 손이면 천천히 가속하더라도 닿았다고 보지 않고 끝까지 닫습니다.
+    config = HandConfig(adaptive_grasp=True, sync_motion=True, ramp_ms=ramp_ms)
+    controllers = []
+
+    def make(devices, clock):
+        controllers.append(HandController(config, default_triggers(), devices, clock))
+        return controllers[0]
+
+    scenario = Scenario('empty_grasp', 6.0).press(PALM, at=1.0, duration=0.3)
+    scenario.object_fraction = None
+    run_controller(make, scenario, seed=0)
+    assert controllers[0].grasp_tracker.contacts == [None, None, None]
+
+
+@pytest.mark.parametrize('name', sorted(SCENARIOS))
+def test_new_version_preset_moves_like_the_script(name):
+    script = run_script(NEW_VERSION_SCRIPT, SCENARIOS[name](), seed=0).world
+    preset = run_controller('new_version', SCENARIOS[name](), seed=0).world
+    assert script.commands('on_to_position') == preset.commands('on_to_position')
@@ -0,0 +1,55 @@
+"""스트리밍 필터를 정해 둔 값과 직접 계산한 값에 비교합니다."""
+
+import random
+import statistics
+
+import pytest
+
+from robot_hand.filters import ApproachSpeed, ProximityFilter, SlidingMedian
+
+
+def test_sliding_median_matches_window_median():
+    rng = random.Random(3)
+    window = SlidingMedian(5)
+    values = []
+    for _ in range(500):
+        value = rng.choice([rng.uniform(0, 20), 255.0, 3.0])
+        values.append(value)
+        assert window.push(value) == statistics.median(values[-5:])
+    assert len(window) == 5
+
+
+def test_sliding_median_rejects_empty_window():
+    with pytest.raises(ValueError):
+        SlidingMedian(0)
+    assert SlidingMedian(3).median is None
+
+
+def test_proximity_filter_ignores_spikes_and_dropouts():
+    proximity = ProximityFilter(near_cm=5, release_cm=6, window=3, max_dropouts=2)
+    assert [proximity.update(v) for v in (30, 3, 3)] == [False, False, True]
+    # 튀는 값 하나와 측정 실패 두 번은 판단을 바꾸지 못합니다.
+    assert [proximity.update(v) for v in (40, 3, 255, 255)] == [True] * 4
+    # 히스테리시스: 5.5 cm 는 아직 감지, 멀어져야 해제합니다.
+    assert [proximity.update(v) for v in (5.5, 5.5, 30, 30)] == [True, True, True, False]
+
+
+def test_proximity_filter_counts_long_dropouts():
+    proximity = ProximityFilter(near_cm=5, window=1, max_dropouts=2)
+    proximity.update(3)
+    assert [proximity.update(255) for _ in range(3)] == [True, True, False]
+
+
+def test_approach_speed_averages_over_the_approach():
+    speed = ApproachSpeed(span=4)
+    rng = random.Random(5)
+    for i in range(40):
+        now = i * 0.1
+        distance = 50.0 - 10.0 * now + rng.uniform(-0.5, 0.5)
+        speed.update(now, distance)
+    assert speed.approach == pytest.approx(10.0, abs=0.5)
+    # 멈추면 다가오는 속도는 다시 0 부터 잽니다.
+    for i in range(40, 50):
+        speed.update(i * 0.1, 10.0)
+    assert speed.approach == 0.0
+    assert speed.speed == 0.0
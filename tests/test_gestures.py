@@ -0,0 +1,71 @@
+"""GestureRecognizer 에 누름/뗌 사건을 넣어 알아본 제스처와 시각을 확인합니다."""
+
+import pytest
+
+from robot_hand.gestures import Gesture, GestureEvent, GestureRecognizer, parse_gesture
+from robot_hand.touch import PRESS, RELEASE, TouchEvent
+
+
+def touches(recognizer, presses, until, step=0.001):
+    """(누른 시각, 뗀 시각) 목록대로 누르며 step 마다 poll 하고 알아본 제스처를 모읍니다."""
+    events = []
+    for start, end in presses:
+        events.append(TouchEvent('side', PRESS, start, 0.0))
+        events.append(TouchEvent('side', RELEASE, end, end - start))
+    found = []
+    now = 0.0
+    for event in events + [None]:
+        stop = until if event is None else event.timestamp
+        while now < stop:
+            found.append(recognizer.poll(now))
+            now = round(now + step, 6)
+        if event is not None:
+            found.append(recognizer.feed(event))
+    return [gesture for gesture in found if gesture is not None]
+
+
+def test_parse_gesture():
+    assert parse_gesture('click') == Gesture(1, 0.0)
+    assert parse_gesture('hold_1.5') == Gesture(0, 1.5)
+    assert parse_gesture('double_click_hold_1') == Gesture(2, 1.0)
+    for name in ('quadruple_click', 'hold_0', 'hold_x'):
+        with pytest.raises(ValueError):
+            parse_gesture(name)
+
+
+def test_click_is_reported_on_release_without_multi_click():
+    recognizer = GestureRecognizer(['click', 'hold_3'])
+    assert touches(recognizer, [(1.0, 1.3)], 3.0) == [GestureEvent('click', 1.3)]
+
+
+def test_click_waits_for_double_click_window():
+    recognizer = GestureRecognizer(['click', 'double_click'], multi_click_s=0.4)
+    assert touches(recognizer, [(1.0, 1.2)], 3.0) == [GestureEvent('click', 1.6)]
+    assert touches(recognizer, [(1.0, 1.2), (1.4, 1.6)], 3.0) == [
+        GestureEvent('double_click', 1.6)]
+
+
+def test_hold_tiers():
+    recognizer = GestureRecognizer(['hold_1', 'hold_3'])
+    # 가장 긴 단계는 그 시간이 되는 순간, 짧은 단계는 뗄 때 알립니다.
+    assert touches(recognizer, [(1.0, 5.0)], 6.0) == [GestureEvent('hold_3', 4.0)]
+    assert touches(recognizer, [(1.0, 2.5)], 6.0) == [GestureEvent('hold_1', 2.5)]
+
+
+def test_click_then_hold():
+    recognizer = GestureRecognizer(['click', 'click_hold_1'])
+    assert touches(recognizer, [(1.0, 1.2), (1.4, 3.0)], 4.0) == [
+        GestureEvent('click_hold_1', 2.4)]
+
+
+def test_too_short_and_too_long_presses_are_ignored():
+    recognizer = GestureRecognizer(['click'], click_min_s=0.1, click_max_s=2.0)
+    assert touches(recognizer, [(1.0, 1.05), (2.0, 4.5)], 6.0) == []
+
+
+def test_next_deadline():
+    recognizer = GestureRecognizer(['click', 'double_click', 'hold_3'], multi_click_s=0.4)
+    recognizer.feed(TouchEvent('side', PRESS, 1.0, 0.0))
+    assert recognizer.next_deadline() == 4.0
+    recognizer.feed(TouchEvent('side', RELEASE, 1.2, 0.2))
+    assert recognizer.next_deadline() == pytest.approx(1.6)
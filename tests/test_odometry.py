@@ -0,0 +1,66 @@
+"""FingerOdometry 의 예측을 시뮬레이터 모터의 실제 위치와 비교합니다."""
+
+import pytest
+
+from robot_hand.motion import DONE, STALLED
+from robot_hand.odometry import UNKNOWN, FingerOdometry, travel
+from robot_hand.scenarios import Scenario
+from robot_hand.sim import SimMotor, SimWorld, SpeedPercent
+
+
+def test_travel_accelerates_then_cruises():
+    assert travel(0.0, 600.0, 6000.0) == 0.0
+    assert travel(0.05, 600.0, 6000.0) == pytest.approx(7.5)
+    assert travel(1.0, 600.0, 6000.0) == pytest.approx(600.0 * 0.95)
+
+
+def make_motor(bound_deg=5.0):
+    world = SimWorld(Scenario('still', 10.0), noise=False)
+    motor = SimMotor(world, 'outA')
+    odometry = FingerOdometry(world.clock.time, bound_deg=bound_deg)
+    odometry.reset([motor])
+    return world.clock, motor, odometry
+
+
+def command(motor, odometry, speed, target):
+    motor.on_to_position(SpeedPercent(speed), target, block=False)
+    odometry.command(motor, 'on_to_position', SpeedPercent(speed), target)
+
+
+def test_prediction_stays_within_error_bound_while_moving():
+    clock, motor, odometry = make_motor(bound_deg=20.0)
+    command(motor, odometry, 30, -400)
+    for _ in range(150):
+        clock.sleep(0.01)
+        predicted = odometry.position(motor)
+        actual = motor.position
+        assert abs(predicted - actual) <= odometry.bound_deg + 1
+    assert odometry.predictions > odometry.reads > 0
+
+
+def test_done_motion_is_known_without_reading():
+    clock, motor, odometry = make_motor()
+    command(motor, odometry, 50, -200)
+    clock.sleep(1.0)
+    assert not motor.is_running
+    odometry.finish(motor, DONE)
+    reads = odometry.reads
+    assert odometry.position(motor) == -200
+    assert odometry.error(motor) == 1.0
+    assert odometry.reads == reads
+    assert not odometry.moving(motor)
+
+
+def test_stopped_motion_is_read_again():
+    clock, motor, odometry = make_motor()
+    command(motor, odometry, 50, -200)
+    clock.sleep(0.1)
+    motor.stop()
+    odometry.finish(motor, STALLED)
+    assert odometry.error(motor) == UNKNOWN
+    reads = odometry.reads
+    assert odometry.position(motor) == motor.position
+    assert odometry.reads == reads + 1
+    # 모터가 멈춘 것을 읽었으므로 그 뒤로는 예측합니다.
+    assert odometry.position(motor) == motor.position
+    assert odometry.reads == reads + 1
@@ -0,0 +1,81 @@
+"""SensorScheduler 를 가짜 시계로 돌려 샘플 시각, 타이머, 늦은 샘플을 확인합니다."""
+
+import pytest
+
+from robot_hand.scheduler import SensorScheduler, SensorSource
+
+
+class FakeClock(object):
+    """sleep() 하면 그만큼 바로 시간이 흐르는 시계입니다."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_scheduler():
+    clock = FakeClock()
+    return clock, SensorScheduler(clock.time, clock.sleep)
+
+
+def test_sources_are_sampled_on_their_own_period():
+    clock, scheduler = make_scheduler()
+    seen = {'fast': [], 'slow': []}
+    for name, period in (('fast', 0.01), ('slow', 0.1)):
+        scheduler.add_source(SensorSource(name, lambda: 0, period))
+        scheduler.subscribe(name, lambda event: seen[event.source].append(event.timestamp))
+    scheduler.call_at(0.995, scheduler.stop)
+    scheduler.run()
+
+    assert len(seen['fast']) == 100
+    assert len(seen['slow']) == 10
+    assert seen['slow'][3] == pytest.approx(0.3)
+    assert clock.now == pytest.approx(0.995)
+
+
+def test_only_changes_skips_repeated_values():
+    clock, scheduler = make_scheduler()
+    values = iter([1, 1, 2, 2, 2, 3])
+    events = []
+    scheduler.add_source(SensorSource('touch', lambda: next(values), 0.1, only_changes=True))
+    scheduler.subscribe('touch', events.append)
+    scheduler.call_at(0.55, scheduler.stop)
+    scheduler.run()
+
+    assert [event.value for event in events] == [1, 2, 3]
+    assert scheduler.sources['touch'].samples == 6
+
+
+def test_cancelled_timer_does_not_run():
+    clock, scheduler = make_scheduler()
+    calls = []
+    timer = scheduler.call_later(0.2, calls.append)
+    scheduler.call_later(0.3, calls.append)
+    scheduler.call_later(0.5, scheduler.stop)
+    timer.cancel()
+    scheduler.run()
+
+    assert calls == [0.3]
+
+
+def test_slow_read_is_marked_late_and_rescheduled_from_now():
+    clock, scheduler = make_scheduler()
+
+    def slow_read():
+        clock.sleep(0.25 if clock.now < 0.05 else 0.0)
+        return clock.now
+
+    events = []
+    scheduler.add_source(SensorSource('ultrasonic', slow_read, 0.1))
+    scheduler.subscribe('ultrasonic', events.append)
+    scheduler.call_at(0.4, scheduler.stop)
+    scheduler.run()
+
+    assert [event.late for event in events] == [True, False]
+    assert [event.timestamp for event in events] == pytest.approx([0.25, 0.35])
+    assert scheduler.sources['ultrasonic'].missed == 1
@@ -0,0 +1,91 @@
+"""전이 표 검사와 컴파일한 분기 표를 확인합니다."""
+
+from robot_hand.controller import HandController
+from robot_hand.states import GRASPING, OPEN
+from robot_hand.statetable import HAND_TABLE, Transition, compile_table, validate
+from robot_hand.triggers import GRASP, RELEASE
+
+
+def test_hand_table_is_valid():
+    assert validate(HAND_TABLE, HandController) == []
+
+
+def test_validate_reports_shadowed_and_unknown_rows():
+    table = (
+        Transition(OPEN, GRASP, None, None, GRASPING),
+        Transition(OPEN, GRASP, 'ready_to_grasp', None, GRASPING),
+        Transition(GRASPING, RELEASE, None, None, 'flying'),
+        Transition(GRASPING, RELEASE, None, None, OPEN, 'release_delay_s'),
+    )
+    problems = validate(table, states=(OPEN, GRASPING))
+    assert any('가려 실행되지 않습니다' in problem for problem in problems)
+    assert any('모르는 상태 flying' in problem for problem in problems)
+    assert any('duration 과 then' in problem for problem in problems)
+
+
+class Config(object):
+    wait_s = 1.5
+
+
+class Handler(object):
+    """표가 부르는 조건/동작과 상태 변경을 기록합니다."""
+
+    config = Config()
+
+    def __init__(self, allow=True, succeed=True):
+        self.allow = allow
+        self.succeed = succeed
+        self.state = 'idle'
+        self.calls = []
+
+    def _if_allowed(self, trigger):
+        return self.allow
+
+    def _do_start(self, trigger, now):
+        self.calls.append(('start', trigger, now))
+        return None if self.succeed else False
+
+    def _do_fallback(self, trigger, now):
+        self.calls.append(('fallback', trigger, now))
+
+    def _change_state(self, name, duration=None, then=None):
+        self.state = name
+        self.calls.append(('enter', name, duration, then))
+
+
+TABLE = (
+    Transition('idle', 'go', 'allowed', 'start', 'busy', 'wait_s', 'idle'),
+    Transition('idle', 'go', None, 'fallback'),
+    Transition('busy', 'stop', None, None, 'idle'),
+)
+
+
+def compiled(handler):
+    return compile_table(TABLE, handler, states=('idle', 'busy'), events=('go', 'stop'),
+                         initial='idle')
+
+
+def test_first_matching_guard_runs_and_binds_duration():
+    handler = Handler()
+    assert compiled(handler).fire('idle', 'go', 'palm', 2.0)
+    assert handler.calls == [('start', 'palm', 2.0), ('enter', 'busy', 1.5, 'idle')]
+
+
+def test_failed_guard_falls_through_to_next_row():
+    handler = Handler(allow=False)
+    assert compiled(handler).fire('idle', 'go', 'palm', 2.0)
+    assert handler.calls == [('fallback', 'palm', 2.0)]
+    assert handler.state == 'idle'
+
+
+def test_failed_action_keeps_state():
+    handler = Handler(succeed=False)
+    assert not compiled(handler).fire('idle', 'go', 'palm', 2.0)
+    assert handler.state == 'idle'
+
+
+def test_empty_cell_does_nothing():
+    handler = Handler()
+    assert not compiled(handler).fire('idle', 'stop', 'side', 2.0)
+    assert handler.calls == []
+
@@ -0,0 +1,38 @@
+"""가짜 sysfs 트리에서 캐시한 파일로 모터 명령을 쓰는지 확인합니다."""
+
+import os
+
+import pytest
+
+from robot_hand import sysfs
+from robot_hand.bench_sysfs import make_fake_sysfs
+
+
+@pytest.fixture
+def motor(tmp_path):
+    root = str(tmp_path)
+    make_fake_sysfs(root)
+    motor = sysfs.LargeMotor('outA', root)
+    yield motor
+    motor.close()
+
+
+def read(motor, name):
+    with open(os.path.join(motor.path, name)) as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('brake, action', [(True, 'hold'), (False, 'coast')])
+def test_off_uses_the_same_stop_action_as_ev3dev2(motor, brake, action):
+    motor.off(brake)
+    assert read(motor, 'stop_action').startswith(action)
+    assert read(motor, 'command').startswith('stop')
+
+
+def test_unchanged_settings_are_not_written_again(motor):
+    motor.on_to_position(20, 90, block=False)
+    os.remove(os.path.join(motor.path, 'speed_sp'))
+    # 열어 둔 파일로 쓰므로 같은 속도는 다시 쓰지 않고 위치만 씁니다.
+    motor.on_to_position(20, 180, block=False)
+    assert read(motor, 'position_sp').startswith('180')
+    assert motor.attribute('speed_sp').last_written == 210
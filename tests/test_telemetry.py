@@ -0,0 +1,85 @@
+"""텔레메트리 링 버퍼를 쓰고 다시 읽어 봅니다."""
+
+import io
+
+import pytest
+
+from robot_hand.controller import PRESETS, HandController
+from robot_hand.scenarios import object_approach
+from robot_hand.sim import run_controller
+from robot_hand.states import CLOSED, GRASPING, OPEN
+from robot_hand.telemetry import FIELDS, RECORD, TelemetryRing, read_log, read_runs, write_csv
+
+
+def record(ring, t):
+    ring.record(t, 10.0, 0, 1, 2.5, -1.0, 0, 1, 3.0, 0, 0)
+
+
+def test_ring_keeps_only_the_newest_records():
+    ring = TelemetryRing(size=4)
+    for i in range(6):
+        record(ring, float(i))
+    assert len(ring) == 4
+    assert [values[0] for values in ring.records()] == [2.0, 3.0, 4.0, 5.0]
+    assert len(ring.pending()) == 4 * RECORD.size
+
+
+def test_flush_appends_only_new_records(tmp_path):
+    path = str(tmp_path / 'hand.rhtl')
+    ring = TelemetryRing(size=8, path=path)
+    for i in range(3):
+        record(ring, float(i))
+    assert ring.flush() == 3
+    assert ring.flush() == 0
+    for i in range(3, 5):
+        record(ring, float(i))
+    assert ring.flush() == 2
+
+    names, labels, records = read_log(path)
+    assert names == [name for name, _ in FIELDS]
+    assert [values[0] for values in records] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert records[0][names.index('gyro')] == 2.5
+
+
+def test_each_run_starts_with_its_own_header(tmp_path):
+    path = str(tmp_path / 'hand.rhtl')
+    for run in range(2):
+        ring = TelemetryRing(size=8, path=path)
+        for i in range(3):
+            record(ring, float(i))
+            ring.flush()
+
+    runs = read_runs(path)
+    assert [[values[0] for values in records] for _, _, records in runs] == [
+        [0.0, 1.0, 2.0], [0.0, 1.0, 2.0]]
+    with pytest.raises(ValueError):
+        read_log(path)
+    out = io.StringIO()
+    assert write_csv(path, out) == 6
+    lines = out.getvalue().splitlines()
+    assert lines[0].startswith('run,time,')
+    assert [line.split(',')[0] for line in lines[1:]] == ['1'] * 3 + ['2'] * 3
+
+
+def test_read_log_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.rhtl'
+    path.write_bytes(b'RHSS' + b'\0' * 16)
+    with pytest.raises(ValueError):
+        read_log(str(path))
+
+
+def test_telemetry_follows_the_hand_states(tmp_path):
+    path = str(tmp_path / 'hand.rhtl')
+    config, triggers = PRESETS['new_version']()
+    config = config.replace(telemetry_path=path)
+    run_controller(lambda devices, clock: HandController(config, triggers, devices, clock),
+                   object_approach(), seed=0)
+
+    names, labels, records = read_log(path)
+    states = [labels['state'][values[names.index('state')]] for values in records]
+    changes = [state for i, state in enumerate(states) if i == 0 or state != states[i - 1]]
+    assert changes[0] == OPEN and GRASPING in changes and CLOSED in changes
+    assert changes[-1] == OPEN
+    times = [values[0] for values in records]
+    assert times == sorted(times)
+    assert times[-1] <= object_approach().duration + 1.0
@@ -0,0 +1,56 @@
+"""TouchWatcher 의 사건 시각과 감시 스레드의 읽기 실패 처리를 확인합니다."""
+
+import time
+
+import pytest
+
+from robot_hand.clock import VirtualClock
+from robot_hand.touch import CLICK, LONG_PRESS, PRESS, RELEASE, TouchWatcher
+
+
+def test_events_carry_the_first_read_of_the_new_value():
+    clock = VirtualClock()
+    presses = [(1.0, 1.5), (3.0, 7.0)]
+    watcher = TouchWatcher(clock.time, clock.sleep, period=0.001)
+    watcher.add('side', lambda: any(start <= clock.now < end for start, end in presses))
+    events = []
+    while clock.now < 8.0:
+        watcher.poll()
+        events.extend(watcher.drain())
+        clock.sleep(0.001)
+
+    assert [event.kind for event in events] == [PRESS, RELEASE, CLICK, PRESS, LONG_PRESS,
+                                                RELEASE]
+    assert events[0].timestamp == pytest.approx(1.0, abs=0.002)
+    assert events[2].duration == pytest.approx(0.5, abs=0.002)
+    assert events[4].timestamp == pytest.approx(6.0, abs=0.002)
+
+
+def test_watcher_thread_keeps_running_after_a_failed_read():
+    def unplugged():
+        raise OSError(5, 'Input/output error')
+
+    watcher = TouchWatcher(period=0.001)
+    watcher.add('palm', lambda: False)
+    watcher.add('side', unplugged)
+    watcher.start()
+    try:
+        deadline = time.time() + 2.0
+        while 'side' not in watcher.errors and time.time() < deadline:
+            time.sleep(0.005)
+        polls = watcher.polls
+        time.sleep(0.02)
+        assert watcher.polls > polls
+    finally:
+        watcher.stop()
+    assert list(watcher.errors) == ['side']
+    with pytest.raises(OSError):
+        watcher.check()
+
+
+def test_poll_without_thread_raises():
+    watcher = TouchWatcher()
+    watcher.add('side', lambda: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        watcher.poll()
+    watcher.check()